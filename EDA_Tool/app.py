@@ -7,15 +7,15 @@ import plotly.graph_objects as go
 import plotly.express as px
 import plotly.utils
 from plotly.subplots import make_subplots
-from flask import Flask, render_template, request, jsonify, session, send_file
+from flask import Flask, render_template, request, jsonify, session, send_file, Response
 from werkzeug.utils import secure_filename
-from scipy import stats
 from sklearn.preprocessing import StandardScaler
 import io
 import base64
 from datetime import datetime
 import warnings
 import sys
+import uuid
 
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -34,6 +34,39 @@ try:
     app.secret_key = Config.SECRET_KEY
     app.config['MAX_CONTENT_LENGTH'] = Config.MAX_CONTENT_LENGTH
     app.config['UPLOAD_FOLDER'] = Config.UPLOAD_FOLDER
+    app.config['DATASET_FOLDER'] = Config.DATASET_FOLDER
+    app.config['DATASET_MAX_AGE_SECONDS'] = Config.DATASET_MAX_AGE_SECONDS
+    app.config['STREAMING_CHUNK_ROWS'] = Config.STREAMING_CHUNK_ROWS
+    app.config['COMPACT_DTYPES'] = Config.COMPACT_DTYPES
+    app.config['COMPACT_FLOATS'] = Config.COMPACT_FLOATS
+    app.config['COMPACT_ARROW_STRINGS'] = Config.COMPACT_ARROW_STRINGS
+    app.config['EXCEL_MAX_WORKERS'] = Config.EXCEL_MAX_WORKERS
+    app.config['CHUNKED_UPLOAD_FOLDER'] = Config.CHUNKED_UPLOAD_FOLDER
+    app.config['CHUNKED_UPLOAD_MAX_BYTES'] = Config.CHUNKED_UPLOAD_MAX_BYTES
+    app.config['CHUNK_SIZE_BYTES'] = Config.CHUNK_SIZE_BYTES
+    app.config['COMPRESSION_MIN_BYTES'] = Config.COMPRESSION_MIN_BYTES
+    app.config['QUANTILE_MODE'] = Config.QUANTILE_MODE
+    app.config['APPROX_QUANTILE_MIN_ROWS'] = Config.APPROX_QUANTILE_MIN_ROWS
+    app.config['QUANTILE_SKETCH_K'] = Config.QUANTILE_SKETCH_K
+    app.config['CARDINALITY_MODE'] = Config.CARDINALITY_MODE
+    app.config['APPROX_DISTINCT_MIN_ROWS'] = Config.APPROX_DISTINCT_MIN_ROWS
+    app.config['HLL_PRECISION'] = Config.HLL_PRECISION
+    app.config['TOP_VALUES_CAPACITY'] = Config.TOP_VALUES_CAPACITY
+    app.config['TOP_VALUES_K'] = Config.TOP_VALUES_K
+    app.config['BAR_CHART_TOP_K'] = Config.BAR_CHART_TOP_K
+    app.config['NORMALITY_SAMPLE_SIZE'] = Config.NORMALITY_SAMPLE_SIZE
+    app.config['NORMALITY_SEED'] = Config.NORMALITY_SEED
+    app.config['COLUMN_WORKERS'] = Config.COLUMN_WORKERS
+    app.config['COLUMN_BATCH_SIZE'] = Config.COLUMN_BATCH_SIZE
+    app.config['PARALLEL_MIN_COLUMNS'] = Config.PARALLEL_MIN_COLUMNS
+    app.config['ANALYSIS_BUNDLE_CACHE_SIZE'] = Config.ANALYSIS_BUNDLE_CACHE_SIZE
+    app.config['NEAR_DUPLICATE_THRESHOLD'] = Config.NEAR_DUPLICATE_THRESHOLD
+    app.config['MINHASH_PERMUTATIONS'] = Config.MINHASH_PERMUTATIONS
+    app.config['CORRELATION_BLOCK_SIZE'] = Config.CORRELATION_BLOCK_SIZE
+    app.config['CORRELATION_MATRIX_MAX_COLUMNS'] = Config.CORRELATION_MATRIX_MAX_COLUMNS
+    app.config['CORRELATION_TOP_K'] = Config.CORRELATION_TOP_K
+    app.config['KENDALL_SAMPLE_SIZE'] = Config.KENDALL_SAMPLE_SIZE
+    app.config['ASSOCIATION_MAX_CATEGORIES'] = Config.ASSOCIATION_MAX_CATEGORIES
     
     # Try to initialize Gemini service
     gemini_service = None
@@ -57,63 +90,461 @@ except ImportError as e:
     app.secret_key = 'eda_tool_secret_key_2024'
     app.config['MAX_CONTENT_LENGTH'] = 100 * 1024 * 1024  # 100MB limit
     app.config['UPLOAD_FOLDER'] = 'temp_uploads'
+    app.config['DATASET_FOLDER'] = 'temp_datasets'
+    app.config['DATASET_MAX_AGE_SECONDS'] = 24 * 60 * 60
+    app.config['STREAMING_CHUNK_ROWS'] = 100_000
+    app.config['COMPACT_DTYPES'] = True
+    app.config['COMPACT_FLOATS'] = False
+    app.config['COMPACT_ARROW_STRINGS'] = False
+    app.config['EXCEL_MAX_WORKERS'] = 4
+    app.config['CHUNKED_UPLOAD_FOLDER'] = 'temp_chunked_uploads'
+    app.config['CHUNKED_UPLOAD_MAX_BYTES'] = 2 * 1024 * 1024 * 1024
+    app.config['CHUNK_SIZE_BYTES'] = 8 * 1024 * 1024
+    app.config['COMPRESSION_MIN_BYTES'] = 1024
+    app.config['QUANTILE_MODE'] = 'auto'
+    app.config['APPROX_QUANTILE_MIN_ROWS'] = 1_000_000
+    app.config['QUANTILE_SKETCH_K'] = 200
+    app.config['CARDINALITY_MODE'] = 'auto'
+    app.config['APPROX_DISTINCT_MIN_ROWS'] = 1_000_000
+    app.config['HLL_PRECISION'] = 14
+    app.config['TOP_VALUES_CAPACITY'] = 1000
+    app.config['TOP_VALUES_K'] = 10
+    app.config['BAR_CHART_TOP_K'] = 20
+    app.config['NORMALITY_SAMPLE_SIZE'] = 5000
+    app.config['NORMALITY_SEED'] = 0
+    app.config['COLUMN_WORKERS'] = 0
+    app.config['COLUMN_BATCH_SIZE'] = 32
+    app.config['PARALLEL_MIN_COLUMNS'] = 64
+    app.config['ANALYSIS_BUNDLE_CACHE_SIZE'] = 16
+    app.config['NEAR_DUPLICATE_THRESHOLD'] = 0.8
+    app.config['MINHASH_PERMUTATIONS'] = 64
+    app.config['CORRELATION_BLOCK_SIZE'] = 256
+    app.config['CORRELATION_MATRIX_MAX_COLUMNS'] = 100
+    app.config['CORRELATION_TOP_K'] = 50
+    app.config['KENDALL_SAMPLE_SIZE'] = 1000
+    app.config['ASSOCIATION_MAX_CATEGORIES'] = 50
     gemini_service = None
 
 # Ensure upload directory exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
+# Server-side dataset store - the session only carries the dataset ID
+from services.dataset_store import DatasetStore, content_key, file_digest
+from services.streaming_profiler import profile_csv
+from services.csv_sniffer import sniff_csv
+from services.dtype_compaction import compact_dataframe
+from services.cardinality import CARDINALITY_APPROX, CARDINALITY_EXACT, distinct_values
+from services.column_executor import ColumnExecutor, track_batches
+from services.column_cache import ColumnCache
+from services.analysis_bundle import AnalysisBundleCache
+from services.top_values import (CATEGORICAL_DTYPES, bar_chart_counts, column_heavy_hitters, columns_heavy_hitters,
+                                 profile_top_values, top_values_summary)
+from services.numeric_profile import QUANTILE_APPROX, QUANTILE_EXACT, profile_columns, profile_from_columns
+from services.normality import SHAPIRO_MAX_N, normality_tests, sample_tests, tested_columns
+from services.excel_reader import list_sheets, read_sheet, read_workbook
+from services.chunked_upload import ChunkedUploadStore
+from services.compression import data_extension, decompressed_copy, open_data_stream, split_extension
+from services.serialization import FastJSONProvider, to_builtin
+from services.http_cache import compress_response, etag_matches, make_etag, not_modified, with_etag
+from services.row_query import DEFAULT_PAGE_SIZE, page_positions, query_rows, records_for_json, sort_order
+from services.row_index import build_row_index, exact_duplicate_groups, free_text_columns, near_duplicate_groups
+from services.correlation import CORRELATION_METHODS, KENDALL, PEARSON, correlation_matrix, strongest_pairs
+from services.association import ASSOCIATION_MEASURES, CRAMERS_V, THEILS_U, categorical_associations
+from services.transport import (ARROW_MIME_TYPE, FORMAT_ARROW, FORMAT_BDATA, FORMAT_JSON,
+                                encode_figure, frame_to_arrow_ipc, negotiate_format)
+# Every jsonify() response and the session go through one numpy/pandas-aware encoder
+app.json = FastJSONProvider(app)
+
+dataset_store = DatasetStore(
+    app.config['DATASET_FOLDER'],
+    max_age_seconds=app.config['DATASET_MAX_AGE_SECONDS']
+)
+
+# Per-column analysis of wide datasets runs in batches on a pool of workers
+column_executor = ColumnExecutor(
+    app.config['COLUMN_WORKERS'],
+    batch_size=app.config['COLUMN_BATCH_SIZE'],
+    min_parallel_columns=app.config['PARALLEL_MIN_COLUMNS']
+)
+
+# Resumable chunked uploads for files larger than a single request allows
+chunked_uploads = ChunkedUploadStore(
+    app.config['CHUNKED_UPLOAD_FOLDER'],
+    max_upload_bytes=app.config['CHUNKED_UPLOAD_MAX_BYTES'],
+    max_chunk_bytes=app.config['MAX_CONTENT_LENGTH'],
+    max_age_seconds=app.config['DATASET_MAX_AGE_SECONDS']
+)
+
 # Supported file extensions
 ALLOWED_EXTENSIONS = {'csv', 'xlsx', 'xls'}
 
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
-
-def convert_numpy_types(obj):
-    """Convert numpy types to native Python types for JSON serialization"""
-    if isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, pd.Series):
-        return obj.tolist()
-    elif isinstance(obj, pd.DataFrame):
-        return obj.to_dict()
-    elif isinstance(obj, np.bool_):  # Add this line for numpy booleans
-        return bool(obj)
-    elif isinstance(obj, bool):  # Add this line for regular booleans
-        return bool(obj)
-    elif isinstance(obj, dict):
-        return {key: convert_numpy_types(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_numpy_types(item) for item in obj]
-    else:
-        return obj
+    # Data files may also be compressed (sales.csv.gz) or zipped (export.zip)
+    extension, compression = split_extension(filename)
+    return extension in ALLOWED_EXTENSIONS or compression == 'zip'
+
+# Bump when an analysis function changes so results cached in the dataset store are recomputed
+ANALYSIS_CACHE_VERSION = 6
+
+# Per-column results (profile, normality samples, distinct and top values, correlation pairs)
+# are cached by column content, so after /clean_data only the changed columns are recomputed
+column_cache = ColumnCache(dataset_store, ANALYSIS_CACHE_VERSION)
+
+# Complete analysis results of recently analyzed dataset versions, shared by /analyze and the reports
+analysis_bundles = AnalysisBundleCache(app.config['ANALYSIS_BUNDLE_CACHE_SIZE'])
+
+def cached_analysis(dataset_id, func, df, *args, variant=None):
+    """
+    Run an analysis function on a dataset, reusing the result cached under its dataset ID
+
+    Extra arguments must be derived from the dataset itself (e.g. its numeric
+    profile) or be named by variant, since only variant is part of the cache key.
+    """
+    name = analysis_result_name(func, variant)
+    result = dataset_store.load_result(dataset_id, name)
+    if result is None:
+        result = func(df, *args)
+        dataset_store.save_result(dataset_id, name, result)
+    return result
+
+def analysis_result_name(func, variant=None):
+    """Name of the result of an analysis function in the dataset store's result cache"""
+    name = f"{func.__name__}_v{ANALYSIS_CACHE_VERSION}"
+    return f"{name}_{variant}" if variant else name
+
+def cached_row_index(dataset_id, df):
+    """Row fingerprints of a dataset, shared by the duplicate count, drop_duplicates and /duplicates"""
+    return cached_analysis(dataset_id, build_row_index, df)
+
+def cached_data_info(dataset_id, df):
+    """Data info of a dataset; the row index is only loaded (or built) when the info is not cached"""
+    name = analysis_result_name(get_data_info)
+    info = dataset_store.load_result(dataset_id, name)
+    if info is None:
+        info = get_data_info(df, cached_row_index(dataset_id, df))
+        dataset_store.save_result(dataset_id, name, info)
+    return info
+
+# Responses of these endpoints are gzip/brotli compressed for clients that accept it
+COMPRESSED_ENDPOINTS = {'analyze_data', 'visualize_data', 'generate_report', 'query_correlations',
+                        'query_associations'}
+
+@app.after_request
+def compress_analysis_response(response):
+    if request.endpoint in COMPRESSED_ENDPOINTS:
+        compress_response(response, request.accept_encodings, min_size=app.config['COMPRESSION_MIN_BYTES'])
+    return response
+
+def analysis_etag(endpoint, dataset_id, *params):
+    """ETag for an analysis response: stored datasets never change, so the ID and parameters determine it"""
+    return make_etag(endpoint, dataset_id, ANALYSIS_CACHE_VERSION,
+                     app.config['QUANTILE_MODE'], app.config['QUANTILE_SKETCH_K'],
+                     app.config['CARDINALITY_MODE'], app.config['HLL_PRECISION'],
+                     app.config['TOP_VALUES_CAPACITY'], app.config['TOP_VALUES_K'],
+                     app.config['BAR_CHART_TOP_K'], app.config['NORMALITY_SAMPLE_SIZE'],
+                     app.config['NORMALITY_SEED'], app.config['CORRELATION_MATRIX_MAX_COLUMNS'],
+                     app.config['CORRELATION_TOP_K'], app.config['KENDALL_SAMPLE_SIZE'],
+                     app.config['ASSOCIATION_MAX_CATEGORIES'], *params)
+
+def quantile_mode(rows):
+    """Exact or sketch-based percentiles for a dataset of this size (see QUANTILE_MODE)"""
+    mode = app.config['QUANTILE_MODE']
+    if mode == 'auto':
+        return QUANTILE_APPROX if rows >= app.config['APPROX_QUANTILE_MIN_ROWS'] else QUANTILE_EXACT
+    return mode
+
+def cardinality_mode(rows, requested=None):
+    """Exact or HyperLogLog distinct counts: the requested mode, else per CARDINALITY_MODE"""
+    if requested is not None:
+        if requested not in (CARDINALITY_EXACT, CARDINALITY_APPROX):
+            raise ValueError(f"Unknown cardinality mode: {requested} (use exact or approx)")
+        return requested
+    mode = app.config['CARDINALITY_MODE']
+    if mode == 'auto':
+        return CARDINALITY_APPROX if rows >= app.config['APPROX_DISTINCT_MIN_ROWS'] else CARDINALITY_EXACT
+    return mode
+
+def cached_categorical_stats(dataset_id, df, requested=None):
+    """Categorical statistics of a dataset with exact or estimated distinct counts, cached per column"""
+    mode = cardinality_mode(len(df), requested)
+    categorical_cols = df.select_dtypes(include=CATEGORICAL_DTYPES).columns
+    # Top values are read from the counters built at upload instead of another value_counts
+    top_values = cached_top_values(dataset_id, df, categorical_cols)
+    distinct_stats = cached_distinct_values(dataset_id, df, categorical_cols, mode)
+    return get_categorical_stats(df, mode, app.config['HLL_PRECISION'], top_values, app.config['TOP_VALUES_K'],
+                                 distinct_stats=distinct_stats)
+
+def cached_distinct_values(dataset_id, df, columns, mode):
+    """First distinct values and distinct counts of the given columns, cached per column"""
+    precision = app.config['HLL_PRECISION']
+    variant = mode if mode == CARDINALITY_EXACT else f"{mode}{precision}"
+    return column_cache.results(dataset_id, 'distinct_values', distinct_values, df, columns, mode, precision,
+                                variant=variant, executor=column_executor, source=dataset_store.path(dataset_id))
+
+def cached_top_values(dataset_id, df, columns=None):
+    """Heavy-hitter counters of the categorical columns (or the given ones), cached per column"""
+    capacity = app.config['TOP_VALUES_CAPACITY']
+    columns = df.select_dtypes(include=CATEGORICAL_DTYPES).columns if columns is None else columns
+    return column_cache.results(dataset_id, 'top_values', columns_heavy_hitters, df, columns, capacity,
+                                variant=f"top{capacity}", executor=column_executor,
+                                source=dataset_store.path(dataset_id))
+
+def cached_numeric_profile(dataset_id, df):
+    """Numeric profile of a dataset with the configured quantile mode, cached per column"""
+    mode = quantile_mode(len(df))
+    sketch_k = app.config['QUANTILE_SKETCH_K']
+    variant = mode if mode == QUANTILE_EXACT else f"{mode}{sketch_k}"
+    numeric_cols = df.select_dtypes(include=[np.number]).columns
+    profiles = column_cache.results(dataset_id, 'numeric_profile', profile_columns, df, numeric_cols, mode, sketch_k,
+                                    variant=variant, executor=column_executor)
+    return profile_from_columns(profiles, numeric_cols, len(df), mode)
+
+def cached_normality_tests(dataset_id, df, profile):
+    """Normality tests of a dataset with the configured sample size and seed, sample tests cached per column"""
+    sample_size = app.config['NORMALITY_SAMPLE_SIZE']
+    seed = app.config['NORMALITY_SEED']
+    samples = column_cache.results(dataset_id, 'normality_samples', sample_tests, df, tested_columns(profile),
+                                   min(sample_size, SHAPIRO_MAX_N), seed, variant=f"s{sample_size}_{seed}",
+                                   executor=column_executor)
+    return run_normality_tests(df, profile, sample_size, seed, samples=samples)
+
+def cached_correlation_matrix(dataset_id, df, method=PEARSON):
+    """Correlation matrix of the numeric columns (None with fewer than two); pairs of unchanged columns come from the cache"""
+    numeric_cols = df.select_dtypes(include=[np.number]).columns
+    if len(numeric_cols) < 2:
+        return None
+    sample_size = app.config['KENDALL_SAMPLE_SIZE']
+    return column_cache.correlations(dataset_id, df, numeric_cols, method,
+                                     variant=f"s{sample_size}" if method == KENDALL else None,
+                                     block_size=app.config['CORRELATION_BLOCK_SIZE'],
+                                     kendall_sample_size=sample_size)
+
+def cached_correlations(dataset_id, df):
+    """
+    Pearson correlations of the numeric columns: the formatted matrix (None above
+    CORRELATION_MATRIX_MAX_COLUMNS columns) and the CORRELATION_TOP_K strongest pairs
+    """
+    try:
+        matrix = cached_correlation_matrix(dataset_id, df)
+        if matrix is None:
+            return {}, []
+        top_pairs = strongest_pairs(matrix.to_numpy(), matrix.columns, k=app.config['CORRELATION_TOP_K'])
+        if len(matrix.columns) > app.config['CORRELATION_MATRIX_MAX_COLUMNS']:
+            return None, top_pairs
+        return get_correlations(df, matrix), top_pairs
+    except Exception as e:
+        print(f"Error in cached_correlations: {e}")
+        return {}, []
+
+def cached_associations(dataset_id, df):
+    """Cramér's V and Theil's U of the categorical (and boolean) columns, with ASSOCIATION_MAX_CATEGORIES"""
+    max_categories = app.config['ASSOCIATION_MAX_CATEGORIES']
+    return cached_analysis(dataset_id, categorical_associations, df, None, max_categories, column_executor,
+                           variant=f"c{max_categories}")
+
+def cached_association_summary(dataset_id, df):
+    """
+    Associations of the categorical columns: the formatted Cramér's V and Theil's U matrices (None
+    above CORRELATION_MATRIX_MAX_COLUMNS columns) and the CORRELATION_TOP_K strongest pairs by Cramér's V
+    """
+    try:
+        associations = cached_associations(dataset_id, df)
+        columns = associations['columns']
+        if len(columns) < 2:
+            return {}, []
+        top_pairs = strongest_pairs(associations[CRAMERS_V], columns, k=app.config['CORRELATION_TOP_K'],
+                                    value_name=CRAMERS_V)
+        if len(columns) > app.config['CORRELATION_MATRIX_MAX_COLUMNS']:
+            return None, top_pairs
+        # Undefined associations (e.g. single-category columns) are reported as 0, like correlations
+        matrices = {
+            measure: pd.DataFrame(associations[measure], index=columns, columns=columns).fillna(0.0).round(3).to_dict()
+            for measure in ASSOCIATION_MEASURES
+        }
+        return matrices, top_pairs
+    except Exception as e:
+        print(f"Error in cached_association_summary: {e}")
+        return {}, []
+
+def build_analysis_bundle(dataset_id, requested_cardinality=None):
+    """
+    Compute every section /analyze and the reports show for a stored dataset
 
-def load_data(file_path, file_extension):
-    """Load data from file based on extension"""
+    Returns:
+        Dictionary with 'analysis' (the /analyze sections) and 'report' (the report template's sections)
+    """
+    df = dataset_store.load(dataset_id)
+    cardinality = cardinality_mode(len(df), requested_cardinality)
+    
+    # Report sections read the stored types (boolean columns are not categorical there)
+    data_info = cached_data_info(dataset_id, df)
+    categorical_stats = cached_categorical_stats(dataset_id, df, requested_cardinality)
+    
+    # Convert boolean columns to string to avoid JSON serialization issues
+    bool_cols = [col for col in df.columns if df[col].dtype == 'bool']
+    for col in bool_cols:
+        df[col] = df[col].astype(str)
+    
+    # Get all the analysis results using the older structure; the expensive
+    # sections are cached per column, so re-analyzing the same data is cheap
+    analysis_results = {}
+    
+    # One pass over the numeric columns feeds the statistics, skew/kurtosis,
+    # outlier and normality sections
+    profile = cached_numeric_profile(dataset_id, df)
+    
+    # Basic statistics
+    analysis_results['basic_stats'] = profile.descriptive_stats()
+    
+    # Data types
+    analysis_results['dtypes'] = {col: str(dtype) for col, dtype in df.dtypes.items()}
+    
+    # Missing values
+    analysis_results['missing_values'] = df.isnull().sum().to_dict()
+    
+    # Numerical analysis (for outliers and normality)
+    analysis_results['numerical_analysis'] = profile.numerical_analysis()
+    
+    # Outliers
+    analysis_results['outliers'] = profile.outliers()
+    
+    # Normality tests
+    analysis_results['normality_tests'] = cached_normality_tests(dataset_id, df, profile)
+    
+    # Correlations: the matrix for narrow tables, the strongest pairs always
+    analysis_results['correlation'], analysis_results['top_correlations'] = cached_correlations(dataset_id, df)
+    
+    # The same for associations between categorical columns
+    (analysis_results['categorical_association'],
+     analysis_results['top_associations']) = cached_association_summary(dataset_id, df)
+    
+    # Unique values; worker processes read the stored file, which still has the
+    # original boolean columns, so those converted above are handled here
+    categorical_cols = df.select_dtypes(include=['object', 'string', 'category']).columns
+    stored_cols = [col for col in categorical_cols if col not in bool_cols]
+    distinct_stats = cached_distinct_values(dataset_id, df, stored_cols, cardinality)
+    distinct_stats.update(distinct_values(df, bool_cols, cardinality, app.config['HLL_PRECISION']))
+    analysis_results['unique_values'] = {col: distinct_stats[col]['unique_values'] for col in categorical_cols}
+    analysis_results['unique_counts'] = {col: distinct_stats[col]['distinct'] for col in categorical_cols}
+    
+    # Most frequent values per categorical column (also the LLM prompt's categorical summary)
+    top_values = cached_top_values(dataset_id, df, stored_cols)
+    analysis_results['top_values'] = {
+        col: top_values_summary(hitters, app.config['TOP_VALUES_K'])
+        for col, hitters in top_values.items()
+    }
+    
+    # Preview data (head and tail)
+    analysis_results['preview_head'] = json_safe_frame(df.head(10)).to_dict('records')
+    analysis_results['preview_tail'] = json_safe_frame(df.tail(10)).to_dict('records')
+    
+    return {
+        'analysis': analysis_results,
+        'report': {
+            'data_info': data_info,
+            'descriptive_stats': analysis_results['basic_stats'],
+            'categorical_stats': categorical_stats,
+            'outliers': analysis_results['outliers'],
+            'normality_tests': analysis_results['normality_tests'],
+            'correlations': analysis_results['correlation']
+        }
+    }
+
+def analysis_bundle(dataset_id, requested_cardinality=None):
+    """Analysis bundle of a dataset version, computed at most once and shared by /analyze and the reports"""
+    key = analysis_etag('bundle', dataset_id, requested_cardinality)
+    return analysis_bundles.get(key, lambda: build_analysis_bundle(dataset_id, requested_cardinality))
+
+def load_session_dataframe():
+    """Load the DataFrame for the current session from the dataset store"""
+    dataset_id = session.get('dataset_id')
+    if not dataset_id or not dataset_store.exists(dataset_id):
+        return None
+    return dataset_store.load(dataset_id)
+
+def load_data(file_path, file_extension, usecols=None, sheet_name=None):
+    """Load data from file based on extension (Excel: the given sheet, or the first one)"""
     try:
         if file_extension == 'csv':
-            # Try different encodings
-            encodings = ['utf-8', 'latin-1', 'cp1252']
-            for encoding in encodings:
-                try:
-                    df = pd.read_csv(file_path, encoding=encoding)
-                    break
-                except UnicodeDecodeError:
-                    continue
-            else:
-                df = pd.read_csv(file_path, encoding='utf-8', errors='ignore')
+            # Detect encoding, dialect and column types from one sample, then parse once
+            read_options = sniff_csv(file_path)
+            if usecols is not None:
+                read_options['usecols'] = usecols
+            try:
+                # Compressed files are decompressed as the parser reads them
+                with open_data_stream(file_path) as stream:
+                    df = pd.read_csv(stream, low_memory=False, **read_options)
+            except (UnicodeDecodeError, ValueError) as e:
+                # The sample did not represent the whole file - fall back to untyped parsing
+                print(f"Typed CSV read failed ({str(e)}), retrying without dtype hints")
+                encodings = [read_options['encoding'], 'cp1252', 'latin-1']
+                for encoding in encodings:
+                    try:
+                        with open_data_stream(file_path) as stream:
+                            df = pd.read_csv(stream, encoding=encoding, sep=read_options['sep'],
+                                             usecols=usecols, low_memory=False)
+                        break
+                    except UnicodeDecodeError:
+                        continue
         else:
-            df = pd.read_excel(file_path, engine='openpyxl' if file_extension == 'xlsx' else 'xlrd')
+            with decompressed_copy(file_path, file_extension) as excel_path:
+                df = read_sheet(excel_path, sheet_name or list_sheets(excel_path)[0])
+            if usecols is not None:
+                df = df[usecols]
         
         return df
     except Exception as e:
         raise Exception(f"Error loading file: {str(e)}")
 
-def get_data_info(df):
-    """Get comprehensive data information"""
+def profile_data(file_path, file_extension, chunksize=100_000):
+    """Profile a CSV file in chunks without loading the whole table into memory"""
+    if file_extension != 'csv':
+        raise Exception("Streaming profiling is only supported for CSV files")
+    
+    try:
+        read_options = sniff_csv(file_path)
+        try:
+            with open_data_stream(file_path) as stream:
+                return profile_csv(stream, chunksize=chunksize, read_options=read_options)
+        except ValueError as e:
+            # A later chunk did not match the sampled dtypes - profile with inferred types
+            print(f"Typed CSV profile failed ({str(e)}), retrying without dtype hints")
+            with open_data_stream(file_path) as stream:
+                return profile_csv(stream, chunksize=chunksize,
+                                   read_options={'encoding': read_options['encoding'], 'sep': read_options['sep']})
+    except Exception as e:
+        raise Exception(f"Error profiling file: {str(e)}")
+
+def json_safe_frame(df):
+    """Render datetime columns as ISO strings (NaT/NA as None) so rows can be serialized"""
+    datetime_cols = df.select_dtypes(include=['datetime', 'datetimetz']).columns
+    string_cols = df.select_dtypes(include=['string']).columns
+    if len(datetime_cols) == 0 and len(string_cols) == 0:
+        return df
+    
+    df = df.copy()
+    for col in datetime_cols:
+        df[col] = df[col].dt.strftime('%Y-%m-%dT%H:%M:%S').astype(object).where(df[col].notna(), None)
+    for col in string_cols:
+        df[col] = df[col].astype(object).where(df[col].notna(), None)
+    return df
+
+def build_dataset_response(df, dataset_id):
+    """Data info and previews returned whenever the session switches to a new dataset"""
+    return {
+        'data_info': cached_data_info(dataset_id, df),
+        'preview_head': format_preview(df.head(10)),
+        'preview_tail': format_preview(df.tail(10)),
+        # Rows are paged through /rows, so the response size does not grow with the dataset
+        'rows_url': '/rows'
+    }
+
+def format_preview(df):
+    """Convert preview rows to the {column: {row_number: value}} layout used by the frontend"""
+    return json_safe_frame(df).reset_index(drop=True).to_dict()
+
+def get_data_info(df, row_index=None):
+    """Get comprehensive data information (duplicates counted from the row index when given)"""
     info = {
         'shape': df.shape,
         'columns': list(df.columns),
@@ -121,55 +552,40 @@ def get_data_info(df):
         'memory_usage': df.memory_usage(deep=True).sum(),
         'null_counts': df.isnull().sum().to_dict(),
         'null_percentages': (df.isnull().sum() / len(df) * 100).to_dict(),
-        'duplicate_rows': df.duplicated().sum(),
+        'duplicate_rows': row_index.duplicate_count() if row_index is not None else df.duplicated().sum(),
         'numerical_columns': list(df.select_dtypes(include=[np.number]).columns),
-        'categorical_columns': list(df.select_dtypes(include=['object', 'category']).columns),
+        'categorical_columns': list(df.select_dtypes(include=['object', 'string', 'category']).columns),
         'datetime_columns': list(df.select_dtypes(include=['datetime64']).columns)
     }
-    return convert_numpy_types(info)
+    return info
 
 # Fix the statistics calculation functions
 
-def get_descriptive_stats(df):
-    """Get descriptive statistics for numerical columns"""
-    try:
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        if len(numeric_cols) == 0:
-            return {}
-        
-        stats = df[numeric_cols].describe()
-        
-        # Convert to dictionary and handle NaN values
-        stats_dict = {}
-        for col in numeric_cols:
-            col_stats = {}
-            for metric in ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']:
-                value = stats.loc[metric, col]
-                if pd.isna(value):
-                    col_stats[metric] = 0 if metric == 'count' else 'N/A'
-                else:
-                    if metric == 'count':
-                        col_stats[metric] = int(value)
-                    else:
-                        col_stats[metric] = float(value)
-            stats_dict[col] = col_stats
-        
-        return stats_dict
-    except Exception as e:
-        print(f"Error in get_descriptive_stats: {e}")
-        return {}
-
-def get_categorical_stats(df):
-    """Get statistics for categorical columns"""
+def get_categorical_stats(df, cardinality=CARDINALITY_EXACT, hll_precision=14, top_values=None, top_k=10,
+                          executor=None, source=None, distinct_stats=None):
+    """Get statistics for categorical columns (distinct counts exact or HyperLogLog estimates)"""
     try:
-        categorical_cols = df.select_dtypes(include=['object', 'string']).columns
+        categorical_cols = df.select_dtypes(include=['object', 'string', 'category']).columns
+        # Most frequent values come from bounded heavy-hitter counters
+        top_values = top_values if top_values is not None else profile_top_values(df)
+        # Distinct values hash every value; wide tables run them in batches on worker processes
+        if distinct_stats is None and executor is not None:
+            distinct_stats = executor.map('categorical_stats', distinct_values, df, categorical_cols,
+                                          cardinality, hll_precision, source=source)
+        elif distinct_stats is None:
+            distinct_stats = distinct_values(df, categorical_cols, cardinality, hll_precision)
+        counts = df[categorical_cols].count()
         stats = {}
         
         for col in categorical_cols:
             col_stats = {}
-            col_stats['count'] = int(df[col].count())
-            col_stats['unique_count'] = int(df[col].nunique())
-            col_stats['missing_count'] = int(df[col].isnull().sum())
+            col_stats['count'] = int(counts[col])
+            distinct = distinct_stats[col]['distinct']
+            col_stats['unique_count'] = distinct['count']
+            if distinct['approximate']:
+                col_stats['unique_count_approximate'] = True
+                col_stats['unique_count_error'] = distinct['relative_error']
+            col_stats['missing_count'] = len(df) - col_stats['count']
             
             # Calculate missing percentage safely
             total_count = len(df)
@@ -179,9 +595,13 @@ def get_categorical_stats(df):
             else:
                 col_stats['missing_percentage'] = 0
             
-            # Get unique values (limit to first 20)
-            unique_vals = df[col].dropna().unique()
-            col_stats['unique_values'] = unique_vals[:20].tolist()
+            # Get unique values (limit to first 20, without hashing the whole column)
+            col_stats['unique_values'] = distinct_stats[col]['unique_values']
+            
+            # Most frequent values, the rest rolled into other_count
+            col_stats['top_values'] = top_values_summary(top_values[col], top_k)
+            top = col_stats['top_values']['values']
+            col_stats['most_common'] = top[0]['value'] if top else None
             
             stats[col] = col_stats
         
@@ -190,147 +610,27 @@ def get_categorical_stats(df):
         print(f"Error in get_categorical_stats: {e}")
         return {}
 
-def detect_outliers(df):
-    """Detect outliers using IQR method"""
+def run_normality_tests(df, profile=None, sample_size=5000, seed=0, executor=None, samples=None):
+    """Run normality tests on numerical columns (test chosen by column size, large columns sampled)"""
     try:
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        outliers_data = {}
-        
-        for col in numeric_cols:
-            try:
-                # Remove NaN values for calculation
-                clean_data = df[col].dropna()
-                if len(clean_data) < 4:  # Need at least 4 values for quartiles
-                    outliers_data[col] = {
-                        'count': 0,
-                        'method': 'IQR',
-                        'q1': 'N/A',
-                        'q3': 'N/A',
-                        'iqr': 'N/A',
-                        'lower_bound': 'N/A',
-                        'upper_bound': 'N/A',
-                        'outlier_percentage': 0
-                    }
-                    continue
-                
-                Q1 = float(clean_data.quantile(0.25))
-                Q3 = float(clean_data.quantile(0.75))
-                IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                
-                # Count outliers
-                outlier_mask = (df[col] < lower_bound) | (df[col] > upper_bound)
-                outlier_count = int(outlier_mask.sum())
-                
-                # Calculate percentage safely
-                total_count = len(df[col])
-                if total_count > 0:
-                    outlier_percentage = (outlier_count / total_count) * 100
-                else:
-                    outlier_percentage = 0
-                
-                outliers_data[col] = {
-                    'count': outlier_count,
-                    'method': 'IQR',
-                    'q1': round(Q1, 3),
-                    'q3': round(Q3, 3),
-                    'iqr': round(IQR, 3),
-                    'lower_bound': round(lower_bound, 3),
-                    'upper_bound': round(upper_bound, 3),
-                    'outlier_percentage': round(outlier_percentage, 2)
-                }
-                
-            except Exception as e:
-                print(f"Error processing outliers for {col}: {e}")
-                outliers_data[col] = {
-                    'count': 0,
-                    'method': 'IQR',
-                    'error': str(e)
-                }
-        
-        return outliers_data
-    except Exception as e:
-        print(f"Error in detect_outliers: {e}")
-        return {}
-
-def run_normality_tests(df):
-    """Run normality tests on numerical columns"""
-    try:
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        normality_data = {}
-        
-        for col in numeric_cols:
-            try:
-                # Remove NaN values for normality test
-                clean_data = df[col].dropna()
-                if len(clean_data) < 3:
-                    normality_data[col] = {
-                        'skewness': 'N/A',
-                        'kurtosis': 'N/A',
-                        'shapiro_wilk_p': 'N/A',
-                        'assessment': 'Insufficient data'
-                    }
-                    continue
-                
-                # Calculate skewness and kurtosis
-                skewness = float(clean_data.skew())
-                kurtosis = float(clean_data.kurtosis())
-                
-                # Shapiro-Wilk test
-                try:
-                    shapiro_stat, shapiro_p = stats.shapiro(clean_data)
-                    shapiro_p = float(shapiro_p)
-                except:
-                    shapiro_p = 'N/A'
-                
-                # Normality assessment
-                if shapiro_p != 'N/A' and shapiro_p > 0.05:
-                    assessment = 'Normal'
-                elif abs(skewness) > 1 or abs(kurtosis) > 2:
-                    assessment = 'Non-Normal'
-                elif abs(skewness) > 0.5 or abs(kurtosis) > 1:
-                    assessment = 'Moderately Skewed'
-                else:
-                    assessment = 'Approximately Normal'
-                
-                normality_data[col] = {
-                    'skewness': round(skewness, 3),
-                    'kurtosis': round(kurtosis, 3),
-                    'shapiro_wilk_p': shapiro_p if shapiro_p == 'N/A' else round(shapiro_p, 6),
-                    'assessment': assessment
-                }
-                
-            except Exception as e:
-                print(f"Error processing normality test for {col}: {e}")
-                normality_data[col] = {'error': str(e)}
-        
-        return normality_data
+        # Skewness, kurtosis and the moment-based tests come from the shared numeric profile
+        return normality_tests(df, profile, sample_size, seed, executor, samples)
     except Exception as e:
         print(f"Error in run_normality_tests: {e}")
         return {}
 
-def get_correlations(df):
-    """Get correlation matrix for numerical columns"""
+def get_correlations(df, corr_matrix=None):
+    """Get correlation matrix for numerical columns (formats corr_matrix when already computed)"""
     try:
         numeric_cols = df.select_dtypes(include=[np.number]).columns
         if len(numeric_cols) < 2:
             return {}
         
-        corr_matrix = df[numeric_cols].corr()
+        if corr_matrix is None:
+            corr_matrix = pd.DataFrame(correlation_matrix(df, numeric_cols), index=numeric_cols, columns=numeric_cols)
         
-        # Convert to dictionary and handle NaN values
-        correlations = {}
-        for col1 in numeric_cols:
-            correlations[col1] = {}
-            for col2 in numeric_cols:
-                value = corr_matrix.loc[col1, col2]
-                if pd.isna(value):
-                    correlations[col1][col2] = 0.0
-                else:
-                    correlations[col1][col2] = round(float(value), 3)
-        
-        return correlations
+        # Undefined correlations (e.g. constant columns) are reported as 0
+        return corr_matrix.astype(np.float64).fillna(0.0).round(3).to_dict()
     except Exception as e:
         print(f"Error in get_correlations: {e}")
         return {}
@@ -365,11 +665,11 @@ def create_scatter_plot(df, x_col, y_col):
 
 def create_correlation_heatmap(df):
     """Create correlation heatmap"""
-    numerical_cols = df.select_dtypes(include=[np.number])
-    if numerical_cols.empty or len(numerical_cols.columns) < 2:
+    numerical_cols = df.select_dtypes(include=[np.number]).columns
+    if len(numerical_cols) < 2:
         return None
     
-    corr_matrix = numerical_cols.corr()
+    corr_matrix = pd.DataFrame(correlation_matrix(df, numerical_cols), index=numerical_cols, columns=numerical_cols)
     fig = px.imshow(
         corr_matrix,
         title='Correlation Heatmap',
@@ -382,12 +682,13 @@ def create_correlation_heatmap(df):
     )
     return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
 
-def create_bar_chart(df, column):
-    """Create bar chart for categorical column"""
-    value_counts = df[column].value_counts().head(20)  # Limit to top 20
+def create_bar_chart(df, column, hitters=None):
+    """Create bar chart for categorical column (top 20 values plus an 'Other' bar)"""
+    hitters = hitters if hitters is not None else column_heavy_hitters(df[column])
+    labels, counts = bar_chart_counts(hitters, 20)
     fig = px.bar(
-        x=value_counts.index,
-        y=value_counts.values,
+        x=[str(label) for label in labels],
+        y=counts,
         title=f'Value Counts for {column}'
     )
     fig.update_layout(
@@ -400,6 +701,102 @@ def create_bar_chart(df, column):
 def index():
     return render_template('index.html')
 
+def store_uploaded_file(file_path, file_extension, requested_sheets=None):
+    """Load an uploaded file, store one dataset per sheet and point the session at the first one"""
+    # Identical bytes parsed with identical options give identical datasets - reuse them
+    dataset_store.purge_expired()
+    upload_key = content_key(
+        file_digest(file_path), file_extension, sorted(requested_sheets or []),
+        app.config['COMPACT_DTYPES'], app.config['COMPACT_FLOATS'], app.config['COMPACT_ARROW_STRINGS']
+    )
+    entry = dataset_store.find_upload(upload_key)
+    reused = entry is not None
+    if reused:
+        print(f"Upload matches stored content {upload_key}, skipping parsing")
+        df = dataset_store.load(entry['dataset_id'])
+    else:
+        df, entry = parse_uploaded_file(file_path, file_extension, requested_sheets, upload_key)
+        dataset_store.save_upload(upload_key, entry)
+    
+    session['dataset_id'] = entry['dataset_id']
+    session['sheet_datasets'] = entry['sheet_datasets']
+    session['sheets'] = entry['sheets']
+    session['active_sheet'] = entry['active_sheet']
+    session.pop('analysis_results', None)
+    
+    return {
+        'success': True,
+        'message': 'File uploaded successfully',
+        'memory_compaction': entry['memory_compaction'],
+        'sheets': entry['sheets'],
+        'active_sheet': entry['active_sheet'],
+        'reused_upload': reused,
+        **build_dataset_response(df, entry['dataset_id'])
+    }
+
+def parse_uploaded_file(file_path, file_extension, requested_sheets, upload_key):
+    """Parse an upload into one stored dataset per sheet; returns the first frame and the upload index entry"""
+    if file_extension == 'csv':
+        frames = {None: load_data(file_path, file_extension)}
+    else:
+        with decompressed_copy(file_path, file_extension) as excel_path:
+            frames = read_workbook(excel_path, sheets=requested_sheets or None,
+                                   max_workers=app.config['EXCEL_MAX_WORKERS'])
+    if not frames:
+        raise ValueError('Workbook contains no sheets')
+    
+    # Store each DataFrame server-side and keep only the IDs in the session
+    sheet_datasets = {}
+    sheets = []
+    df, compaction = None, None
+    for sheet_name, sheet_df in frames.items():
+        # Shrink dtypes before the frame is stored - per-session memory bounds concurrent users
+        sheet_compaction = None
+        if app.config['COMPACT_DTYPES']:
+            sheet_df, sheet_compaction = compact_dataframe(
+                sheet_df,
+                downcast_floats=app.config['COMPACT_FLOATS'],
+                arrow_strings=app.config['COMPACT_ARROW_STRINGS']
+            )
+        if df is None:
+            df, compaction = sheet_df, sheet_compaction
+        
+        # Dataset IDs follow from the upload key, so the frame itself need not be hashed
+        dataset_id = dataset_store.save(sheet_df, content_key(upload_key, sheet_name))
+        # Count the most frequent categorical values and fingerprint the rows once, while the frame is in memory
+        cached_top_values(dataset_id, sheet_df)
+        cached_row_index(dataset_id, sheet_df)
+        if sheet_name is not None:
+            sheet_datasets[sheet_name] = dataset_id
+            sheets.append({'name': sheet_name, 'shape': list(sheet_df.shape)})
+    
+    active_sheet = next(iter(frames))
+    # The upload index is plain JSON on disk
+    return df, to_builtin({
+        'dataset_id': sheet_datasets.get(active_sheet, dataset_id),
+        'dataset_ids': list(sheet_datasets.values()) or [dataset_id],
+        'sheet_datasets': sheet_datasets,
+        'sheets': sheets,
+        'active_sheet': active_sheet,
+        'memory_compaction': compaction
+    })
+
+def build_profile_response(profile):
+    """Response body for a streaming profile"""
+    return {
+        'success': True,
+        'mode': 'streaming',
+        'message': f'Profiled {profile.rows} rows in streaming mode',
+        'data_info': profile.data_info(),
+        'descriptive_stats': profile.descriptive_stats(),
+        'numerical_analysis': profile.numerical_analysis(),
+        'outlier_bounds': profile.outlier_bounds(),
+        'categorical_stats': profile.categorical_stats(),
+        'datetime_stats': profile.datetime_stats(),
+        'preview_head': format_preview(profile.head) if profile.head is not None else {},
+        'preview_tail': format_preview(profile.tail) if profile.tail is not None else {}
+    }
+
 @app.route('/upload', methods=['POST'])
 def upload_file():
     try:
@@ -411,47 +808,16 @@ def upload_file():
             return jsonify({'error': 'No file selected'}), 400
         
         if file and allowed_file(file.filename):
-            # Read the file
-            if file.filename.endswith('.csv'):
-                df = pd.read_csv(file)
-            elif file.filename.endswith(('.xlsx', '.xls')):
-                df = pd.read_excel(file)
-            else:
-                return jsonify({'error': 'Unsupported file format'}), 400
-            
-            # Store the full DataFrame in session
-            session['data'] = df.to_dict('records')
-            session['full_data'] = df.to_dict('records')  # Store full data separately
-            
-            # Generate data info
-            data_info = get_data_info(df)
-            
-            # Generate preview data (head and tail) for display
-            preview_head = df.head(10).to_dict('records')
-            preview_tail = df.tail(10).to_dict('records')
-            
-            # Convert preview data to the expected format
-            preview_head_formatted = {}
-            preview_tail_formatted = {}
-            
-            for col in df.columns:
-                preview_head_formatted[col] = {}
-                preview_tail_formatted[col] = {}
-                
-                for i, row in enumerate(preview_head):
-                    preview_head_formatted[col][i] = row[col]
-                
-                for i, row in enumerate(preview_tail):
-                    preview_tail_formatted[col][i] = row[col]
-            
-            response_data = {
-                'success': True,
-                'message': 'File uploaded successfully',
-                'data_info': data_info,
-                'preview_head': preview_head_formatted,
-                'preview_tail': preview_tail_formatted,
-                'full_data': df.to_dict('records')  # Include full data in response
-            }
+            # Spool the upload to disk (still compressed) and read it with the typed loader
+            file_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{uuid.uuid4().hex}_{secure_filename(file.filename)}")
+            file.save(file_path)
+            try:
+                file_extension = data_extension(file_path)
+                # One dataset per sheet; the optional 'sheets' field selects a comma-separated subset
+                requested = [name for name in request.form.get('sheets', '').split(',') if name]
+                response_data = store_uploaded_file(file_path, file_extension, requested)
+            finally:
+                os.remove(file_path)
             
             return jsonify(response_data)
         else:
@@ -461,65 +827,396 @@ def upload_file():
         print(f"Upload error: {str(e)}")
         return jsonify({'error': f'Upload failed: {str(e)}'}), 500
 
-@app.route('/analyze', methods=['POST'])
-def analyze_data():
+@app.route('/upload/init', methods=['POST'])
+def chunked_upload_init():
+    """Start a resumable chunked upload"""
     try:
-        if 'data' not in session:
-            return jsonify({'error': 'No data available for analysis'}), 400
+        data = request.get_json() or {}
+        filename = data.get('filename', '')
+        if not allowed_file(filename):
+            return jsonify({'error': 'File type not allowed'}), 400
         
-        data = session['data']
-        df = pd.DataFrame(data)
+        status = chunked_uploads.init(
+            filename,
+            total_size=int(data.get('total_size', 0)),
+            chunk_size=int(data.get('chunk_size', app.config['CHUNK_SIZE_BYTES'])),
+            incremental_profile=bool(data.get('incremental_profile', True))
+        )
+        return jsonify({'success': True, **status})
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        print(f"Chunked upload init error: {str(e)}")
+        return jsonify({'error': f'Upload failed: {str(e)}'}), 500
+
+@app.route('/upload/<upload_id>', methods=['GET'])
+def chunked_upload_status(upload_id):
+    """Report received and missing chunks so the client can resume"""
+    try:
+        return jsonify({'success': True, **chunked_uploads.status(upload_id)})
+    except (KeyError, ValueError):
+        return jsonify({'error': 'Upload not found'}), 404
+
+@app.route('/upload/<upload_id>/chunk/<int:index>', methods=['PUT'])
+def chunked_upload_chunk(upload_id, index):
+    """Receive one chunk as the raw request body, with its SHA-256 in X-Chunk-SHA256"""
+    try:
+        status = chunked_uploads.write_chunk(
+            upload_id, index, request.get_data(cache=False),
+            checksum=request.headers.get('X-Chunk-SHA256')
+        )
+        return jsonify({'success': True, **status})
+    
+    except KeyError:
+        return jsonify({'error': 'Upload not found'}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        print(f"Chunk upload error: {str(e)}")
+        return jsonify({'error': f'Chunk upload failed: {str(e)}'}), 500
+
+@app.route('/upload/<upload_id>/finalize', methods=['POST'])
+def chunked_upload_finalize(upload_id):
+    """
+    Assemble a chunked upload
+
+    mode 'dataset' (default) loads it like a regular upload; mode 'profile'
+    returns the streaming profile, which for CSV files was built while the
+    chunks arrived.
+    """
+    try:
+        data = request.get_json() or {}
+        mode = data.get('mode', 'dataset')
+        status = chunked_uploads.status(upload_id)
         
-        # Convert boolean columns to string to avoid JSON serialization issues
-        for col in df.columns:
-            if df[col].dtype == 'bool':
-                df[col] = df[col].astype(str)
+        file_path, profile = chunked_uploads.finalize(upload_id, checksum=data.get('sha256'))
+        try:
+            # The readers pick the format and compression from the name, so give the file its original one
+            named_path = f"{file_path}_{secure_filename(status['filename'])}"
+            os.replace(file_path, named_path)
+            file_extension = data_extension(named_path)
+            
+            if mode == 'profile':
+                if file_extension != 'csv':
+                    return jsonify({'error': 'Streaming profile supports CSV files only'}), 400
+                if profile is None:
+                    profile = profile_data(named_path, file_extension, chunksize=app.config['STREAMING_CHUNK_ROWS'])
+                response_data = build_profile_response(profile)
+            else:
+                response_data = store_uploaded_file(named_path, file_extension, data.get('sheets'))
+        finally:
+            chunked_uploads.discard(upload_id)
         
-        # Get all the analysis results using the older structure
-        analysis_results = {}
+        return jsonify(response_data)
+    
+    except KeyError:
+        return jsonify({'error': 'Upload not found'}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        print(f"Chunked upload finalize error: {str(e)}")
+        return jsonify({'error': f'Upload failed: {str(e)}'}), 500
+
+@app.route('/select_sheet', methods=['POST'])
+def select_sheet():
+    """Switch the session to another sheet of the uploaded workbook"""
+    try:
+        sheet_name = (request.get_json() or {}).get('sheet')
+        sheet_datasets = session.get('sheet_datasets', {})
+        if sheet_name not in sheet_datasets:
+            return jsonify({'error': f'Sheet not found: {sheet_name}'}), 400
         
-        # Basic statistics
-        analysis_results['basic_stats'] = get_descriptive_stats(df)
+        session['dataset_id'] = sheet_datasets[sheet_name]
+        session['active_sheet'] = sheet_name
+        session.pop('analysis_results', None)
         
-        # Data types
-        analysis_results['dtypes'] = {col: str(dtype) for col, dtype in df.dtypes.items()}
+        df = load_session_dataframe()
+        if df is None:
+            return jsonify({'error': 'Sheet data has expired, please upload the file again'}), 400
         
-        # Missing values
-        analysis_results['missing_values'] = df.isnull().sum().to_dict()
+        response_data = {
+            'success': True,
+            'message': f'Switched to sheet {sheet_name}',
+            'sheets': session.get('sheets', []),
+            'active_sheet': sheet_name,
+            **build_dataset_response(df, session['dataset_id'])
+        }
+        return jsonify(response_data)
+    
+    except Exception as e:
+        print(f"Select sheet error: {str(e)}")
+        return jsonify({'error': f'Failed to select sheet: {str(e)}'}), 500
+
+@app.route('/rows', methods=['POST'])
+def get_rows():
+    """One page of the session dataset, optionally filtered and sorted on the server"""
+    try:
+        df = load_session_dataframe()
+        if df is None:
+            return jsonify({'error': 'No data uploaded'}), 400
         
-        # Numerical analysis (for outliers and normality)
-        numerical_cols = df.select_dtypes(include=[np.number]).columns
-        analysis_results['numerical_analysis'] = {}
-        for col in numerical_cols:
-            analysis_results['numerical_analysis'][col] = {
-                'skewness': float(df[col].skew()) if len(df[col].dropna()) > 0 else 0,
-                'kurtosis': float(df[col].kurtosis()) if len(df[col].dropna()) > 0 else 0
-            }
+        data = request.get_json() or {}
+        dataset_id = session['dataset_id']
+        sort_by = data.get('sort_by')
+        descending = bool(data.get('descending', False))
+        
+        order = None
+        if sort_by is not None:
+            # The sort order is cached per dataset, so paging through a sorted view sorts once
+            name = f"sort_order_{content_key(sort_by, descending)}"
+            order = dataset_store.load_result(dataset_id, name)
+            if order is None:
+                order = sort_order(df, sort_by, descending)
+                dataset_store.save_result(dataset_id, name, order)
+        
+        options = {
+            'offset': data.get('offset', 0),
+            'limit': data.get('limit', DEFAULT_PAGE_SIZE),
+            'filters': data.get('filters'),
+            'order': order,
+            'after': data.get('after')
+        }
+        
+        # Arrow clients get numeric columns as raw buffers, with the paging fields in the schema metadata
+        if negotiate_format(data.get('format'), request.headers.get('Accept'), (FORMAT_JSON, FORMAT_ARROW)) == FORMAT_ARROW:
+            positions, page_info = page_positions(df, **options)
+            metadata = {**page_info, 'sort_by': sort_by, 'descending': descending, 'row_numbers': positions.tolist()}
+            return Response(frame_to_arrow_ipc(df.iloc[positions], metadata), mimetype=ARROW_MIME_TYPE)
+        
+        page = query_rows(df, **options)
+        return jsonify({'success': True, 'sort_by': sort_by, 'descending': descending, **page})
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        print(f"Rows error: {str(e)}")
+        return jsonify({'error': f'Failed to load rows: {str(e)}'}), 500
+
+# Duplicate groups per /duplicates page, and rows listed (with their values) per group
+DUPLICATE_GROUPS_PAGE_SIZE = 20
+MAX_DUPLICATE_GROUPS_PAGE_SIZE = 200
+MAX_ROWS_PER_DUPLICATE_GROUP = 20
+
+@app.route('/duplicates', methods=['POST'])
+def get_duplicates():
+    """One page of groups of duplicate rows: identical rows, or near duplicates of the text columns"""
+    try:
+        df = load_session_dataframe()
+        if df is None:
+            return jsonify({'error': 'No data uploaded'}), 400
+        
+        data = request.get_json() or {}
+        dataset_id = session['dataset_id']
+        mode = data.get('mode', 'exact')
+        
+        # Groups are cached per dataset (and settings), so paging through them searches once
+        if mode == 'exact':
+            groups = cached_analysis(dataset_id, exact_duplicate_groups, df, cached_row_index(dataset_id, df))
+            settings = {}
+        elif mode == 'near':
+            # Free-text columns by default: codes and categories would chain unrelated rows together
+            columns = data.get('columns') or free_text_columns(df)
+            if not columns:
+                raise ValueError('No free-text columns found for near duplicates; pass the text columns to compare')
+            threshold = float(data.get('threshold', app.config['NEAR_DUPLICATE_THRESHOLD']))
+            num_perm = app.config['MINHASH_PERMUTATIONS']
+            groups = cached_analysis(dataset_id, near_duplicate_groups, df, columns, threshold, num_perm,
+                                     variant=content_key(columns, threshold, num_perm))
+            settings = {'columns': columns, 'threshold': threshold}
+        else:
+            raise ValueError(f"Unknown duplicate mode: {mode} (use exact or near)")
+        
+        offset = max(0, int(data.get('offset', 0)))
+        limit = max(1, min(int(data.get('limit', DUPLICATE_GROUPS_PAGE_SIZE)), MAX_DUPLICATE_GROUPS_PAGE_SIZE))
+        page = groups.page(offset, limit, max_rows=MAX_ROWS_PER_DUPLICATE_GROUP)
+        for group in page:
+            group['records'] = records_for_json(df.iloc[group['rows']])
+        
+        return jsonify({
+            'success': True,
+            'mode': mode,
+            **settings,
+            'total_groups': len(groups),
+            # Rows beyond the first of their group, as drop_duplicates would remove for exact groups
+            'duplicate_rows': groups.row_count - len(groups),
+            'offset': offset,
+            'limit': limit,
+            'groups': page
+        })
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        print(f"Duplicates error: {str(e)}")
+        return jsonify({'error': f'Failed to find duplicates: {str(e)}'}), 500
+
+# Outputs of /correlations and /associations
+CORRELATION_OUTPUTS = ('top_k', 'sparse', 'matrix')
+MAX_CORRELATION_PAIRS = 10000
+
+def pair_matrix_output(matrix, columns, output, data, symmetric=True, value_name='correlation'):
+    """Response fields for a correlation/association matrix: the strongest pairs, the pairs above a threshold, or the matrix"""
+    if output == 'matrix':
+        return {'column_count': len(columns), 'columns': columns, 'matrix': matrix.astype(np.float64).round(3)}
+    if output == 'top_k':
+        k = max(1, min(int(data.get('k', app.config['CORRELATION_TOP_K'])), MAX_CORRELATION_PAIRS))
+        pairs = strongest_pairs(matrix, columns, k=k, symmetric=symmetric, value_name=value_name)
+        return {'column_count': len(columns), 'pairs': pairs}
+    # Every pair at or above the threshold (the strongest MAX_CORRELATION_PAIRS of them at most)
+    threshold = float(data.get('threshold', 0.5))
+    pairs = strongest_pairs(matrix, columns, k=MAX_CORRELATION_PAIRS, threshold=threshold,
+                            symmetric=symmetric, value_name=value_name)
+    return {'column_count': len(columns), 'threshold': threshold, 'pairs': pairs,
+            'truncated': len(pairs) == MAX_CORRELATION_PAIRS}
+
+@app.route('/correlations', methods=['POST'])
+def query_correlations():
+    """Correlations of the numeric columns: the strongest pairs, the pairs above a threshold, or the matrix"""
+    try:
+        df = load_session_dataframe()
+        if df is None:
+            return jsonify({'error': 'No data uploaded'}), 400
+        
+        data = request.get_json() or {}
+        method = data.get('method', PEARSON)
+        output = data.get('output', 'top_k')
+        if method not in CORRELATION_METHODS:
+            raise ValueError(f"Unknown correlation method: {method} (use {', '.join(CORRELATION_METHODS)})")
+        if output not in CORRELATION_OUTPUTS:
+            raise ValueError(f"Unknown correlation output: {output} (use {', '.join(CORRELATION_OUTPUTS)})")
+        
+        # The matrix of all numeric columns is cached; a column subset is read from it
+        corr_matrix = cached_correlation_matrix(session['dataset_id'], df, method)
+        if corr_matrix is None:
+            raise ValueError('Correlations need at least two numerical columns')
+        columns = data.get('columns')
+        if columns:
+            unknown = [col for col in columns if col not in corr_matrix.columns]
+            if unknown:
+                raise ValueError(f"Not numerical columns: {unknown}")
+            corr_matrix = corr_matrix.loc[columns, columns]
+        
+        response = {'success': True, 'method': method, 'output': output}
+        if method == KENDALL:
+            response['kendall_rows'] = min(len(df), app.config['KENDALL_SAMPLE_SIZE'])
+        response.update(pair_matrix_output(corr_matrix.to_numpy(), corr_matrix.columns.tolist(), output, data))
+        return jsonify(response)
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        print(f"Correlations error: {str(e)}")
+        return jsonify({'error': f'Failed to compute correlations: {str(e)}'}), 500
+
+@app.route('/associations', methods=['POST'])
+def query_associations():
+    """Associations of the categorical columns (Cramér's V or Theil's U), in the outputs of /correlations"""
+    try:
+        df = load_session_dataframe()
+        if df is None:
+            return jsonify({'error': 'No data uploaded'}), 400
         
-        # Outliers
-        analysis_results['outliers'] = detect_outliers(df)
+        data = request.get_json() or {}
+        measure = data.get('measure', CRAMERS_V)
+        output = data.get('output', 'top_k')
+        if measure not in ASSOCIATION_MEASURES:
+            raise ValueError(f"Unknown association measure: {measure} (use {', '.join(ASSOCIATION_MEASURES)})")
+        if output not in CORRELATION_OUTPUTS:
+            raise ValueError(f"Unknown association output: {output} (use {', '.join(CORRELATION_OUTPUTS)})")
+        
+        # Associations of all categorical columns are cached; a column subset is read from them
+        associations = cached_associations(session['dataset_id'], df)
+        columns = associations['columns']
+        if len(columns) < 2:
+            raise ValueError('Associations need at least two categorical columns')
+        matrix = associations[measure]
+        selected = data.get('columns')
+        if selected:
+            unknown = [col for col in selected if col not in columns]
+            if unknown:
+                raise ValueError(f"Not categorical columns: {unknown}")
+            positions = [columns.index(col) for col in selected]
+            matrix, columns = matrix[np.ix_(positions, positions)], list(selected)
+        
+        response = {
+            'success': True,
+            'measure': measure,
+            'output': output,
+            # Columns whose rarer categories were counted as one
+            'limited_columns': associations['limited'],
+            'max_categories': app.config['ASSOCIATION_MAX_CATEGORIES']
+        }
+        # Theil's U is asymmetric: row column given column column, so both directions are pairs
+        response.update(pair_matrix_output(matrix, columns, output, data, symmetric=measure != THEILS_U,
+                                           value_name=measure))
+        return jsonify(response)
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        print(f"Associations error: {str(e)}")
+        return jsonify({'error': f'Failed to compute associations: {str(e)}'}), 500
+
+@app.route('/profile', methods=['POST'])
+def profile_file():
+    """Profile a large CSV chunk by chunk without loading it into memory"""
+    try:
+        if 'file' not in request.files:
+            return jsonify({'error': 'No file uploaded'}), 400
         
-        # Normality tests
-        analysis_results['normality_tests'] = run_normality_tests(df)
+        file = request.files['file']
+        if file.filename == '':
+            return jsonify({'error': 'No file selected'}), 400
         
-        # Correlations
-        analysis_results['correlation'] = get_correlations(df)
+        if not allowed_file(file.filename):
+            return jsonify({'error': 'File type not allowed'}), 400
         
-        # Unique values
-        analysis_results['unique_values'] = {}
-        for col in df.columns:
-            if df[col].dtype == 'object' or df[col].dtype == 'string':
-                unique_vals = df[col].dropna().unique()
-                analysis_results['unique_values'][col] = unique_vals[:20].tolist()
+        # Spool the upload to disk so it can be read in chunks
+        file_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{uuid.uuid4().hex}_{secure_filename(file.filename)}")
+        file.save(file_path)
         
-        # Preview data (head and tail)
-        analysis_results['preview_head'] = df.head(10).to_dict('records')
-        analysis_results['preview_tail'] = df.tail(10).to_dict('records')
+        try:
+            file_extension = data_extension(file_path)
+            if file_extension != 'csv':
+                return jsonify({'error': 'Streaming profile supports CSV files only'}), 400
+            profile = profile_data(file_path, file_extension, chunksize=app.config['STREAMING_CHUNK_ROWS'])
+        finally:
+            os.remove(file_path)
         
-        # Store the complete analysis results in session
-        session['analysis_results'] = analysis_results
+        return jsonify(build_profile_response(profile))
         
-        return jsonify(analysis_results)
+    except Exception as e:
+        print(f"Profile error: {str(e)}")
+        return jsonify({'error': f'Profile failed: {str(e)}'}), 500
+
+@app.route('/analyze', methods=['POST'])
+def analyze_data():
+    try:
+        dataset_id = session.get('dataset_id')
+        # 'cardinality': 'exact' or 'approx' overrides CARDINALITY_MODE for the distinct counts
+        requested_cardinality = (request.get_json(silent=True) or {}).get('cardinality')
+        etag = analysis_etag('analyze', dataset_id, requested_cardinality)
+        # Unchanged data: the client reuses its copy (the ETag names the dataset version and settings)
+        if etag_matches(request.if_none_match, etag):
+            return not_modified(etag)
+        
+        if not dataset_store.exists(dataset_id or ''):
+            return jsonify({'error': 'No data available for analysis'}), 400
+        
+        # Batch timings of the per-column work are reported with the results (none when
+        # the bundle was already computed for this dataset, e.g. by a report)
+        with track_batches() as batch_timings:
+            try:
+                bundle = analysis_bundle(dataset_id, requested_cardinality)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+        analysis_results = bundle['analysis']
+        
+        # The results stay in the server-side bundle cache (the session cookie only names the dataset);
+        # worker count, batch timings and cache use describe this run only, so they are not part of the bundle
+        execution = {**column_executor.info(), 'batches': batch_timings, 'bundle_cache': analysis_bundles.info()}
+        return with_etag(jsonify({**analysis_results, 'execution': execution}), etag)
         
     except Exception as e:
         print(f"Error in analyze_data: {e}")
@@ -530,26 +1227,33 @@ def analyze_data():
 @app.route('/visualize', methods=['POST'])
 def visualize_data():
     try:
-        if 'data' not in session:
-            return jsonify({'error': 'No data available for visualization'}), 400
-        
-        data = session['data']
-        df = pd.DataFrame(data)
-        
         request_data = request.get_json()
         chart_type = request_data.get('chart_type')
         columns = request_data.get('columns', [])
         
         print(f'Visualization request: {chart_type} with columns {columns}')
-        print(f'DataFrame shape: {df.shape}')
         
         if not chart_type:
             return jsonify({'error': 'Chart type not specified'}), 400
         
+        # 'bdata' sends numeric trace data as base64 typed arrays instead of JSON number lists
+        data_format = negotiate_format(request_data.get('format'), None, (FORMAT_JSON, FORMAT_BDATA))
+        
+        # Correlation heatmaps: 'pearson' (default), 'spearman' or 'kendall'
+        method = request_data.get('method', PEARSON)
+        etag = analysis_etag('visualize', session.get('dataset_id'), chart_type, columns, data_format, method)
+        if etag_matches(request.if_none_match, etag) and dataset_store.exists(session.get('dataset_id', '')):
+            return not_modified(etag)
+        
+        df = load_session_dataframe()
+        if df is None:
+            return jsonify({'error': 'No data available for visualization'}), 400
+        print(f'DataFrame shape: {df.shape}')
+        
         # Create chart data based on type using FULL dataset
         if chart_type == 'histogram':
             plot_data = {
-                'x': df[columns[0]].tolist(),
+                'x': df[columns[0]],
                 'type': 'histogram',
                 'name': columns[0],
                 'marker': {'color': '#f59e0b'},
@@ -562,22 +1266,44 @@ def visualize_data():
             }
             
         elif chart_type == 'boxplot':
-            plot_data = {
-                'y': df[columns[0]].tolist(),
-                'type': 'box',
-                'name': columns[0],
-                'marker': {'color': '#f59e0b'},
-                'boxpoints': 'outliers'
-            }
-            layout = {
-                'title': f'Box Plot: {columns[0]} ({len(df)} data points)',
-                'yaxis': {'title': columns[0]}
-            }
+            profile = cached_numeric_profile(session['dataset_id'], df)
+            if profile.quantile_mode == QUANTILE_APPROX and columns[0] in profile.sketches:
+                # Quartiles from the column's quantile sketch and Tukey whiskers, instead of
+                # sending every value for the browser to sort
+                box = profile.box_stats(columns[0], df[columns[0]])
+                plot_data = {
+                    'x': [columns[0]],
+                    'q1': [box['q1']],
+                    'median': [box['median']],
+                    'q3': [box['q3']],
+                    'lowerfence': [box['lowerfence']],
+                    'upperfence': [box['upperfence']],
+                    'mean': [box['mean']],
+                    'type': 'box',
+                    'name': columns[0],
+                    'marker': {'color': '#f59e0b'}
+                }
+                layout = {
+                    'title': f"Box Plot: {columns[0]} ({len(df)} data points, {box['outliers']} outliers, approximate quartiles)",
+                    'yaxis': {'title': columns[0]}
+                }
+            else:
+                plot_data = {
+                    'y': df[columns[0]],
+                    'type': 'box',
+                    'name': columns[0],
+                    'marker': {'color': '#f59e0b'},
+                    'boxpoints': 'outliers'
+                }
+                layout = {
+                    'title': f'Box Plot: {columns[0]} ({len(df)} data points)',
+                    'yaxis': {'title': columns[0]}
+                }
             
         elif chart_type == 'scatter':
             plot_data = {
-                'x': df[columns[0]].tolist(),
-                'y': df[columns[1]].tolist(),
+                'x': df[columns[0]],
+                'y': df[columns[1]],
                 'type': 'scatter',
                 'mode': 'markers',
                 'name': f'{columns[0]} vs {columns[1]}',
@@ -594,11 +1320,22 @@ def visualize_data():
             }
             
         elif chart_type == 'correlation':
-            # Get correlation matrix from data_info if available
-            corr_matrix = df[df.select_dtypes(include=[np.number]).columns].corr()
+            if method not in CORRELATION_METHODS:
+                return jsonify({'error': f"Unknown correlation method: {method} (use {', '.join(CORRELATION_METHODS)})"}), 400
+            # Cached per dataset and method, like the /analyze matrix
+            corr_matrix = cached_correlation_matrix(session['dataset_id'], df, method)
+            if corr_matrix is None:
+                return jsonify({'error': 'Correlation heatmap needs at least two numerical columns'}), 400
+            max_columns = app.config['CORRELATION_MATRIX_MAX_COLUMNS']
+            if len(corr_matrix.columns) > max_columns:
+                # Wide tables: the columns of the strongest pairs instead of every pair
+                pairs = strongest_pairs(corr_matrix.to_numpy(), corr_matrix.columns, k=max_columns)
+                shown = list(dict.fromkeys(col for pair in pairs for col in (pair['column1'], pair['column2'])))
+                corr_matrix = corr_matrix.loc[shown[:max_columns], shown[:max_columns]]
             x_labels = corr_matrix.columns.tolist()
             y_labels = corr_matrix.columns.tolist()
-            z_values = corr_matrix.values.tolist()
+            # float32 typed arrays for bdata; rounded numbers for JSON
+            z_values = corr_matrix.to_numpy() if data_format == FORMAT_BDATA else corr_matrix.to_numpy(dtype=np.float64).round(3)
             
             plot_data = {
                 'z': z_values,
@@ -609,21 +1346,26 @@ def visualize_data():
                 'zmid': 0
             }
             layout = {
-                'title': f'Correlation Heatmap ({len(df)} data points)'
+                'title': f'{method.capitalize()} Correlation Heatmap ({len(x_labels)} columns, {len(df)} data points)'
             }
             
         elif chart_type == 'bar':
-            # Count occurrences for categorical data
-            value_counts = df[columns[0]].value_counts().to_dict()
+            # The most frequent values and one 'Other' bar, from the column's heavy-hitter
+            # counter, instead of a bar for every distinct value
+            hitters = cached_top_values(session['dataset_id'], df).get(columns[0])
+            if hitters is None:
+                hitters = column_heavy_hitters(df[columns[0]], app.config['TOP_VALUES_CAPACITY'])
+            labels, counts = bar_chart_counts(hitters, app.config['BAR_CHART_TOP_K'])
             plot_data = {
-                'x': list(value_counts.keys()),
-                'y': list(value_counts.values()),
+                'x': labels,
+                'y': np.array(counts),
                 'type': 'bar',
                 'marker': {'color': '#f59e0b'}
             }
+            approximate = ' - approximate counts' if hitters.floor else ''
             layout = {
-                'title': f'Bar Chart: {columns[0]} ({len(df)} data points)',
-                'xaxis': {'title': columns[0]},
+                'title': f'Bar Chart: {columns[0]} ({len(df)} data points{approximate})',
+                'xaxis': {'title': columns[0], 'type': 'category'},
                 'yaxis': {'title': 'Count'}
             }
         
@@ -642,13 +1384,11 @@ def visualize_data():
         if 'yaxis' in layout:
             layout['yaxis'].update({'gridcolor': '#334155', 'color': '#cbd5e1'})
         
-        return jsonify({
+        return with_etag(jsonify({
             'success': True,
-            'chart_data': {
-                'data': [plot_data],
-                'layout': layout
-            }
-        })
+            'format': data_format,
+            'chart_data': encode_figure({'data': [plot_data], 'layout': layout}, data_format)
+        }), etag)
         
     except Exception as e:
         print(f"Visualization error: {str(e)}")
@@ -657,36 +1397,30 @@ def visualize_data():
 @app.route('/generate_report', methods=['POST'])
 def generate_report():
     try:
-        if 'data' not in session:
-            return jsonify({'error': 'No data uploaded'}), 400
+        dataset_id = session.get('dataset_id')
+        etag = analysis_etag('generate_report', dataset_id)
+        if etag_matches(request.if_none_match, etag) and dataset_store.exists(dataset_id or ''):
+            return not_modified(etag)
         
-        # Reconstruct DataFrame from session
-        df = pd.DataFrame.from_dict(session['data'])
+        if not dataset_store.exists(dataset_id or ''):
+            return jsonify({'error': 'No data uploaded'}), 400
         
-        # Get all analysis data
-        data_info = get_data_info(df)
-        descriptive_stats = get_descriptive_stats(df)
-        categorical_stats = get_categorical_stats(df)
-        outliers = detect_outliers(df)
-        normality_tests = run_normality_tests(df)
-        correlations = get_correlations(df)
+        # Get all analysis data from the bundle shared with /analyze and the other report route
+        with track_batches() as batch_timings:
+            report_sections = analysis_bundle(dataset_id)['report']
         
         # Generate HTML report
         report_html = render_template(
             'report_template.html',
-            data_info=data_info,
-            descriptive_stats=descriptive_stats,
-            categorical_stats=categorical_stats,
-            outliers=outliers,
-            normality_tests=normality_tests,
-            correlations=correlations,
+            **report_sections,
             timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         )
         
-        return jsonify({
+        return with_etag(jsonify({
             'success': True,
-            'report_html': report_html
-        })
+            'report_html': report_html,
+            'execution': {**column_executor.info(), 'batches': batch_timings}
+        }), etag)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -694,32 +1428,25 @@ def generate_report():
 @app.route('/download_report', methods=['POST'])
 def download_report():
     try:
-        if 'data' not in session:
+        dataset_id = session.get('dataset_id')
+        if not dataset_store.exists(dataset_id or ''):
             return jsonify({'error': 'No data uploaded'}), 400
         
-        # Reconstruct DataFrame from session
-        df = pd.DataFrame.from_dict(session['data'])
-        
-        # Get all analysis data
-        data_info = get_data_info(df)
-        descriptive_stats = get_descriptive_stats(df)
-        categorical_stats = get_categorical_stats(df)
-        outliers = detect_outliers(df)
-        normality_tests = run_normality_tests(df)
-        correlations = get_correlations(df)
+        # Get all analysis data from the bundle shared with /analyze and the report preview
+        with track_batches() as batch_timings:
+            report_sections = analysis_bundle(dataset_id)['report']
         
         # Generate HTML report
         report_html = render_template(
             'report_template.html',
-            data_info=data_info,
-            descriptive_stats=descriptive_stats,
-            categorical_stats=categorical_stats,
-            outliers=outliers,
-            normality_tests=normality_tests,
-            correlations=correlations,
+            **report_sections,
             timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         )
         
+        if batch_timings:
+            print(f"Report analysis ran {len(batch_timings)} column batches in "
+                  f"{sum(batch['seconds'] for batch in batch_timings):.2f}s of worker time")
+        
         # Create a temporary file for download
         with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as tmp_file:
             tmp_file.write(report_html)
@@ -735,19 +1462,21 @@ def download_report():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Cleaning actions that only drop rows, leaving the values of the remaining rows unchanged
+ROW_FILTER_ACTIONS = {'drop_missing', 'drop_duplicates', 'remove_outliers'}
+
 @app.route('/clean_data', methods=['POST'])
 def clean_data():
     try:
-        if 'data' not in session:
+        df = load_session_dataframe()
+        if df is None:
             return jsonify({'error': 'No data uploaded'}), 400
+        parent_df = df
         
         data = request.get_json()
         action = data.get('action')
         columns = data.get('columns', [])
         
-        # Reconstruct DataFrame from session
-        df = pd.DataFrame.from_dict(session['data'])
-        
         if action == 'drop_missing':
             if columns:
                 df = df.dropna(subset=columns)
@@ -764,9 +1493,13 @@ def clean_data():
         elif action == 'fill_missing_mode':
             for col in columns:
                 if col in df.select_dtypes(include=['object', 'category']).columns:
-                    df[col] = df[col].fillna(df[col].mode()[0] if not df[col].mode().empty else 'Unknown')
+                    fill_value = df[col].mode()[0] if not df[col].mode().empty else 'Unknown'
+                    if isinstance(df[col].dtype, pd.CategoricalDtype) and fill_value not in df[col].cat.categories:
+                        df[col] = df[col].cat.add_categories([fill_value])
+                    df[col] = df[col].fillna(fill_value)
         elif action == 'drop_duplicates':
-            df = df.drop_duplicates()
+            # Keep the first row of each fingerprint instead of hashing every row again
+            df = df[cached_row_index(session['dataset_id'], df).keep_mask()]
         elif action == 'remove_outliers':
             for col in columns:
                 if col in df.select_dtypes(include=[np.number]).columns:
@@ -777,13 +1510,24 @@ def clean_data():
                     upper_bound = Q3 + 1.5 * IQR
                     df = df[(df[col] >= lower_bound) & (df[col] <= upper_bound)]
         
-        # Update session - convert to native Python types
-        session['data'] = convert_numpy_types(df.to_dict())
-        session['columns'] = list(df.columns)
-        session['shape'] = df.shape
+        # Store the cleaned data as a new dataset and point the session at it. The
+        # previous dataset is left to expire: other sessions may share its content ID
+        parent_id = session['dataset_id']
+        session['dataset_id'] = dataset_store.save(df)
+        # Columns the action left unchanged keep their cached results
+        column_cache.link(session['dataset_id'], parent_id)
+        if action in ROW_FILTER_ACTIONS:
+            # Only rows were dropped: the remaining rows keep their fingerprints (the
+            # stored frame has a RangeIndex, so the labels left are parent positions)
+            row_index = cached_row_index(parent_id, parent_df).subset(df.index.to_numpy())
+            dataset_store.save_result(session['dataset_id'], analysis_result_name(build_row_index), row_index)
+        active_sheet = session.get('active_sheet')
+        if active_sheet in session.get('sheet_datasets', {}):
+            session['sheet_datasets'] = {**session['sheet_datasets'], active_sheet: session['dataset_id']}
         
         # Get updated data info
-        data_info = get_data_info(df)
+        data_info = cached_data_info(session['dataset_id'], df)
+        cached_top_values(session['dataset_id'], df)
         
         return jsonify({
             'success': True,
@@ -801,7 +1545,7 @@ def get_cleaning_recommendations():
         print("=== Starting cleaning recommendations request ===")
         
         # Check if data exists in session
-        if 'data' not in session:
+        if not dataset_store.exists(session.get('dataset_id', '')):
             print("No data in session")
             return jsonify({'error': 'No data available for analysis'}), 400
         
@@ -813,41 +1557,18 @@ def get_cleaning_recommendations():
                 'details': 'Make sure you have created a .env file with your GEMINI_API_KEY'
             }), 503
         
-        # Check if analysis results exist in session
-        if 'analysis_results' not in session:
-            print("No analysis results found. Please run analysis first.")
-            return jsonify({
-                'error': 'No analysis results available. Please run the analysis first.',
-                'details': 'Click "Run Analysis" to generate statistics before getting recommendations.'
-            }), 400
-        
-        print("✓ Found existing analysis results in session")
-        
-        # Get the existing analysis results
-        analysis_results = session['analysis_results']
+        # The analysis results are read from the bundle /analyze computed for this dataset version
+        # ('cardinality' as sent to /analyze, so the same bundle is reused)
+        requested_cardinality = (request.get_json(silent=True) or {}).get('cardinality')
+        try:
+            analysis_results = analysis_bundle(session['dataset_id'], requested_cardinality)['analysis']
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        print("✓ Found existing analysis results")
         print(f"Analysis results keys: {list(analysis_results.keys())}")
         
-        # Convert NumPy types to Python native types for JSON serialization
-        def convert_numpy_types(obj):
-            if isinstance(obj, np.integer):
-                return int(obj)
-            elif isinstance(obj, np.floating):
-                return float(obj)
-            elif isinstance(obj, np.ndarray):
-                return obj.tolist()
-            elif isinstance(obj, dict):
-                return {key: convert_numpy_types(value) for key, value in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_numpy_types(item) for item in obj]
-            elif pd.isna(obj):
-                return None
-            else:
-                return obj
-        
-        # Convert the analysis results to JSON-serializable format
-        print("Converting analysis results to JSON-serializable format...")
-        serializable_results = convert_numpy_types(analysis_results)
-        print("✓ Conversion completed")
+        # Convert the analysis results to plain Python types for the prompt builder
+        serializable_results = to_builtin(analysis_results)
         
         # Call Gemini service with existing results
         try:
@@ -856,8 +1577,6 @@ def get_cleaning_recommendations():
             
             if recommendations:
                 print("✓ Gemini recommendations received")
-                # Store in session
-                session['cleaning_recommendations'] = recommendations
                 
                 return jsonify({
                     'success': True,
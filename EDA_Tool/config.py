@@ -18,6 +18,80 @@ class Config:
     # Upload configuration
     UPLOAD_FOLDER = 'temp_uploads'
     
+    # Server-side dataset store (only the dataset ID is kept in the session cookie)
+    DATASET_FOLDER = os.environ.get('DATASET_FOLDER', 'temp_datasets')
+    DATASET_MAX_AGE_SECONDS = int(os.environ.get('DATASET_MAX_AGE_SECONDS', 24 * 60 * 60))
+    
+    # Streaming profile configuration (rows per chunk for /profile)
+    STREAMING_CHUNK_ROWS = int(os.environ.get('STREAMING_CHUNK_ROWS', 100_000))
+    
+    # Dtype compaction after upload (lossless integer downcast, category/bool encoding)
+    COMPACT_DTYPES = os.environ.get('COMPACT_DTYPES', 'true').lower() == 'true'
+    COMPACT_FLOATS = os.environ.get('COMPACT_FLOATS', 'false').lower() == 'true'
+    COMPACT_ARROW_STRINGS = os.environ.get('COMPACT_ARROW_STRINGS', 'false').lower() == 'true'
+    
+    # Excel ingestion (sheets are parsed in parallel worker processes)
+    EXCEL_MAX_WORKERS = int(os.environ.get('EXCEL_MAX_WORKERS', 4))
+    
+    # Resumable chunked uploads (each chunk is one request, so chunks stay under MAX_CONTENT_LENGTH)
+    CHUNKED_UPLOAD_FOLDER = os.environ.get('CHUNKED_UPLOAD_FOLDER', 'temp_chunked_uploads')
+    CHUNKED_UPLOAD_MAX_BYTES = int(os.environ.get('CHUNKED_UPLOAD_MAX_MB', 2048)) * 1024 * 1024
+    CHUNK_SIZE_BYTES = int(os.environ.get('CHUNK_SIZE_MB', 8)) * 1024 * 1024
+    
+    # gzip/brotli for analysis responses (smaller bodies are sent uncompressed)
+    COMPRESSION_MIN_BYTES = int(os.environ.get('COMPRESSION_MIN_BYTES', 1024))
+    
+    # Percentiles: 'exact' (full sort), 'approx' (mergeable quantile sketches) or 'auto'
+    # (sketches from APPROX_QUANTILE_MIN_ROWS rows up); sketch rank error is at most about 3.5 / K
+    QUANTILE_MODE = os.environ.get('QUANTILE_MODE', 'auto').lower()
+    APPROX_QUANTILE_MIN_ROWS = int(os.environ.get('APPROX_QUANTILE_MIN_ROWS', 1_000_000))
+    QUANTILE_SKETCH_K = int(os.environ.get('QUANTILE_SKETCH_K', 200))
+    
+    # Distinct counts: 'exact' (nunique), 'approx' (HyperLogLog) or 'auto' (HyperLogLog from
+    # APPROX_DISTINCT_MIN_ROWS rows up); the HLL standard error is 1.04 / sqrt(2 ** HLL_PRECISION)
+    CARDINALITY_MODE = os.environ.get('CARDINALITY_MODE', 'auto').lower()
+    APPROX_DISTINCT_MIN_ROWS = int(os.environ.get('APPROX_DISTINCT_MIN_ROWS', 1_000_000))
+    HLL_PRECISION = int(os.environ.get('HLL_PRECISION', 14))
+    
+    # Most frequent values of categorical columns: TOP_VALUES_CAPACITY values are tracked per
+    # column (exact counts below that many distinct values), TOP_VALUES_K are listed in the
+    # analysis and BAR_CHART_TOP_K get their own bar, the rest are drawn as one 'Other' bar
+    TOP_VALUES_CAPACITY = int(os.environ.get('TOP_VALUES_CAPACITY', 1000))
+    TOP_VALUES_K = int(os.environ.get('TOP_VALUES_K', 10))
+    BAR_CHART_TOP_K = int(os.environ.get('BAR_CHART_TOP_K', 20))
+    
+    # Normality tests: Shapiro-Wilk up to 5000 values, D'Agostino K² above; larger columns are
+    # sampled (reproducibly, with NORMALITY_SEED) to NORMALITY_SAMPLE_SIZE values for the sample tests
+    NORMALITY_SAMPLE_SIZE = int(os.environ.get('NORMALITY_SAMPLE_SIZE', 5000))
+    NORMALITY_SEED = int(os.environ.get('NORMALITY_SEED', 0))
+    
+    # Per-column analysis of wide datasets: columns are split into batches of COLUMN_BATCH_SIZE
+    # run on COLUMN_WORKERS workers (0 = one per CPU) once a dataset has PARALLEL_MIN_COLUMNS columns
+    COLUMN_WORKERS = int(os.environ.get('COLUMN_WORKERS', 0))
+    COLUMN_BATCH_SIZE = int(os.environ.get('COLUMN_BATCH_SIZE', 32))
+    PARALLEL_MIN_COLUMNS = int(os.environ.get('PARALLEL_MIN_COLUMNS', 64))
+    
+    # Complete analysis results (/analyze and report sections) kept in memory for the most
+    # recently analyzed dataset versions; older ones are rebuilt from the per-column cache
+    ANALYSIS_BUNDLE_CACHE_SIZE = int(os.environ.get('ANALYSIS_BUNDLE_CACHE_SIZE', 16))
+    
+    # Near-duplicate rows (/duplicates mode=near): default Jaccard similarity of the words in
+    # the text columns, and MinHash values per row (more is more precise but slower)
+    NEAR_DUPLICATE_THRESHOLD = float(os.environ.get('NEAR_DUPLICATE_THRESHOLD', 0.8))
+    MINHASH_PERMUTATIONS = int(os.environ.get('MINHASH_PERMUTATIONS', 64))
+    
+    # Correlations are computed in blocks of this many columns. Above CORRELATION_MATRIX_MAX_COLUMNS
+    # numeric columns /analyze and the heatmap show the CORRELATION_TOP_K strongest pairs instead of
+    # the full matrix. Kendall's tau compares every pair of rows, so it uses a sample of rows
+    CORRELATION_BLOCK_SIZE = int(os.environ.get('CORRELATION_BLOCK_SIZE', 256))
+    CORRELATION_MATRIX_MAX_COLUMNS = int(os.environ.get('CORRELATION_MATRIX_MAX_COLUMNS', 100))
+    CORRELATION_TOP_K = int(os.environ.get('CORRELATION_TOP_K', 50))
+    KENDALL_SAMPLE_SIZE = int(os.environ.get('KENDALL_SAMPLE_SIZE', 1000))
+    
+    # Categorical associations (Cramér's V, Theil's U): categories kept per column, the rarer
+    # ones are counted together so contingency tables of very wide code sets stay small
+    ASSOCIATION_MAX_CATEGORIES = int(os.environ.get('ASSOCIATION_MAX_CATEGORIES', 50))
+    
     # Supported file extensions
     ALLOWED_EXTENSIONS = {'csv', 'xlsx', 'xls'}
     
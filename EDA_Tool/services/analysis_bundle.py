@@ -0,0 +1,95 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class AnalysisBundleCache:
+    """
+    In-process LRU cache of complete analysis results, one bundle per dataset version
+
+    A bundle holds every section /analyze and the reports show, so preview,
+    download and re-analysis of the same data read one shared result instead
+    of each loading the dataset and assembling the sections again. Keys name
+    the dataset version and the analysis settings. Each bundle is computed at
+    most once: concurrent requests for a key that is being computed wait for
+    that computation instead of starting their own.
+
+    Bundles are shared between requests and must not be modified.
+    """
+
+    def __init__(self, max_entries: int = 16):
+        """
+        Initialize the bundle cache
+
+        Args:
+            max_entries: Bundles kept; the least recently used one is evicted beyond this
+        """
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._bundles: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        # key -> lock held while that bundle is computed
+        self._computing: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Get the bundle for a key, computing it if no request has yet
+
+        Args:
+            key: Dataset version and analysis settings (e.g. an analysis ETag)
+            compute: Builds the bundle; called at most once per key while it is cached
+
+        Returns:
+            The cached or newly computed bundle
+        """
+        with self._lock:
+            bundle = self._lookup(key)
+            if bundle is not None:
+                return bundle
+            key_lock = self._computing.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                # Another request may have computed it while this one waited
+                bundle = self._lookup(key)
+                if bundle is not None:
+                    return bundle
+                self.misses += 1
+            try:
+                bundle = compute()
+            except BaseException:
+                with self._lock:
+                    self._computing.pop(key, None)
+                raise
+
+            # Cached and released together, so no request finds neither the bundle nor the key lock
+            with self._lock:
+                self._bundles[key] = bundle
+                self._computing.pop(key, None)
+                while len(self._bundles) > self.max_entries:
+                    evicted, _ = self._bundles.popitem(last=False)
+                    logger.info(f"Evicted analysis bundle {evicted}")
+        return bundle
+
+    def info(self) -> Dict[str, int]:
+        """Number of cached bundles, capacity, hits and misses"""
+        with self._lock:
+            return {
+                'entries': len(self._bundles),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+    def _lookup(self, key: str) -> Any:
+        # Caller holds self._lock
+        bundle = self._bundles.get(key)
+        if bundle is not None:
+            self._bundles.move_to_end(key)
+            self.hits += 1
+        return bundle
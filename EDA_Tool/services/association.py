@@ -0,0 +1,203 @@
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from services.column_executor import ColumnExecutor
+from services.top_values import CATEGORICAL_DTYPES
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CRAMERS_V = 'cramers_v'
+THEILS_U = 'theils_u'
+ASSOCIATION_MEASURES = (CRAMERS_V, THEILS_U)
+
+# Categories kept per column; the rest are counted together as one 'other' category
+DEFAULT_MAX_CATEGORIES = 50
+
+# Row x column cells of the index block behind one bincount
+BLOCK_CELLS = 8 * 1024 * 1024
+
+def encode_columns(df: pd.DataFrame, columns: Sequence[Any],
+                   max_categories: int = DEFAULT_MAX_CATEGORIES) -> Dict[Any, Tuple[np.ndarray, int, int]]:
+    """
+    Integer codes of categorical columns, for building contingency tables with bincount
+
+    Codes run from 0 to the number of categories - 1, and missing values get
+    the code after those (the number of categories), so tables need no mask
+    and their last row/column is dropped. Beyond max_categories the most
+    frequent max_categories - 1 values keep their own code and the rest
+    share the last one. Codes use the smallest unsigned type that fits.
+
+    Returns:
+        Dictionary from column to (codes, number of categories, number of distinct values)
+    """
+    encoded = {}
+    for col in columns:
+        codes, uniques = pd.factorize(df[col], use_na_sentinel=True)
+        categories = distinct = len(uniques)
+        if categories > max_categories:
+            counts = np.bincount(codes[codes >= 0], minlength=categories)
+            kept = np.argsort(-counts, kind='stable')[:max_categories - 1]
+            mapping = np.full(categories, max_categories - 1, dtype=np.int64)
+            mapping[kept] = np.arange(len(kept))
+            codes = np.where(codes >= 0, mapping[np.maximum(codes, 0)], -1)
+            categories = max_categories
+        codes = np.where(codes >= 0, codes, categories)
+        dtype = np.uint8 if categories < 2 ** 8 else np.uint16 if categories < 2 ** 16 else np.uint32
+        encoded[col] = (codes.astype(dtype), categories, distinct)
+    return encoded
+
+def _pair_statistics(table: np.ndarray) -> Tuple[float, float, float]:
+    """Cramér's V and Theil's U in both directions from one contingency table (rows: a, columns: b)"""
+    rows = table.sum(axis=1)
+    cols = table.sum(axis=0)
+    # Categories that never occur alongside the other column do not count
+    table = table[rows > 0][:, cols > 0]
+    rows, cols = rows[rows > 0], cols[cols > 0]
+    n = rows.sum()
+    if n == 0 or len(rows) < 2 or len(cols) < 2:
+        return np.nan, np.nan, np.nan
+
+    # chi² = n * (sum of O² / (row total * column total) - 1)
+    chi2 = n * ((table ** 2 / np.outer(rows, cols)).sum() - 1.0)
+    cramers_v = np.sqrt(max(chi2, 0.0) / n / (min(len(rows), len(cols)) - 1))
+
+    def entropy(counts):
+        p = counts[counts > 0] / n
+        return -(p * np.log(p)).sum()
+
+    entropy_a, entropy_b = entropy(rows), entropy(cols)
+    mutual_information = max(entropy_a + entropy_b - entropy(table.ravel()), 0.0)
+    return (min(cramers_v, 1.0), min(mutual_information / entropy_a, 1.0),
+            min(mutual_information / entropy_b, 1.0))
+
+def pair_partners(position: int, count: int) -> List[int]:
+    """
+    Columns paired with the column at position, so every pair is computed once
+
+    Each column takes the next count // 2 columns (wrapping around), which
+    spreads the pairs evenly over the columns instead of the first columns
+    getting most of them.
+    """
+    partners = []
+    for distance in range(1, count // 2 + 1):
+        if count % 2 == 0 and distance == count // 2 and position >= distance:
+            break
+        partners.append((position + distance) % count)
+    return partners
+
+def pair_associations(codes: pd.DataFrame, columns: Sequence[Any], all_columns: Sequence[Any],
+                      categories: Dict[Any, int]) -> Dict[Any, Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Associations of each given column with its partner columns (batch function for ColumnExecutor)
+
+    The contingency tables of a column and a block of partners are built by
+    a single bincount over the combined codes of every pair, offset so each
+    pair has its own range of bins; rows missing either value land in the
+    tables' last row or column, which is dropped.
+
+    Args:
+        codes: Integer codes of every column, from encode_columns()
+        columns: Columns of this batch
+        all_columns: Every column, in matrix order
+        categories: Number of categories per column
+
+    Returns:
+        Dictionary from column to (partner positions, Cramér's V, Theil's U of the column given
+        each partner, Theil's U of each partner given the column)
+    """
+    all_columns = list(all_columns)
+    results = {}
+    for col in columns:
+        position = all_columns.index(col)
+        partners = pair_partners(position, len(all_columns))
+        a = codes[col].to_numpy().astype(np.intp)
+        rows = len(a)
+        k_a = categories[col] + 1
+        cramers_v = np.full(len(partners), np.nan)
+        u_given_partner = np.full(len(partners), np.nan)
+        u_of_partner = np.full(len(partners), np.nan)
+
+        block_size = max(1, BLOCK_CELLS // max(1, rows))
+        bins = np.empty(rows * min(block_size, max(1, len(partners))), dtype=np.intp)
+        for start in range(0, len(partners), block_size):
+            block = partners[start:start + block_size]
+            k_b = [categories[all_columns[j]] + 1 for j in block]
+            offsets = np.concatenate([[0], np.cumsum([k_a * k for k in k_b])])
+
+            # Bin of each row in pair i: offset of the pair's table + code of a * width + code of b
+            for i, j in enumerate(block):
+                pair_bins = bins[i * rows:(i + 1) * rows]
+                np.multiply(a, k_b[i], out=pair_bins)
+                pair_bins += offsets[i]
+                pair_bins += codes[all_columns[j]].to_numpy()
+            counts = np.bincount(bins[:len(block) * rows], minlength=offsets[-1]).astype(np.float64)
+
+            for i, j in enumerate(block):
+                table = counts[offsets[i]:offsets[i + 1]].reshape(k_a, k_b[i])[:-1, :-1]
+                cramers_v[start + i], u_given_partner[start + i], u_of_partner[start + i] = _pair_statistics(table)
+        results[col] = (np.array(partners, dtype=np.int64), cramers_v, u_given_partner, u_of_partner)
+    return results
+
+def categorical_associations(df: pd.DataFrame, columns: Optional[Sequence[Any]] = None,
+                             max_categories: int = DEFAULT_MAX_CATEGORIES,
+                             executor: Optional[ColumnExecutor] = None) -> Dict[str, Any]:
+    """
+    Cramér's V and Theil's U between every pair of categorical columns
+
+    Every column is integer-coded once; the contingency tables of all pairs
+    are then counted with bincount on those codes instead of a crosstab per
+    pair, and the pairs run in balanced batches on the executor. Rows missing
+    either value of a pair are left out of its table.
+
+    Args:
+        df: DataFrame to analyze
+        columns: Categorical columns (default: object, string, category and boolean columns)
+        max_categories: Categories kept per column, the rest counted as one
+        executor: Runs batches of columns in parallel
+
+    Returns:
+        Dictionary with 'columns', 'cramers_v' (symmetric matrix), 'theils_u' (row i, column j:
+        the uncertainty coefficient of column i given column j), 'categories' (per column, after
+        the limit) and 'limited' (columns whose rarer categories were combined). Undefined values,
+        e.g. for columns with a single category, are NaN
+    """
+    if columns is None:
+        columns = df.select_dtypes(include=CATEGORICAL_DTYPES + ['bool']).columns
+    columns = list(columns)
+    if max_categories < 2:
+        raise ValueError("max_categories must be at least 2")
+
+    encoded = encode_columns(df, columns, max_categories)
+    codes = pd.DataFrame({col: encoded[col][0] for col in columns}, columns=columns)
+    categories = {col: encoded[col][1] for col in columns}
+    if executor is not None:
+        pairs = executor.map('associations', pair_associations, codes, columns, columns, categories)
+    else:
+        pairs = pair_associations(codes, columns, columns, categories)
+
+    cramers_v = np.full((len(columns), len(columns)), np.nan)
+    theils_u = np.full((len(columns), len(columns)), np.nan)
+    for i, col in enumerate(columns):
+        partners, v, u_given_partner, u_of_partner = pairs[col]
+        cramers_v[i, partners] = cramers_v[partners, i] = v
+        theils_u[i, partners] = u_given_partner
+        theils_u[partners, i] = u_of_partner
+
+    # A column is perfectly associated with itself when it has two or more categories
+    defined = np.array([encoded[col][2] > 1 for col in columns], dtype=bool)
+    diagonal = np.arange(len(columns))
+    cramers_v[diagonal[defined], diagonal[defined]] = 1.0
+    theils_u[diagonal[defined], diagonal[defined]] = 1.0
+    logger.info(f"Associations of {len(columns)} categorical columns ({len(columns) * (len(columns) - 1) // 2} pairs)")
+    return {
+        'columns': columns,
+        CRAMERS_V: cramers_v,
+        THEILS_U: theils_u,
+        'categories': categories,
+        'limited': [col for col in columns if encoded[col][2] > max_categories]
+    }
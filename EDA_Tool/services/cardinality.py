@@ -0,0 +1,97 @@
+import logging
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from services.sketches import DistinctCounter
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Distinct counts: exact hash sets (nunique), or HyperLogLog sketches
+CARDINALITY_EXACT = 'exact'
+CARDINALITY_APPROX = 'approx'
+
+# Rows hashed at a time, so memory stays bounded on long columns
+DISTINCT_CHUNK_ROWS = 200_000
+
+def distinct_sketch(series: pd.Series, precision: int = 14,
+                    chunk_rows: int = DISTINCT_CHUNK_ROWS) -> DistinctCounter:
+    """
+    HyperLogLog sketch of a column's non-null values
+
+    Each chunk of rows gets its own sketch and the sketches are merged, the
+    same way sketches of separate files or partitions are combined.
+    """
+    sketch = DistinctCounter(precision)
+    for start in range(0, len(series), chunk_rows):
+        chunk_sketch = DistinctCounter(precision)
+        # Text columns worth sketching are mostly unique, so skip factorizing before hashing
+        chunk_sketch.update(series.iloc[start:start + chunk_rows], categorize=False)
+        sketch.merge(chunk_sketch)
+    return sketch
+
+def count_distinct(series: pd.Series, mode: str = CARDINALITY_EXACT,
+                   precision: int = 14) -> Dict[str, Any]:
+    """
+    Number of distinct non-null values in a column
+
+    Args:
+        series: Column to count
+        mode: CARDINALITY_EXACT (nunique) or CARDINALITY_APPROX (HyperLogLog)
+        precision: HyperLogLog precision p; the standard error is 1.04 / sqrt(2 ** p)
+            (0.8% for the default 14) and the sketch uses 2 ** p bytes
+
+    Returns:
+        Dictionary with 'count', 'approximate' and, for estimates, 'relative_error'
+    """
+    if mode not in (CARDINALITY_EXACT, CARDINALITY_APPROX):
+        raise ValueError(f"Unknown cardinality mode: {mode}")
+    if mode == CARDINALITY_EXACT or isinstance(series.dtype, pd.CategoricalDtype):
+        # Categorical columns are already encoded, so the exact count is cheap
+        return {'count': int(series.nunique()), 'approximate': False}
+
+    sketch = distinct_sketch(series, precision)
+    # An estimate can overshoot slightly; it can never exceed the number of values
+    return {
+        'count': min(sketch.estimate(), int(series.count())),
+        'approximate': True,
+        'relative_error': round(sketch.relative_error(), 4)
+    }
+
+def first_unique(series: pd.Series, limit: int = 20, chunk_rows: int = 10_000) -> List[Any]:
+    """
+    The first `limit` distinct non-null values, in order of first appearance
+
+    Same result as pd.unique(series.dropna())[:limit], but the column is read
+    in chunks and reading stops once enough values were found, instead of
+    building a hash set of every value.
+    """
+    seen = {}
+    for start in range(0, len(series), chunk_rows):
+        for value in pd.unique(series.iloc[start:start + chunk_rows].dropna().to_numpy()):
+            if value not in seen:
+                seen[value] = None
+                if len(seen) == limit:
+                    return list(seen)
+    return list(seen)
+
+def distinct_values(df: pd.DataFrame, columns: List[Any], mode: str = CARDINALITY_EXACT,
+                    precision: int = 14, limit: int = 20) -> Dict[Any, Dict[str, Any]]:
+    """
+    First distinct values and distinct count of a batch of columns
+
+    Batch function for ColumnExecutor: hashing Python objects holds the GIL,
+    so wide tables spread these batches over worker processes.
+
+    Returns:
+        Dictionary with 'unique_values' (first_unique) and 'distinct' (count_distinct) per column
+    """
+    return {
+        col: {
+            'unique_values': first_unique(df[col], limit),
+            'distinct': count_distinct(df[col], mode, precision)
+        }
+        for col in columns
+    }
@@ -0,0 +1,187 @@
+import json
+import hashlib
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from services.column_executor import ColumnExecutor
+from services.correlation import PEARSON, correlation_matrix
+from services.dataset_store import DatasetStore
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Ancestors searched for reusable results (each /clean_data step adds one)
+MAX_LINEAGE_DEPTH = 8
+
+def column_hash(name: Any, series: pd.Series) -> str:
+    """
+    Content hash of one column: its name, dtype, length and a vectorized hash of every value
+
+    The name is part of the hash because some results depend on it (the
+    normality sample is seeded with it). Equal hashes mean the same values in
+    the same row order, so per-column and pairwise results stay valid.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([str(name), str(series.dtype), len(series)]).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(series, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:32]
+
+class ColumnCache:
+    """
+    Per-column analysis results, keyed by dataset version and column content hash
+
+    Results live in the dataset store's result cache: each dataset keeps a
+    dictionary from column hash to result per analysis. A dataset derived
+    from another one (by /clean_data) is linked to it with link(); a lookup
+    that misses on the dataset itself takes the results of unchanged columns
+    from its ancestors, so after a cleaning step only the columns whose data
+    changed are recomputed. Correlations are cached the same way per pair of
+    columns.
+    """
+
+    def __init__(self, store: DatasetStore, version: int = 1):
+        """
+        Initialize the column cache
+
+        Args:
+            store: Dataset store holding the datasets and their cached results
+            version: Bump when a per-column analysis changes so cached results are recomputed
+        """
+        self.store = store
+        self.version = version
+
+    def link(self, dataset_id: str, parent_id: str) -> None:
+        """Record that dataset_id was derived from parent_id (e.g. by a cleaning step)"""
+        if dataset_id != parent_id:
+            self.store.save_result(dataset_id, 'parent', parent_id)
+
+    def lineage(self, dataset_id: str) -> List[str]:
+        """The dataset ID followed by its ancestors, nearest first"""
+        ids = [dataset_id]
+        while len(ids) <= MAX_LINEAGE_DEPTH:
+            parent_id = self.store.load_result(ids[-1], 'parent')
+            if parent_id is None or parent_id in ids or not self.store.exists(parent_id):
+                break
+            ids.append(parent_id)
+        return ids
+
+    def hashes(self, dataset_id: str, df: pd.DataFrame, columns: List[Any]) -> Dict[Any, str]:
+        """Content hashes of the given columns, cached per dataset"""
+        known = self.store.load_result(dataset_id, 'column_hashes') or {}
+        missing = [col for col in columns if col not in known]
+        if missing:
+            known = {**known, **{col: column_hash(col, df[col]) for col in missing}}
+            self.store.save_result(dataset_id, 'column_hashes', known)
+        return {col: known[col] for col in columns}
+
+    def results(self, dataset_id: str, name: str, func: Callable[..., Dict[Any, Any]], df: pd.DataFrame,
+                columns: List[Any], *args: Any, variant: Optional[str] = None,
+                executor: Optional[ColumnExecutor] = None, source: Optional[str] = None) -> Dict[Any, Any]:
+        """
+        Per-column results of a batch function, computing only the columns not cached
+
+        Args:
+            dataset_id: Dataset the columns belong to
+            name: Analysis name (letters, digits and underscores)
+            func: Batch function called as func(df, columns, *args), returning a dictionary keyed by column
+            df: DataFrame of the dataset
+            columns: Columns to get results for
+            *args: Extra arguments for func; anything that changes the results must be named by variant
+            variant: Distinguishes results computed with different arguments
+            executor: Runs the missing columns in parallel batches
+            source: Parquet file of the dataset, for executor worker processes
+
+        Returns:
+            Dictionary with the result of every column, in column order
+        """
+        columns = list(columns)
+        if not columns:
+            return {}
+        result_name = self._result_name(name, variant)
+        hashes = self.hashes(dataset_id, df, columns)
+
+        own = self.store.load_result(dataset_id, result_name) or {}
+        found = {col: own[hashes[col]] for col in columns if hashes[col] in own}
+        if len(found) < len(columns):
+            for ancestor_id in self.lineage(dataset_id)[1:]:
+                cached = self.store.load_result(ancestor_id, result_name) or {}
+                found.update({col: cached[hashes[col]] for col in columns
+                              if col not in found and hashes[col] in cached})
+                if len(found) == len(columns):
+                    break
+
+        missing = [col for col in columns if col not in found]
+        if missing:
+            if executor is not None:
+                found.update(executor.map(name, func, df, missing, *args, source=source))
+            else:
+                found.update(func(df, missing, *args))
+            logger.info(f"{name}: computed {len(missing)} of {len(columns)} columns of {dataset_id}")
+        if any(hashes[col] not in own for col in columns):
+            own = {**own, **{hashes[col]: found[col] for col in columns}}
+            self.store.save_result(dataset_id, result_name, own)
+        return {col: found[col] for col in columns}
+
+    def correlations(self, dataset_id: str, df: pd.DataFrame, columns: List[Any], method: str = PEARSON,
+                     variant: Optional[str] = None, **options: Any) -> pd.DataFrame:
+        """
+        Correlation matrix of the given numeric columns, recomputing only changed pairs
+
+        Pairs of columns that are unchanged since an ancestor's matrix was
+        computed are copied from it; each changed column is correlated with
+        every column (pairwise complete observations, as DataFrame.corr()).
+
+        Args:
+            dataset_id: Dataset the columns belong to
+            df: DataFrame of the dataset
+            columns: Numeric columns to correlate
+            method: 'pearson', 'spearman' or 'kendall'
+            variant: Distinguishes results computed with different options
+            **options: Passed to correlation_matrix() (block size, Kendall sample)
+
+        Returns:
+            float32 correlation matrix indexed by column (NaN where undefined)
+        """
+        columns = list(columns)
+        result_name = self._result_name(f"correlations_{method}", variant)
+        hashes = self.hashes(dataset_id, df, columns)
+        keys = [hashes[col] for col in columns]
+
+        previous = None
+        for ancestor_id in self.lineage(dataset_id):
+            previous = self.store.load_result(ancestor_id, result_name)
+            if previous is not None and previous.index.isin(keys).any():
+                break
+            previous = None
+
+        known = pd.Index(keys).isin(previous.index) if previous is not None else np.zeros(len(keys), dtype=bool)
+        changed = [col for col, is_known in zip(columns, known) if not is_known]
+        if len(changed) > len(columns) // 2 or len(keys) != len(set(keys)):
+            # Most pairs changed: one full pass is faster than column by column
+            matrix = pd.DataFrame(correlation_matrix(df, columns, method=method, **options),
+                                  index=columns, columns=columns)
+        else:
+            matrix = previous.reindex(index=keys, columns=keys)
+            matrix.index = matrix.columns = pd.Index(columns)
+            if changed:
+                positions = np.flatnonzero(~known)
+                correlations = correlation_matrix(df, changed, columns, method=method, **options)
+                values = matrix.to_numpy(dtype=np.float32, copy=True)
+                values[positions, :] = correlations
+                values[:, positions] = correlations.T
+                matrix = pd.DataFrame(values, index=matrix.index, columns=matrix.columns)
+
+        if changed:
+            logger.info(f"{method} correlations: computed {len(changed)} of {len(columns)} columns of {dataset_id}")
+            cached = matrix.copy()
+            cached.index = cached.columns = pd.Index(keys)
+            self.store.save_result(dataset_id, result_name, cached)
+        return matrix
+
+    def _result_name(self, name: str, variant: Optional[str] = None) -> str:
+        result_name = f"columns_{name}_v{self.version}"
+        return f"{result_name}_{variant}" if variant else result_name
@@ -0,0 +1,238 @@
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from services.column_executor import column_batches
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PEARSON = 'pearson'
+SPEARMAN = 'spearman'
+KENDALL = 'kendall'
+CORRELATION_METHODS = (PEARSON, SPEARMAN, KENDALL)
+
+# Columns per block: each pair of blocks is a handful of float32 matrix products
+DEFAULT_BLOCK_SIZE = 256
+
+# Kendall's tau compares every pair of rows, so it runs on a seeded sample of this many rows
+KENDALL_SAMPLE_SIZE = 1000
+
+# Row pairs x columns held per Kendall block (float32 cells)
+KENDALL_BLOCK_CELLS = 16 * 1024 * 1024
+
+# Pairs whose variance is lost in float32 cancellation are undefined rather than noise
+RELATIVE_VARIANCE_TOLERANCE = 1e-5
+
+def _column_values(df: pd.DataFrame, columns: Sequence[Any], rows: Optional[np.ndarray] = None) -> np.ndarray:
+    values = np.empty((len(df) if rows is None else len(rows), len(columns)), dtype=np.float64)
+    for i, col in enumerate(columns):
+        series = df[col] if rows is None else df[col].iloc[rows]
+        values[:, i] = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    return values
+
+def _moment_block(df: pd.DataFrame, columns: Sequence[Any], method: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Standardized float32 values (0 where missing) and the presence mask (None if nothing is missing)"""
+    if method == SPEARMAN:
+        # Average ranks of each column's own values; missing values stay missing
+        values = _column_values(df[list(columns)].rank(method='average'), columns)
+    else:
+        values = _column_values(df, columns)
+    present = ~np.isnan(values)
+    counts = np.maximum(present.sum(axis=0), 1)
+    centered = np.where(present, values, 0.0)
+    centered -= centered.sum(axis=0) / counts
+    centered[~present] = 0.0
+    std = np.sqrt((centered ** 2).sum(axis=0) / counts)
+    standardized = (centered / np.where(std > 0, std, 1.0)).astype(np.float32)
+    mask = None if present.all() else present.astype(np.float32)
+    return standardized, mask
+
+def _moment_correlations(a: Tuple[np.ndarray, Optional[np.ndarray]],
+                         b: Tuple[np.ndarray, Optional[np.ndarray]]) -> np.ndarray:
+    """Pearson correlations between two blocks over the rows present in both columns of each pair"""
+    xa, ma = a
+    xb, mb = b
+    products = (xa.T @ xb).astype(np.float64)
+    if ma is None and mb is None:
+        count = np.float64(len(xa))
+        sum_a = xa.sum(axis=0, dtype=np.float64)[:, None]
+        sum_b = xb.sum(axis=0, dtype=np.float64)[None, :]
+        squares_a = (xa * xa).sum(axis=0, dtype=np.float64)[:, None]
+        squares_b = (xb * xb).sum(axis=0, dtype=np.float64)[None, :]
+    else:
+        # Sums over the rows where the other column of the pair is present
+        ma = ma if ma is not None else np.ones_like(xa)
+        mb = mb if mb is not None else np.ones_like(xb)
+        count = (ma.T @ mb).astype(np.float64)
+        sum_a = (xa.T @ mb).astype(np.float64)
+        sum_b = (ma.T @ xb).astype(np.float64)
+        squares_a = ((xa * xa).T @ mb).astype(np.float64)
+        squares_b = (ma.T @ (xb * xb)).astype(np.float64)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariance = products - sum_a * sum_b / count
+        variance_a = squares_a - sum_a ** 2 / count
+        variance_b = squares_b - sum_b ** 2 / count
+        correlations = covariance / np.sqrt(variance_a * variance_b)
+    undefined = ((count < 2) | (variance_a <= RELATIVE_VARIANCE_TOLERANCE * squares_a)
+                 | (variance_b <= RELATIVE_VARIANCE_TOLERANCE * squares_b))
+    correlations = np.clip(correlations, -1.0, 1.0)
+    correlations[undefined] = np.nan
+    return correlations
+
+def _kendall_block(df: pd.DataFrame, columns: Sequence[Any], rows: np.ndarray,
+                   pairs: Tuple[np.ndarray, np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sign of every row pair's difference (0 where tied or missing), its magnitude and the pair's presence"""
+    values = _column_values(df, columns, rows)
+    # One row-pair-sized float64 buffer, reused in place
+    differences = values[pairs[1]]
+    differences -= values[pairs[0]]
+    with np.errstate(invalid='ignore'):
+        np.sign(differences, out=differences)
+    present = ~np.isnan(differences)
+    differences[~present] = 0.0
+    signs = differences.astype(np.float32)
+    del differences
+    return signs, np.abs(signs), present.astype(np.float32)
+
+def _kendall_correlations(a: Tuple[np.ndarray, np.ndarray, np.ndarray],
+                          b: Tuple[np.ndarray, np.ndarray, np.ndarray]) -> np.ndarray:
+    """Kendall's tau-b between two blocks over the row pairs present in both columns of each pair"""
+    signs_a, untied_a, present_a = a
+    signs_b, untied_b, present_b = b
+    concordance = (signs_a.T @ signs_b).astype(np.float64)
+    # Row pairs not tied in one column, among those present in the other
+    untied_pairs_a = (untied_a.T @ present_b).astype(np.float64)
+    untied_pairs_b = (present_a.T @ untied_b).astype(np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        correlations = concordance / np.sqrt(untied_pairs_a * untied_pairs_b)
+    correlations[(untied_pairs_a == 0) | (untied_pairs_b == 0)] = np.nan
+    return np.clip(correlations, -1.0, 1.0)
+
+def kendall_rows(rows: int, sample_size: int = KENDALL_SAMPLE_SIZE, seed: int = 0) -> np.ndarray:
+    """Positions of the rows Kendall's tau is computed on: all of them, or a seeded sample"""
+    if rows <= sample_size:
+        return np.arange(rows)
+    return np.sort(np.random.default_rng(seed).choice(rows, size=sample_size, replace=False))
+
+def correlation_matrix(df: pd.DataFrame, columns: Sequence[Any], other: Optional[Sequence[Any]] = None,
+                       method: str = PEARSON, block_size: int = DEFAULT_BLOCK_SIZE,
+                       kendall_sample_size: int = KENDALL_SAMPLE_SIZE, seed: int = 0) -> np.ndarray:
+    """
+    Correlations of numeric columns, computed in float32 blocks of columns
+
+    Each pair of column blocks is a few matrix products, so wide tables are
+    never looped over pair by pair. Missing values are handled pairwise, as
+    DataFrame.corr() does: every correlation uses the rows where both of its
+    columns are present.
+
+    Spearman correlates the average ranks of each column's values (when
+    values are missing, pandas re-ranks per pair instead, so results can
+    differ slightly). Kendall's tau-b compares every pair of rows and runs on
+    a seeded sample of kendall_sample_size rows.
+
+    Args:
+        df: DataFrame holding the columns
+        columns: Columns of the result's rows
+        other: Columns of the result's columns (default: the same columns, giving a symmetric matrix)
+        method: 'pearson', 'spearman' or 'kendall'
+        block_size: Columns per block
+        kendall_sample_size: Rows Kendall's tau is computed on at most
+        seed: Seed of the Kendall row sample
+
+    Returns:
+        float32 array of shape (len(columns), len(other)); NaN where a correlation is undefined
+        (constant columns, fewer than two shared rows)
+    """
+    if method not in CORRELATION_METHODS:
+        raise ValueError(f"Unknown correlation method: {method} (use {', '.join(CORRELATION_METHODS)})")
+    columns = list(columns)
+    symmetric = other is None
+    other = columns if symmetric else list(other)
+    result = np.full((len(columns), len(other)), np.nan, dtype=np.float32)
+    if not columns or not other:
+        return result
+
+    if method == KENDALL:
+        rows = kendall_rows(len(df), kendall_sample_size, seed)
+        pairs = np.triu_indices(len(rows), 1)
+        block_size = max(1, min(block_size, KENDALL_BLOCK_CELLS // max(1, len(pairs[0]))))
+        prepare = lambda cols: _kendall_block(df, cols, rows, pairs)
+        correlate = _kendall_correlations
+    else:
+        prepare = lambda cols: _moment_block(df, cols, method)
+        correlate = _moment_correlations
+
+    row_batches = column_batches(range(len(columns)), block_size)
+    col_batches = row_batches if symmetric else column_batches(range(len(other)), block_size)
+    # Kendall blocks hold every row pair, so only two are built at a time (column blocks are rebuilt
+    # for each row block); moment blocks are as small as the data and are built once
+    lazy = method == KENDALL
+    row_blocks = None if lazy else [prepare([columns[i] for i in batch]) for batch in row_batches]
+    col_blocks = None if lazy else row_blocks if symmetric else [prepare([other[i] for i in batch])
+                                                                 for batch in col_batches]
+
+    for i, row_batch in enumerate(row_batches):
+        row_block = prepare([columns[k] for k in row_batch]) if lazy else row_blocks[i]
+        for j, col_batch in enumerate(col_batches):
+            if symmetric and j < i:
+                continue
+            if symmetric and j == i:
+                col_block = row_block
+            else:
+                col_block = prepare([other[k] for k in col_batch]) if lazy else col_blocks[j]
+            block = correlate(row_block, col_block)
+            # Release the column block before the next one is built
+            col_block = None
+            result[row_batch[0]:row_batch[-1] + 1, col_batch[0]:col_batch[-1] + 1] = block
+            if symmetric:
+                result[col_batch[0]:col_batch[-1] + 1, row_batch[0]:row_batch[-1] + 1] = block.T
+        row_block = None
+
+    # A column correlates perfectly with itself wherever it is defined
+    same = np.array(columns, dtype=object)[:, None] == np.array(other, dtype=object)[None, :]
+    result[same & np.isfinite(result)] = 1.0
+    logger.info(f"{method} correlations of {len(columns)} x {len(other)} columns "
+                f"in {len(row_batches) * len(col_batches)} blocks")
+    return result
+
+def strongest_pairs(matrix: np.ndarray, columns: Sequence[Any], k: Optional[int] = None,
+                    threshold: Optional[float] = None, symmetric: bool = True,
+                    value_name: str = 'correlation') -> List[Dict[str, Any]]:
+    """
+    Column pairs with the largest absolute correlation (or association), strongest first
+
+    Args:
+        matrix: Correlation matrix of the columns
+        columns: Column names, in matrix order
+        k: Return at most this many pairs (top-k)
+        threshold: Return only pairs with an absolute value of at least this (sparse output)
+        symmetric: Read each pair once from the upper triangle; otherwise both
+            directions are separate pairs (e.g. Theil's U)
+        value_name: Key of the value in the returned pairs
+
+    Returns:
+        List of dictionaries with 'column1', 'column2' and the value (rounded to 3 decimals)
+    """
+    columns = list(columns)
+    if symmetric:
+        first, second = np.triu_indices(len(columns), 1)
+    else:
+        first, second = np.nonzero(~np.eye(len(columns), dtype=bool))
+    values = matrix[first, second]
+    strength = np.abs(values)
+    selected = np.isfinite(values)
+    if threshold is not None:
+        selected &= strength >= threshold
+    selected = np.flatnonzero(selected)
+    if k is not None and len(selected) > k:
+        selected = selected[np.argpartition(-strength[selected], max(0, k - 1))[:max(0, k)]]
+    selected = selected[np.argsort(-strength[selected], kind='stable')]
+    return [
+        {'column1': columns[first[i]], 'column2': columns[second[i]], value_name: round(float(values[i]), 3)}
+        for i in selected
+    ]
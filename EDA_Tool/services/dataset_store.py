@@ -0,0 +1,269 @@
+import os
+import json
+import time
+import pickle
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class DatasetStore:
+    """
+    Server-side store that keeps uploaded datasets as Parquet files on local disk
+
+    Datasets are content-addressed and never modified in place: the ID is
+    derived from the data (or from the uploaded file it was parsed from), so
+    identical data is stored once and an ID always refers to the same rows.
+    That makes it safe to cache analysis results per dataset ID and to share
+    one stored dataset between sessions that uploaded the same file.
+    """
+
+    def __init__(self, storage_dir: str, max_age_seconds: Optional[int] = None):
+        """
+        Initialize the dataset store
+
+        Args:
+            storage_dir: Directory where dataset files are written
+            max_age_seconds: Datasets not accessed for this long are removed by purge_expired()
+        """
+        self.storage_dir = storage_dir
+        self.max_age_seconds = max_age_seconds
+        os.makedirs(self.storage_dir, exist_ok=True)
+
+    def _path(self, dataset_id: str, suffix: str = 'parquet') -> str:
+        """Get the file path for a dataset ID (the Parquet file unless another suffix is given)"""
+        # Dataset IDs are generated by the store; reject anything that could escape the directory
+        if not dataset_id or not dataset_id.isalnum():
+            raise ValueError(f"Invalid dataset ID: {dataset_id!r}")
+        return os.path.join(self.storage_dir, f"{dataset_id}.{suffix}")
+
+    def save(self, df: pd.DataFrame, dataset_id: Optional[str] = None) -> str:
+        """
+        Write a DataFrame to the store
+
+        Args:
+            df: DataFrame to persist
+            dataset_id: Optional content key to write under; derived from the data if omitted
+
+        Returns:
+            The dataset ID to keep in the session
+        """
+        dataset_id = dataset_id or dataset_fingerprint(df)
+        path = self._path(dataset_id)
+        if os.path.exists(path):
+            # Same content is already stored - nothing to write
+            self._touch(path)
+            return dataset_id
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+
+        # Write to a temporary file first so readers never see a partial dataset
+        _to_arrow_safe(df).to_parquet(tmp_path, engine='pyarrow', index=False)
+        os.replace(tmp_path, path)
+
+        logger.info(f"Stored dataset {dataset_id} with shape {df.shape}")
+        return dataset_id
+
+    def load(self, dataset_id: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Read a dataset back as a DataFrame
+
+        Args:
+            dataset_id: ID returned by save()
+            columns: Optional subset of columns to read
+
+        Returns:
+            The stored DataFrame
+        """
+        path = self._path(dataset_id)
+        if not os.path.exists(path):
+            raise KeyError(f"Dataset {dataset_id} not found")
+
+        df = pd.read_parquet(path, engine='pyarrow', columns=columns)
+        self._touch(path)
+        return df
+
+    def path(self, dataset_id: str) -> Optional[str]:
+        """
+        Get the Parquet file of a stored dataset, for readers in other processes
+
+        Returns:
+            The file path, or None if the dataset is not in the store
+        """
+        path = self._path(dataset_id)
+        return path if os.path.exists(path) else None
+
+    def exists(self, dataset_id: str) -> bool:
+        """Check whether a dataset is present in the store"""
+        try:
+            return os.path.exists(self._path(dataset_id))
+        except ValueError:
+            return False
+
+    def delete(self, dataset_id: str) -> None:
+        """Remove a dataset and its cached results from the store if present"""
+        self._path(dataset_id)  # validates the ID
+        for name in os.listdir(self.storage_dir):
+            if name.startswith(f"{dataset_id}."):
+                try:
+                    os.remove(os.path.join(self.storage_dir, name))
+                except FileNotFoundError:
+                    pass
+
+    def find_upload(self, upload_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the datasets an identical upload was parsed into
+
+        Args:
+            upload_key: Key from content_key() over the file digest and parse options
+
+        Returns:
+            The entry passed to save_upload(), or None if unknown or any of
+            its datasets has expired
+        """
+        path = self._path(upload_key, 'upload.json')
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        if not all(self.exists(dataset_id) for dataset_id in entry.get('dataset_ids', [])):
+            return None
+        self._touch(path)
+        for dataset_id in entry['dataset_ids']:
+            self._touch(self._path(dataset_id))
+        return entry
+
+    def save_upload(self, upload_key: str, entry: Dict[str, Any]) -> None:
+        """
+        Remember which datasets an upload was parsed into
+
+        Args:
+            upload_key: Key from content_key() over the file digest and parse options
+            entry: JSON-serializable dictionary; 'dataset_ids' lists the datasets it refers to
+        """
+        path = self._path(upload_key, 'upload.json')
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+    def load_result(self, dataset_id: str, name: str) -> Any:
+        """
+        Get a cached analysis result for a dataset
+
+        Args:
+            dataset_id: Dataset the result was computed from
+            name: Result name (letters, digits and underscores)
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        path = self._result_path(dataset_id, name)
+        try:
+            with open(path, 'rb') as f:
+                result = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # A truncated or outdated cache file is just a miss
+            logger.warning(f"Ignoring unreadable cached result {name} for {dataset_id}: {str(e)}")
+            return None
+        self._touch(path)
+        return result
+
+    def save_result(self, dataset_id: str, name: str, result: Any) -> None:
+        """Cache an analysis result for a dataset (files are written by this server only)"""
+        path = self._result_path(dataset_id, name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def purge_expired(self) -> int:
+        """Remove datasets, upload entries and cached results not accessed within max_age_seconds"""
+        if not self.max_age_seconds:
+            return 0
+
+        cutoff = time.time() - self.max_age_seconds
+        removed = 0
+        for name in os.listdir(self.storage_dir):
+            path = os.path.join(self.storage_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                continue
+
+        if removed:
+            logger.info(f"Purged {removed} expired dataset files")
+        return removed
+
+    def _result_path(self, dataset_id: str, name: str) -> str:
+        if not name.replace('_', '').isalnum():
+            raise ValueError(f"Invalid result name: {name!r}")
+        return self._path(dataset_id, f"{name}.pkl")
+
+    def _touch(self, path: str) -> None:
+        """Refresh the access time used for expiry"""
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+def file_digest(file_path: str, block_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file's bytes, read in blocks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def content_key(*parts: Any) -> str:
+    """Derive a store ID from a file digest, parse options and the like (must be JSON-serializable)"""
+    payload = json.dumps(parts, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()[:32]
+
+def dataset_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Content ID of a DataFrame: column names, dtypes and a vectorized hash of every row
+
+    Two frames with the same fingerprint hold the same data, so results
+    cached under it stay valid.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(col), str(dtype)] for col, dtype in df.dtypes.items()]).encode('utf-8'))
+    digest.update(str(len(df)).encode('utf-8'))
+    if len(df.columns):
+        row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        digest.update(row_hashes.tobytes())
+    return digest.hexdigest()[:32]
+
+def _to_arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """Make object columns with mixed Python types writable to Parquet"""
+    if not all(isinstance(col, str) for col in df.columns):
+        # Parquet requires string column names (Excel headers can be numbers or dates)
+        df = df.rename(columns=str)
+
+    mixed_cols = []
+    for col in df.select_dtypes(include=['object']).columns:
+        try:
+            pa.array(df[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            mixed_cols.append(col)
+
+    if not mixed_cols:
+        return df
+
+    df = df.copy()
+    for col in mixed_cols:
+        # Keep missing values missing and store everything else as text
+        df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
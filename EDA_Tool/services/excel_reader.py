@@ -0,0 +1,114 @@
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+
+import pandas as pd
+from openpyxl import load_workbook
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+try:
+    import python_calamine  # noqa: F401  (Rust reader used by pandas' 'calamine' engine)
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+def list_sheets(file_path: str) -> List[str]:
+    """
+    Get the sheet names of a workbook without loading any cell data
+
+    Args:
+        file_path: Path to the .xlsx or .xls file
+
+    Returns:
+        Sheet names in workbook order
+    """
+    if file_path.lower().endswith('.xls'):
+        return pd.ExcelFile(file_path, engine='xlrd').sheet_names
+
+    workbook = load_workbook(file_path, read_only=True)
+    try:
+        return workbook.sheetnames
+    finally:
+        workbook.close()
+
+def read_sheet(file_path: str, sheet_name: str) -> pd.DataFrame:
+    """
+    Read one sheet, streaming rows instead of building the full workbook object model
+
+    Uses the calamine engine when python-calamine is installed, otherwise
+    openpyxl in read-only mode. Legacy .xls files go through xlrd.
+    """
+    if file_path.lower().endswith('.xls'):
+        return pd.read_excel(file_path, sheet_name=sheet_name, engine='xlrd')
+    if CALAMINE_AVAILABLE:
+        return pd.read_excel(file_path, sheet_name=sheet_name, engine='calamine')
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        df = pd.DataFrame.from_records(list(rows), columns=_header_names(header))
+    finally:
+        workbook.close()
+
+    # Read-only sheets report the styled range, which often includes blank rows and columns
+    df = df.dropna(how='all')
+    empty_unnamed = [col for col in df.columns if str(col).startswith('Unnamed:') and df[col].isna().all()]
+    df = df.drop(columns=empty_unnamed).reset_index(drop=True)
+    return df.infer_objects()
+
+def read_workbook(file_path: str, sheets: Optional[List[str]] = None,
+                  max_workers: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Read several sheets of a workbook, parsing independent sheets in parallel processes
+
+    Args:
+        file_path: Path to the .xlsx or .xls file
+        sheets: Sheet names to read; all sheets if omitted
+        max_workers: Worker processes to use (defaults to one per sheet, capped at the CPU count)
+
+    Returns:
+        Dictionary mapping sheet name to DataFrame, in workbook order
+    """
+    available = list_sheets(file_path)
+    if sheets:
+        missing = [name for name in sheets if name not in available]
+        if missing:
+            raise ValueError(f"Sheets not found in workbook: {', '.join(missing)}")
+        sheets = [name for name in available if name in sheets]
+    else:
+        sheets = available
+
+    workers = min(len(sheets), max_workers or os.cpu_count() or 1)
+    if workers <= 1:
+        return {name: read_sheet(file_path, name) for name in sheets}
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            frames = executor.map(read_sheet, [file_path] * len(sheets), sheets)
+            return dict(zip(sheets, frames))
+    except (BrokenProcessPool, OSError) as e:
+        # Some hosts (e.g. AWS Lambda) cannot start worker processes
+        logger.warning(f"Parallel sheet parsing unavailable, reading sequentially: {str(e)}")
+        return {name: read_sheet(file_path, name) for name in sheets}
+
+def _header_names(header: tuple) -> List[str]:
+    """Name blank and repeated header cells the way pd.read_excel does"""
+    names = []
+    seen = {}
+    for i, value in enumerate(header):
+        name = f'Unnamed: {i}' if value is None or str(value).strip() == '' else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f'{name}.{seen[name]}'
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
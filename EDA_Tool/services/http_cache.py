@@ -0,0 +1,116 @@
+import gzip
+import json
+import hashlib
+import logging
+from typing import Any, Optional
+
+from flask import Response
+from werkzeug.datastructures import Accept, ETags
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bodies smaller than this are sent as they are; compressing them saves nothing
+DEFAULT_MIN_COMPRESS_BYTES = 1024
+
+# Moderate levels: close to the best ratio for JSON at a fraction of the CPU time
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/html', 'text/plain', 'text/css', 'application/javascript'}
+
+def make_etag(*parts: Any) -> str:
+    """
+    Strong ETag for a response that depends only on the given parts
+
+    Callers pass the endpoint, the dataset ID or version and the request
+    parameters, so the tag changes exactly when the response would.
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+def etag_matches(if_none_match: Optional[ETags], etag: str) -> bool:
+    """
+    Check whether a request's If-None-Match names this ETag
+
+    Compressed responses carry the tag with a '-gzip'/'-br' suffix (see
+    compress_response()), so any content-coding variant counts as a match.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.star_tag:
+        return True
+    return any(tag.split('-', 1)[0] == etag for tag in if_none_match)
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response telling the client to reuse the body it already has"""
+    response = Response(status=304)
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+def with_etag(response: Response, etag: str) -> Response:
+    """Tag a response so the client can revalidate it with If-None-Match"""
+    response.set_etag(etag)
+    # Stored per user, always revalidated before reuse
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+def negotiate_encoding(accept_encodings: Accept) -> Optional[str]:
+    """Pick brotli or gzip from the Accept-Encoding header, preferring brotli on a tie"""
+    offered = ['br', 'gzip'] if BROTLI_AVAILABLE else ['gzip']
+    return accept_encodings.best_match(offered)
+
+def compress_response(response: Response, accept_encodings: Accept,
+                      min_size: int = DEFAULT_MIN_COMPRESS_BYTES) -> Response:
+    """
+    Compress a text response body with the best encoding the client accepts
+
+    Streamed and file responses, error responses and already-encoded bodies
+    are left alone. A strong ETag gets the encoding appended, since the
+    compressed bytes are a different representation.
+
+    Args:
+        response: Response to compress in place
+        accept_encodings: The request's parsed Accept-Encoding header
+        min_size: Smallest body (in bytes) worth compressing
+
+    Returns:
+        The same response object
+    """
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding(accept_encodings)
+    if encoding is None:
+        return response
+
+    body = response.get_data()
+    if len(body) < min_size:
+        return response
+
+    if encoding == 'br':
+        compressed = brotli.compress(body, quality=BROTLI_QUALITY)
+    else:
+        # mtime=0 keeps the bytes identical for identical bodies
+        compressed = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak=weak)
+    return response
@@ -0,0 +1,275 @@
+import logging
+import zlib
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from services.column_executor import ColumnExecutor
+from services.numeric_profile import NumericProfile, profile_numeric
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Shapiro-Wilk p-values are accurate up to this many values (SciPy warns above it)
+SHAPIRO_MAX_N = 5000
+
+# Smallest samples the other tests are defined for (D'Agostino's kurtosis test needs 20)
+DAGOSTINO_MIN_N = 20
+ANDERSON_MIN_N = 8
+
+# Values drawn (without replacement) from larger columns for the sample-based tests
+DEFAULT_SAMPLE_SIZE = 5000
+
+NORMALITY_ALPHA = 0.05
+
+def moment_tests(count: np.ndarray, skew: np.ndarray, kurtosis: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    D'Agostino K² and Jarque-Bera tests for many columns at once
+
+    Both tests only need each column's size, skewness and kurtosis, so they
+    run on whole columns as array arithmetic over the numeric profile instead
+    of another pass over the data. Inputs are the bias-corrected skew and
+    excess kurtosis reported by pandas (and NumericProfile); results match
+    scipy.stats.normaltest and scipy.stats.jarque_bera.
+
+    Returns:
+        Dictionary of arrays: 'dagostino_k2', 'dagostino_p' (NaN below
+        DAGOSTINO_MIN_N values), 'jarque_bera' and 'jarque_bera_p'
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        n = count.astype(np.float64)
+        # Back to the plain moment ratios g1 = m3 / m2^1.5 and g2 = m4 / m2^2 - 3
+        g1 = skew * (n - 2) / np.sqrt(n * (n - 1))
+        g2 = (kurtosis * (n - 2) * (n - 3) / (n - 1) - 6) / (n + 1)
+
+        # Skewness test
+        y = g1 * np.sqrt((n + 1) * (n + 3) / (6.0 * (n - 2)))
+        beta2 = 3.0 * (n ** 2 + 27 * n - 70) * (n + 1) * (n + 3) / ((n - 2) * (n + 5) * (n + 7) * (n + 9))
+        w2 = -1 + np.sqrt(2 * (beta2 - 1))
+        delta = 1 / np.sqrt(0.5 * np.log(w2))
+        alpha = np.sqrt(2.0 / (w2 - 1))
+        y = np.where(y == 0, 1, y)
+        z_skew = delta * np.log(y / alpha + np.sqrt((y / alpha) ** 2 + 1))
+
+        # Kurtosis test
+        b2 = g2 + 3
+        expected = 3.0 * (n - 1) / (n + 1)
+        variance = 24.0 * n * (n - 2) * (n - 3) / ((n + 1) ** 2 * (n + 3) * (n + 5))
+        x = (b2 - expected) / np.sqrt(variance)
+        sqrt_beta1 = (6.0 * (n * n - 5 * n + 2) / ((n + 7) * (n + 9))
+                      * np.sqrt(6.0 * (n + 3) * (n + 5) / (n * (n - 2) * (n - 3))))
+        a = 6.0 + 8.0 / sqrt_beta1 * (2.0 / sqrt_beta1 + np.sqrt(1 + 4.0 / sqrt_beta1 ** 2))
+        denom = 1 + x * np.sqrt(2 / (a - 4.0))
+        term = np.sign(denom) * np.where(denom == 0, np.nan, ((1 - 2.0 / a) / np.abs(denom)) ** (1 / 3.0))
+        z_kurt = (1 - 2 / (9.0 * a) - term) / np.sqrt(2 / (9.0 * a))
+
+        k2 = np.where(count >= DAGOSTINO_MIN_N, z_skew ** 2 + z_kurt ** 2, np.nan)
+        jb = np.where(count >= 3, n / 6 * (g1 ** 2 + g2 ** 2 / 4), np.nan)
+
+    return {
+        'dagostino_k2': k2,
+        'dagostino_p': stats.chi2.sf(k2, 2),
+        'jarque_bera': jb,
+        'jarque_bera_p': stats.chi2.sf(jb, 2)
+    }
+
+def anderson_darling(ordered: np.ndarray, count: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Anderson-Darling test for normality of every column of a sorted sample block
+
+    Column j holds count[j] values sorted ascending, padded with NaN. The
+    statistic uses the sample mean and standard deviation (as
+    scipy.stats.anderson does); p-values come from the modified statistic
+    A² (1 + 0.75/n + 2.25/n²) with D'Agostino & Stephens' approximation.
+
+    Returns:
+        Dictionary of arrays: 'statistic' (A²) and 'p_value' (NaN below ANDERSON_MIN_N values)
+    """
+    rows = np.arange(ordered.shape[0])[:, None]
+    valid = rows < count
+    n = count.astype(np.float64)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.nansum(ordered, axis=0) / n
+        std = np.sqrt(np.nansum((ordered - mean) ** 2, axis=0) / (n - 1))
+        z = (ordered - mean) / std
+        # Pair the i-th smallest value with the i-th largest of the same column
+        mirrored = np.take_along_axis(z, np.clip(count - 1 - rows, 0, None), axis=0)
+        terms = (2 * rows + 1) * (stats.norm.logcdf(z) + stats.norm.logsf(mirrored))
+        a2 = -n - np.where(valid, terms, 0).sum(axis=0) / n
+
+        modified = a2 * (1 + 0.75 / n + 2.25 / n ** 2)
+        p_value = np.select(
+            [modified >= 0.6, modified >= 0.34, modified >= 0.2],
+            [np.exp(1.2937 - 5.709 * modified + 0.0186 * modified ** 2),
+             np.exp(0.9177 - 4.279 * modified - 1.38 * modified ** 2),
+             1 - np.exp(-8.318 + 42.796 * modified - 59.938 * modified ** 2)],
+            1 - np.exp(-13.436 + 101.14 * modified - 223.73 * modified ** 2)
+        )
+
+    usable = (count >= ANDERSON_MIN_N) & (std > 0)
+    return {
+        'statistic': np.where(usable, a2, np.nan),
+        'p_value': np.where(usable, np.clip(p_value, 0.0, 1.0), np.nan)
+    }
+
+def sample_block(df: pd.DataFrame, columns: pd.Index, sample_size: int = DEFAULT_SAMPLE_SIZE,
+                 seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Non-null values of each column, subsampled to sample_size, as one sorted block
+
+    Every column draws from its own generator seeded with (seed, hash of the
+    column name), so a column always gets the same sample, whatever other
+    columns the frame has.
+
+    Returns:
+        Column-sorted 2-D block padded with NaN, and the number of values per column
+    """
+    samples = []
+    for col in columns:
+        values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        values = values[~np.isnan(values)]
+        if len(values) > sample_size:
+            rng = np.random.default_rng([seed, zlib.crc32(str(col).encode('utf-8'))])
+            values = rng.choice(values, sample_size, replace=False)
+        samples.append(values)
+
+    count = np.array([len(values) for values in samples], dtype=np.int64)
+    block = np.full((int(count.max(initial=0)), len(samples)), np.nan)
+    for i, values in enumerate(samples):
+        block[:len(values), i] = np.sort(values)
+    return block, count
+
+def sample_tests(df: pd.DataFrame, columns: List[Any], sample_size: int = DEFAULT_SAMPLE_SIZE,
+                 seed: int = 0) -> Dict[Any, Tuple[float, float, float, int]]:
+    """
+    Shapiro-Wilk and Anderson-Darling on the (sampled) values of a batch of columns
+
+    Batch function for ColumnExecutor; sampling, sorting and the tests are
+    NumPy/SciPy work, so batches run on threads.
+
+    Returns:
+        (Shapiro-Wilk p, Anderson-Darling statistic, Anderson-Darling p, sample size) per column
+    """
+    ordered, sample_count = sample_block(df, columns, sample_size, seed)
+    anderson = anderson_darling(ordered, sample_count)
+
+    results = {}
+    for i, col in enumerate(columns):
+        values = ordered[:sample_count[i], i]
+        shapiro_p = np.nan
+        # Sorted, so equal ends mean no spread: the statistic is undefined
+        if len(values) >= 3 and values[0] != values[-1]:
+            try:
+                shapiro_p = float(stats.shapiro(values).pvalue)
+            except ValueError as e:
+                logger.warning(f"Shapiro-Wilk test failed for {col}: {e}")
+        results[col] = (shapiro_p, float(anderson['statistic'][i]), float(anderson['p_value'][i]),
+                        int(sample_count[i]))
+    return results
+
+def tested_columns(profile: NumericProfile) -> List[Any]:
+    """Columns the sample-based tests run on: at least 3 values and some spread"""
+    stats = profile.stats
+    return stats.index[(stats['count'] >= 3) & (stats['std'] != 0)].tolist()
+
+def normality_tests(df: pd.DataFrame, profile: NumericProfile = None,
+                    sample_size: int = DEFAULT_SAMPLE_SIZE, seed: int = 0,
+                    executor: ColumnExecutor = None,
+                    samples: Dict[Any, Tuple[float, float, float, int]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Test every numeric column for normality, choosing the test by column size
+
+    Columns of up to SHAPIRO_MAX_N values are judged by Shapiro-Wilk on all
+    values. Larger columns are judged by D'Agostino K² on all values, from
+    the profile's moments; Shapiro-Wilk (whose p-values are unreliable above
+    SHAPIRO_MAX_N) then runs on a seeded random sample of sample_size values.
+    Jarque-Bera (all values) and Anderson-Darling (same values as
+    Shapiro-Wilk) are reported alongside.
+
+    Args:
+        df: DataFrame with the columns to test
+        profile: Numeric profile of df (computed when not given)
+        sample_size: Values drawn from larger columns for the sample-based tests
+        seed: Seed of the sampling, so repeated analyses give the same p-values
+        executor: Runs the sample-based tests over batches of columns in parallel
+        samples: sample_tests() results of the tested_columns(), if already known
+
+    Returns:
+        Dictionary with one entry per numeric column: skewness, kurtosis, the
+        deciding 'test' with its 'p_value', the individual test p-values,
+        'sample_size', 'sampled' and an 'assessment'
+    """
+    profile = profile if profile is not None else profile_numeric(df, executor=executor)
+    columns = profile.stats.index
+    count = profile.stats['count'].to_numpy(dtype=np.int64)
+
+    moments = moment_tests(count, profile.stats['skew'].to_numpy(), profile.stats['kurtosis'].to_numpy())
+    sample_size = min(sample_size, SHAPIRO_MAX_N)
+    if samples is None:
+        if executor is not None:
+            samples = executor.map('normality_tests', sample_tests, df, tested_columns(profile), sample_size, seed)
+        else:
+            samples = sample_tests(df, tested_columns(profile), sample_size, seed)
+
+    results = {}
+    for i, col in enumerate(columns):
+        if count[i] < 3:
+            results[col] = {
+                'skewness': 'N/A',
+                'kurtosis': 'N/A',
+                'shapiro_wilk_p': 'N/A',
+                'assessment': 'Insufficient data'
+            }
+            continue
+
+        skewness = float(profile.stats.at[col, 'skew'])
+        kurtosis = float(profile.stats.at[col, 'kurtosis'])
+        if col not in samples:
+            # No spread: the test statistics are undefined
+            results[col] = {
+                'skewness': round(skewness, 3),
+                'kurtosis': round(kurtosis, 3),
+                'shapiro_wilk_p': 'N/A',
+                'assessment': 'Constant'
+            }
+            continue
+
+        shapiro_p, anderson_statistic, anderson_p, tested_count = samples[col]
+        if count[i] <= SHAPIRO_MAX_N:
+            test, p_value = 'Shapiro-Wilk', shapiro_p
+        else:
+            test, p_value = "D'Agostino K²", float(moments['dagostino_p'][i])
+
+        # Normality assessment
+        if not np.isnan(p_value) and p_value > NORMALITY_ALPHA:
+            assessment = 'Normal'
+        elif abs(skewness) > 1 or abs(kurtosis) > 2:
+            assessment = 'Non-Normal'
+        elif abs(skewness) > 0.5 or abs(kurtosis) > 1:
+            assessment = 'Moderately Skewed'
+        else:
+            assessment = 'Approximately Normal'
+
+        results[col] = {
+            'skewness': round(skewness, 3),
+            'kurtosis': round(kurtosis, 3),
+            'test': test,
+            'p_value': _rounded(p_value),
+            'shapiro_wilk_p': _rounded(shapiro_p),
+            'dagostino_k2_p': _rounded(moments['dagostino_p'][i]),
+            'jarque_bera_p': _rounded(moments['jarque_bera_p'][i]),
+            'anderson_darling_p': _rounded(anderson_p),
+            'anderson_darling_statistic': _rounded(anderson_statistic),
+            'sample_size': tested_count,
+            'sampled': bool(tested_count < count[i]),
+            'assessment': assessment
+        }
+    return results
+
+def _rounded(value: float) -> Any:
+    # Undefined statistics are shown as 'N/A', like the rest of the analysis
+    return 'N/A' if np.isnan(value) else round(float(value), 6)
@@ -0,0 +1,281 @@
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from services.column_executor import ColumnExecutor
+from services.sketches import QuantileSketch
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Columns of NumericProfile.stats, in the order describe() reports them first
+PROFILE_METRICS = ['count', 'nulls', 'mean', 'std', 'min', '25%', '50%', '75%', 'max',
+                   'skew', 'kurtosis', 'iqr', 'lower_bound', 'upper_bound', 'outliers']
+
+DESCRIBE_METRICS = ['mean', 'std', 'min', '25%', '50%', '75%', 'max']
+
+# Minimum non-null values for each statistic (as in pandas / the original per-column code)
+MIN_SKEW_COUNT = 3
+MIN_KURTOSIS_COUNT = 4
+MIN_QUARTILE_COUNT = 4
+
+# Quartiles from a full column-wise sort, or from one mergeable quantile sketch per column
+QUANTILE_EXACT = 'exact'
+QUANTILE_APPROX = 'approx'
+
+# Rows fed to the quantile sketches at a time in approximate mode
+SKETCH_CHUNK_ROWS = 100_000
+
+class NumericProfile:
+    """
+    Statistics of every numeric column, computed together by profile_numeric()
+
+    stats is a DataFrame with one row per numeric column and the metrics in
+    PROFILE_METRICS as columns (NaN where a statistic is undefined). The
+    section methods format it the way the /analyze and report sections
+    expect, so each section is a lookup rather than another scan of the data.
+
+    In approximate mode the quartiles (and everything derived from them: IQR,
+    outlier bounds and counts) come from the per-column QuantileSketch objects
+    in sketches, which can be merged with sketches of other chunks of the data.
+    """
+
+    def __init__(self, stats: pd.DataFrame, rows: int, quantile_mode: str = QUANTILE_EXACT,
+                 sketches: Optional[Dict[str, QuantileSketch]] = None):
+        self.stats = stats
+        self.rows = rows
+        self.quantile_mode = quantile_mode
+        self.sketches = sketches or {}
+
+    @property
+    def columns(self) -> list:
+        return self.stats.index.tolist()
+
+    def descriptive_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Same shape as describe().T: missing statistics are 'N/A'"""
+        metrics = self.stats[DESCRIBE_METRICS].astype(object)
+        metrics = metrics.where(self.stats[DESCRIBE_METRICS].notna(), 'N/A')
+        metrics.insert(0, 'count', self.stats['count'].astype(int))
+        return metrics.to_dict('index')
+
+    def numerical_analysis(self) -> Dict[str, Dict[str, Any]]:
+        """Skewness and kurtosis per column (0 for empty columns, NaN with too few values)"""
+        return {
+            col: {
+                'skewness': float(row['skew']) if row['count'] > 0 else 0,
+                'kurtosis': float(row['kurtosis']) if row['count'] > 0 else 0
+            }
+            for col, row in self.stats.iterrows()
+        }
+
+    def rank_error(self) -> float:
+        """Worst normalized rank error of the quartiles (0 in exact mode)"""
+        return max((sketch.rank_error() for sketch in self.sketches.values()), default=0.0)
+
+    def box_stats(self, col: str, values: pd.Series) -> Dict[str, Any]:
+        """
+        Precomputed box plot statistics for one column
+
+        Whiskers end at the most extreme values inside the IQR bounds (Tukey),
+        found with one masked pass over the column.
+        """
+        row = self.stats.loc[col]
+        values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        inside = values[(values >= row['lower_bound']) & (values <= row['upper_bound'])]
+        return {
+            'q1': float(row['25%']),
+            'median': float(row['50%']),
+            'q3': float(row['75%']),
+            'lowerfence': float(inside.min()) if inside.size else float(row['min']),
+            'upperfence': float(inside.max()) if inside.size else float(row['max']),
+            'mean': float(row['mean']),
+            'outliers': int(row['outliers'])
+        }
+
+    def outliers(self) -> Dict[str, Dict[str, Any]]:
+        """IQR outlier counts and bounds per column"""
+        outliers_data = {}
+        for col, row in self.stats.iterrows():
+            if row['count'] < MIN_QUARTILE_COUNT:
+                outliers_data[col] = {
+                    'count': 0,
+                    'method': 'IQR',
+                    'q1': 'N/A',
+                    'q3': 'N/A',
+                    'iqr': 'N/A',
+                    'lower_bound': 'N/A',
+                    'upper_bound': 'N/A',
+                    'outlier_percentage': 0
+                }
+                continue
+
+            outlier_count = int(row['outliers'])
+            outliers_data[col] = {
+                'count': outlier_count,
+                'method': 'IQR',
+                'q1': round(float(row['25%']), 3),
+                'q3': round(float(row['75%']), 3),
+                'iqr': round(float(row['iqr']), 3),
+                'lower_bound': round(float(row['lower_bound']), 3),
+                'upper_bound': round(float(row['upper_bound']), 3),
+                'outlier_percentage': round(outlier_count / self.rows * 100, 2) if self.rows else 0
+            }
+            if col in self.sketches:
+                # Bounds come from sketch quartiles: report how far their ranks may be off
+                outliers_data[col]['quantile_rank_error'] = self.sketches[col].rank_error()
+        return outliers_data
+
+def profile_numeric(df: pd.DataFrame, quantile_mode: str = QUANTILE_EXACT,
+                    sketch_k: int = 200, executor: Optional[ColumnExecutor] = None) -> NumericProfile:
+    """
+    Profile all numeric columns of a DataFrame in one vectorized pass
+
+    The columns are copied once into a 2-D float64 block. In exact mode one
+    column-wise sort of that block gives min, max and the quartiles (NaN sorts
+    last, so the k-th value of a column is at row k); the moments and the
+    outlier counts are reductions over the whole block. Results match
+    describe(), skew(), kurtosis() and quantile() with linear interpolation.
+
+    In approximate mode nothing is sorted in full: each column is fed to a
+    QuantileSketch in chunks, and the quartiles are within the sketch's rank
+    error (about 1.5 / sketch_k, see QuantileSketch).
+
+    Every statistic is per column, so with an executor the work is split into
+    batches of columns, each profiled as its own block on a worker thread
+    (NumPy releases the GIL in the reductions and the sort).
+
+    Args:
+        df: DataFrame to profile (non-numeric and bool columns are skipped)
+        quantile_mode: QUANTILE_EXACT or QUANTILE_APPROX
+        sketch_k: Compactor size of the quantile sketches (approximate mode)
+        executor: Runs the column batches in parallel (one block, inline, when omitted)
+
+    Returns:
+        NumericProfile with one row of statistics per numeric column
+    """
+    if quantile_mode not in (QUANTILE_EXACT, QUANTILE_APPROX):
+        raise ValueError(f"Unknown quantile mode: {quantile_mode}")
+
+    numeric_cols = df.select_dtypes(include=[np.number]).columns
+    if executor is not None:
+        profiles = executor.map('numeric_profile', profile_columns, df, numeric_cols, quantile_mode, sketch_k)
+    else:
+        profiles = profile_columns(df, numeric_cols, quantile_mode, sketch_k)
+    return profile_from_columns(profiles, numeric_cols, len(df), quantile_mode)
+
+def profile_from_columns(profiles: Dict[Any, Tuple[np.ndarray, Optional[QuantileSketch]]],
+                         columns: List[Any], rows: int,
+                         quantile_mode: str = QUANTILE_EXACT) -> NumericProfile:
+    """
+    Assemble a NumericProfile from per-column results of profile_columns()
+
+    The results may come from different batches or runs (e.g. cached for
+    columns that did not change since an earlier version of the data).
+    """
+    values = np.array([profiles[col][0] for col in columns], dtype=np.float64)
+    stats = pd.DataFrame(values.reshape(len(columns), len(PROFILE_METRICS)),
+                         index=columns, columns=PROFILE_METRICS)
+    stats = stats.astype({'count': np.int64, 'nulls': np.int64, 'outliers': np.int64})
+    sketches = {col: profiles[col][1] for col in columns if profiles[col][1] is not None}
+    return NumericProfile(stats, rows, quantile_mode, sketches)
+
+def profile_columns(df: pd.DataFrame, columns: List[Any], quantile_mode: str = QUANTILE_EXACT,
+                    sketch_k: int = 200) -> Dict[Any, Tuple[np.ndarray, Optional[QuantileSketch]]]:
+    """
+    Statistics of one batch of numeric columns
+
+    Returns:
+        Dictionary mapping each column to its PROFILE_METRICS values and its
+        QuantileSketch (None in exact mode)
+    """
+    if quantile_mode not in (QUANTILE_EXACT, QUANTILE_APPROX):
+        raise ValueError(f"Unknown quantile mode: {quantile_mode}")
+
+    block = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    rows = block.shape[0]
+    sketches = [None] * len(columns)
+
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        count = np.count_nonzero(~np.isnan(block), axis=0)
+        n = count.astype(np.float64)
+
+        # Central moments from one centered copy of the block
+        mean = np.nansum(block, axis=0) / n
+        centered = block - mean
+        squared = centered * centered
+        sum_squares = np.nansum(squared, axis=0)
+        # Only the shape moments drop rounding noise (as pandas does); tiny but real spreads keep their std
+        m2 = _zero_out_rounding(sum_squares)
+        m3 = _zero_out_rounding(np.nansum(squared * centered, axis=0))
+        m4 = np.nansum(squared * squared, axis=0)
+        del centered, squared
+
+        std = np.where(count > 1, np.sqrt(sum_squares / (n - 1)), np.nan)
+        skew = np.where(count >= MIN_SKEW_COUNT,
+                        np.where(m2 == 0, 0.0, np.sqrt(n * (n - 1)) / (n - 2) * (m3 / n) / (m2 / n) ** 1.5),
+                        np.nan)
+        kurt_numer = n * (n + 1) * (n - 1) * m4
+        kurt_denom = (n - 2) * (n - 3) * m2 ** 2
+        kurtosis = np.where(count >= MIN_KURTOSIS_COUNT,
+                            np.where(kurt_denom == 0, 0.0,
+                                     kurt_numer / kurt_denom - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))),
+                            np.nan)
+
+        if quantile_mode == QUANTILE_EXACT:
+            ordered = np.sort(block, axis=0)
+            minimum = _order_statistic(ordered, count, 0.0)
+            q1 = _order_statistic(ordered, count, 0.25)
+            median = _order_statistic(ordered, count, 0.5)
+            q3 = _order_statistic(ordered, count, 0.75)
+            maximum = _order_statistic(ordered, count, 1.0)
+            del ordered
+        else:
+            minimum = _column_extreme(block, np.fmin)
+            maximum = _column_extreme(block, np.fmax)
+            quartiles = np.full((3, len(columns)), np.nan)
+            for i in range(len(columns)):
+                sketch = QuantileSketch(k=sketch_k, seed=0)
+                for start in range(0, rows, SKETCH_CHUNK_ROWS):
+                    sketch.update(block[start:start + SKETCH_CHUNK_ROWS, i])
+                sketches[i] = sketch
+                quartiles[:, i] = [np.nan if q is None else q for q in sketch.quantiles([0.25, 0.5, 0.75])]
+            q1, median, q3 = quartiles
+
+        iqr = q3 - q1
+        lower_bound = q1 - 1.5 * iqr
+        upper_bound = q3 + 1.5 * iqr
+        # NaN compares False, so missing values are never outliers
+        outliers = np.count_nonzero((block < lower_bound) | (block > upper_bound), axis=0)
+        outliers = np.where(count >= MIN_QUARTILE_COUNT, outliers, 0)
+
+    # Same order as PROFILE_METRICS
+    metrics = np.column_stack([count, rows - count, mean, std, minimum, q1, median, q3, maximum,
+                               skew, kurtosis, iqr, lower_bound, upper_bound, outliers])
+    return {col: (metrics[i], sketches[i]) for i, col in enumerate(columns)}
+
+def _order_statistic(ordered: np.ndarray, count: np.ndarray, q: float) -> np.ndarray:
+    """Quantile q of each column of a column-sorted block, interpolating linearly"""
+    if ordered.shape[0] == 0:
+        return np.full(ordered.shape[1], np.nan)
+
+    position = (count - 1) * q
+    lower = np.clip(np.floor(position).astype(np.int64), 0, None)
+    upper = np.clip(np.ceil(position).astype(np.int64), 0, None)
+    columns = np.arange(ordered.shape[1])
+    low_values = ordered[lower, columns]
+    high_values = ordered[upper, columns]
+    values = np.where(upper == lower, low_values, low_values + (high_values - low_values) * (position - lower))
+    return np.where(count > 0, values, np.nan)
+
+def _column_extreme(block: np.ndarray, reducer: np.ufunc) -> np.ndarray:
+    """Column-wise fmin/fmax ignoring NaN (NaN for empty or all-NaN columns)"""
+    if block.shape[0] == 0:
+        return np.full(block.shape[1], np.nan)
+    return reducer.reduce(block, axis=0)
+
+def _zero_out_rounding(values: np.ndarray) -> np.ndarray:
+    # Constant columns leave rounding noise in the moment sums; pandas treats it as 0 too
+    return np.where(np.abs(values) < 1e-14, 0.0, values)
@@ -0,0 +1,291 @@
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Near-duplicate search: MinHash signature length and default Jaccard similarity
+MINHASH_PERMUTATIONS = 64
+NEAR_DUPLICATE_THRESHOLD = 0.8
+
+# Columns searched for near duplicates by default: free text, i.e. text columns whose values are
+# mostly distinct and several words long (codes and categories would match unrelated rows)
+TEXT_DTYPES = ['object', 'string', 'category']
+FREE_TEXT_MIN_DISTINCT_RATIO = 0.5
+FREE_TEXT_MIN_WORDS = 2.0
+FREE_TEXT_SAMPLE_SIZE = 10000
+
+def row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """
+    64-bit fingerprint of every row, from one vectorized hash per column
+
+    Rows with equal values (missing values included) get equal fingerprints,
+    as df.duplicated() compares them. Floats are normalized so that -0.0 and
+    0.0 hash alike. Object values are hashed by their text, so in a column
+    mixing Python types 1 and '1' hash alike where df.duplicated() tells them
+    apart; datasets in the store are not affected, since saving them to
+    Parquet already stores such columns as text.
+    """
+    if not len(df.columns):
+        return np.zeros(len(df), dtype=np.uint64)
+    normalized = {}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_float_dtype(series):
+            series = series + 0.0
+        normalized[col] = series
+    frame = pd.DataFrame(normalized, index=df.index)
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+class RowGroups:
+    """
+    Groups of row positions, e.g. rows that duplicate each other
+
+    Stored flat (the rows of all groups, and where each group starts) so
+    millions of groups stay compact and a page of them is a slice. Groups
+    are ordered by their first row; rows within a group ascend.
+    """
+
+    def __init__(self, rows: np.ndarray, starts: np.ndarray, similarity: Optional[np.ndarray] = None):
+        self.rows = rows
+        self.starts = starts
+        self.similarity = similarity
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def row_count(self) -> int:
+        """Rows that belong to any group"""
+        return len(self.rows)
+
+    def page(self, offset: int = 0, limit: int = 50, max_rows: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Groups offset to offset + limit
+
+        Args:
+            offset: First group of the page
+            limit: Groups in the page
+            max_rows: Rows listed per group at most (the size still counts all)
+
+        Returns:
+            List of dictionaries with the group's 'rows' (positions), 'size'
+            and, for near duplicates, the lowest estimated 'similarity' that
+            links its rows
+        """
+        ends = np.append(self.starts[1:], len(self.rows))
+        groups = []
+        for i in range(max(0, offset), min(len(self), offset + limit)):
+            size = int(ends[i] - self.starts[i])
+            end = self.starts[i] + min(size, max_rows) if max_rows is not None else ends[i]
+            group = {'rows': self.rows[self.starts[i]:end].tolist(), 'size': size}
+            if self.similarity is not None:
+                group['similarity'] = round(float(self.similarity[i]), 3)
+            groups.append(group)
+        return groups
+
+def _groups_from_labels(labels: np.ndarray, positions: np.ndarray,
+                        values: Optional[np.ndarray] = None) -> RowGroups:
+    # labels[i] is the group of row positions[i] (ascending); drop single rows and order groups by first row
+    _, first, inverse, counts = np.unique(labels, return_index=True, return_inverse=True, return_counts=True)
+    keep = counts[inverse] > 1
+    group_start = positions[first][inverse[keep]]
+    positions, inverse = positions[keep], inverse[keep]
+    order = np.lexsort((positions, group_start))
+    rows, groups = positions[order], inverse[order]
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]]) if len(rows) else np.empty(0, dtype=np.int64)
+    similarity = values[groups[starts]] if values is not None else None
+    return RowGroups(rows, starts, similarity)
+
+class RowIndex:
+    """
+    Row fingerprints of a dataset, built once and reused for every duplicate question
+
+    Built from row_hashes(): the duplicate count, the rows drop_duplicates()
+    keeps and the groups of rows that duplicate each other are all read from
+    the first occurrence of each distinct fingerprint, instead of hashing
+    whole object rows again for each. Two different rows share a 64-bit
+    fingerprint with negligible probability (about n² / 2^65 for n rows).
+    Results equal df.duplicated()'s except for object columns mixing Python
+    types (see row_hashes()).
+    """
+
+    def __init__(self, hashes: np.ndarray):
+        self.hashes = hashes
+        # Position of the first row with each distinct fingerprint, in fingerprint order
+        _, self.first = np.unique(hashes, return_index=True)
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def duplicate_count(self) -> int:
+        """Rows equal to an earlier row (df.duplicated().sum(), see row_hashes() for mixed-type columns)"""
+        return len(self.hashes) - len(self.first)
+
+    def keep_mask(self) -> np.ndarray:
+        """True for the first occurrence of every distinct row (same as ~df.duplicated())"""
+        mask = np.zeros(len(self.hashes), dtype=bool)
+        mask[self.first] = True
+        return mask
+
+    def subset(self, positions: np.ndarray) -> 'RowIndex':
+        """Index of the rows at the given positions, e.g. after rows were dropped"""
+        return RowIndex(self.hashes[positions])
+
+    def duplicate_groups(self) -> RowGroups:
+        """Groups of two or more identical rows"""
+        labels = np.searchsorted(self.hashes[self.first], self.hashes)
+        return _groups_from_labels(labels, np.arange(len(self.hashes)))
+
+def build_row_index(df: pd.DataFrame) -> RowIndex:
+    """Fingerprint every row of a DataFrame"""
+    return RowIndex(row_hashes(df))
+
+def exact_duplicate_groups(df: pd.DataFrame, row_index: Optional[RowIndex] = None) -> RowGroups:
+    """Groups of identical rows, read from the row index if one was built already"""
+    return (row_index if row_index is not None else build_row_index(df)).duplicate_groups()
+
+def lsh_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    Bands and rows per band for LSH over num_perm MinHash values
+
+    Rows whose signatures agree on all values of any band become candidates;
+    the pair (b, r) is chosen so the similarity at which that happens with
+    probability 1/2, (1 / b) ** (1 / r), is closest to the threshold.
+    """
+    options = [(num_perm // r, r) for r in range(1, num_perm + 1) if num_perm % r == 0]
+    return min(options, key=lambda option: abs((1 / option[0]) ** (1 / option[1]) - threshold))
+
+def minhash_signatures(df: pd.DataFrame, columns: Sequence[Any], num_perm: int = MINHASH_PERMUTATIONS,
+                       seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    MinHash signature of the words in each row's text columns
+
+    The columns are joined, lower-cased and split into words; each word is
+    hashed once (vectorized) and every permutation is a multiply-shift hash
+    of those values, reduced to a per-row minimum.
+
+    Returns:
+        Positions of the rows that have any words, and their signatures
+        (one row of num_perm uint32 values each)
+    """
+    text = None
+    for col in columns:
+        values = df[col].astype('string').fillna('')
+        text = values if text is None else text + ' ' + values
+    if text is None:
+        return np.empty(0, dtype=np.int64), np.empty((0, num_perm), dtype=np.uint32)
+
+    words = (text.reset_index(drop=True).str.lower()
+             .str.replace(r'[^\w]+', ' ', regex=True).str.split().explode().dropna())
+    words = words[words != '']
+    if words.empty:
+        return np.empty(0, dtype=np.int64), np.empty((0, num_perm), dtype=np.uint32)
+
+    row_of_word = words.index.to_numpy(dtype=np.int64)
+    word_hashes = pd.util.hash_pandas_object(words.astype(object), index=False).to_numpy()
+    positions, starts = np.unique(row_of_word, return_index=True)
+
+    rng = np.random.default_rng(seed)
+    multipliers = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    offsets = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+    signatures = np.empty((len(positions), num_perm), dtype=np.uint32)
+    with np.errstate(over='ignore'):
+        for i in range(num_perm):
+            permuted = ((word_hashes * multipliers[i] + offsets[i]) >> np.uint64(32)).astype(np.uint32)
+            signatures[:, i] = np.minimum.reduceat(permuted, starts)
+    return positions, signatures
+
+def free_text_columns(df: pd.DataFrame, min_distinct_ratio: float = FREE_TEXT_MIN_DISTINCT_RATIO,
+                      min_words: float = FREE_TEXT_MIN_WORDS, sample_size: int = FREE_TEXT_SAMPLE_SIZE,
+                      seed: int = 0) -> List[Any]:
+    """
+    Text columns that hold free text: mostly distinct values of several words on average
+
+    Low-cardinality codes, categories and single-word identifiers are left
+    out; in the word sets of near-duplicate search they make unrelated rows
+    look alike. Judged on a seeded sample of up to sample_size values per column.
+    """
+    columns = []
+    for col in df.select_dtypes(include=TEXT_DTYPES).columns:
+        values = df[col].dropna()
+        if len(values) > sample_size:
+            values = values.sample(sample_size, random_state=seed)
+        if values.empty:
+            continue
+        values = values.astype('string')
+        words = values.str.count(r'\w+').mean()
+        if values.nunique() >= min_distinct_ratio * len(values) and words >= min_words:
+            columns.append(col)
+    return columns
+
+def near_duplicate_groups(df: pd.DataFrame, columns: Optional[Sequence[Any]] = None,
+                          threshold: float = NEAR_DUPLICATE_THRESHOLD,
+                          num_perm: int = MINHASH_PERMUTATIONS, seed: int = 0) -> RowGroups:
+    """
+    Groups of rows whose text columns are near duplicates (MinHash / LSH)
+
+    Rows are compared on the Jaccard similarity of the words in the given
+    columns (by default every text column), so differences in case,
+    punctuation and word order do not matter. LSH buckets propose candidate
+    pairs without comparing every pair of rows; each candidate is kept only
+    if its estimated similarity (the share of equal MinHash values) reaches
+    the threshold, and kept pairs are joined into groups.
+
+    Groups are transitive: if row A is near B and B is near C, all three are
+    one group even when A and C are not alike, so a group's similarity is the
+    weakest link that joined it rather than the similarity of every pair.
+
+    Args:
+        df: DataFrame to search
+        columns: Text columns to compare (default: the free-text columns, see free_text_columns())
+        threshold: Minimum estimated Jaccard similarity of a pair, between 0 and 1
+        num_perm: MinHash values per row; more gives finer similarity estimates
+        seed: Seed of the MinHash permutations
+
+    Returns:
+        RowGroups with the lowest linking similarity of each group
+    """
+    if not 0 < threshold <= 1:
+        raise ValueError("threshold must be between 0 and 1")
+    if columns is None:
+        columns = free_text_columns(df)
+    missing = [col for col in columns if col not in df.columns]
+    if missing:
+        raise ValueError(f"Unknown columns: {missing}")
+
+    positions, signatures = minhash_signatures(df, columns, num_perm, seed)
+    bands, rows_per_band = lsh_bands(num_perm, threshold)
+
+    sources, targets = [], []
+    for band in range(bands):
+        block = np.ascontiguousarray(signatures[:, band * rows_per_band:(band + 1) * rows_per_band])
+        keys = block.view(np.dtype((np.void, block.dtype.itemsize * rows_per_band))).ravel()
+        _, first, bucket = np.unique(keys, return_index=True, return_inverse=True)
+        # Link every row to the first row of its bucket: linear in the bucket size
+        candidates = np.flatnonzero(first[bucket] != np.arange(len(keys)))
+        sources.append(first[bucket[candidates]])
+        targets.append(candidates)
+
+    sources = np.concatenate(sources) if sources else np.empty(0, dtype=np.int64)
+    targets = np.concatenate(targets) if targets else np.empty(0, dtype=np.int64)
+    if len(sources):
+        pairs = np.unique(np.stack([sources, targets], axis=1), axis=0)
+        sources, targets = pairs[:, 0], pairs[:, 1]
+    similarity = (signatures[sources] == signatures[targets]).mean(axis=1) if len(sources) else np.empty(0)
+    linked = similarity >= threshold
+    sources, targets, similarity = sources[linked], targets[linked], similarity[linked]
+
+    graph = coo_matrix((np.ones(len(sources)), (sources, targets)), shape=(len(positions), len(positions)))
+    _, labels = connected_components(graph, directed=False)
+    lowest = np.ones(labels.max(initial=-1) + 1)
+    np.minimum.at(lowest, labels[sources], similarity)
+    logger.info(f"Near duplicates: {len(sources)} linked pairs among {len(positions)} rows "
+                f"({bands} bands of {rows_per_band})")
+    return _groups_from_labels(labels, positions, lowest)
@@ -0,0 +1,467 @@
+import logging
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from services.sketches import DistinctCounter, HeavyHitters, QuantileSketch
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class NumericAccumulator:
+    """Mergeable count, moments and quantile sketch for one numeric column"""
+
+    def __init__(self, quantile_k: int = 200, seed: Optional[int] = None):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.sketch = QuantileSketch(k=quantile_k, seed=seed)
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of float values (NaN values are ignored)"""
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+
+        mean = float(values.mean())
+        delta = values - mean
+        self._combine(values.size, mean, float(np.sum(delta ** 2)),
+                      float(np.sum(delta ** 3)), float(np.sum(delta ** 4)))
+        self.sketch.update(values)
+
+    def merge(self, other: 'NumericAccumulator') -> 'NumericAccumulator':
+        """Fold another accumulator into this one"""
+        self._combine(other.n, other.mean, other.m2, other.m3, other.m4)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def _combine(self, n_b: int, mean_b: float, m2_b: float, m3_b: float, m4_b: float) -> None:
+        # Pairwise update of central moments (Chan et al. / Pebay)
+        n_a = self.n
+        if n_b == 0:
+            return
+        if n_a == 0:
+            self.n, self.mean, self.m2, self.m3, self.m4 = n_b, mean_b, m2_b, m3_b, m4_b
+            return
+
+        n = n_a + n_b
+        delta = mean_b - self.mean
+        m2_a, m3_a = self.m2, self.m3
+
+        self.m4 = (self.m4 + m4_b
+                   + delta ** 4 * n_a * n_b * (n_a ** 2 - n_a * n_b + n_b ** 2) / n ** 3
+                   + 6 * delta ** 2 * (n_a ** 2 * m2_b + n_b ** 2 * m2_a) / n ** 2
+                   + 4 * delta * (n_a * m3_b - n_b * m3_a) / n)
+        self.m3 = (m3_a + m3_b
+                   + delta ** 3 * n_a * n_b * (n_a - n_b) / n ** 2
+                   + 3 * delta * (n_a * m2_b - n_b * m2_a) / n)
+        self.m2 = m2_a + m2_b + delta ** 2 * n_a * n_b / n
+        self.mean += delta * n_b / n
+        self.n = n
+
+    def std(self) -> Optional[float]:
+        return float(np.sqrt(self.m2 / (self.n - 1))) if self.n > 1 else None
+
+    def skew(self) -> Optional[float]:
+        """Bias-corrected sample skewness, as returned by pandas Series.skew()"""
+        n = self.n
+        if n < 3:
+            return None
+        if self.m2 == 0:
+            return 0.0
+        return float(np.sqrt(n * (n - 1)) / (n - 2) * (self.m3 / n) / (self.m2 / n) ** 1.5)
+
+    def kurtosis(self) -> Optional[float]:
+        """Bias-corrected excess kurtosis, as returned by pandas Series.kurtosis()"""
+        n = self.n
+        if n < 4:
+            return None
+        if self.m2 == 0:
+            return 0.0
+        numer = n * (n + 1) * (n - 1) * self.m4
+        denom = (n - 2) * (n - 3) * self.m2 ** 2
+        return float(numer / denom - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3)))
+
+class ColumnAccumulator:
+    """Mergeable null count, distinct-count sketch and top values (or date range) for one column"""
+
+    def __init__(self, hll_precision: int = 12, top_k_capacity: int = 100, sample_size: int = 20):
+        self.count = 0
+        self.nulls = 0
+        self.kind = None  # 'numeric', 'bool', 'datetime' or 'object', fixed by the first non-empty chunk
+        self.dtypes = set()
+        self.invalid = 0
+        # Earliest and latest value of a datetime column
+        self.min: Optional[pd.Timestamp] = None
+        self.max: Optional[pd.Timestamp] = None
+        self.distinct = DistinctCounter(hll_precision)
+        self.top_values = HeavyHitters(top_k_capacity)
+        self.first_unique: List[Any] = []
+        self.sample_size = sample_size
+
+    def merge(self, other: 'ColumnAccumulator') -> 'ColumnAccumulator':
+        """Fold another accumulator into this one"""
+        self.count += other.count
+        self.nulls += other.nulls
+        self.invalid += other.invalid
+        self.kind = self.kind or other.kind
+        self.dtypes |= other.dtypes
+        self.update_range(other.min, other.max)
+        self.distinct.merge(other.distinct)
+        self.top_values.merge(other.top_values)
+        for value in other.first_unique:
+            if len(self.first_unique) >= self.sample_size:
+                break
+            if value not in self.first_unique:
+                self.first_unique.append(value)
+        return self
+
+    def update_range(self, low: Optional[pd.Timestamp], high: Optional[pd.Timestamp]) -> None:
+        """Widen the date range to include low and high (None or NaT are ignored)"""
+        if low is not None and not pd.isna(low):
+            self.min = low if self.min is None else min(self.min, low)
+        if high is not None and not pd.isna(high):
+            self.max = high if self.max is None else max(self.max, high)
+
+class StreamingProfiler:
+    """
+    Single-pass profile of a table that arrives in chunks
+
+    Every accumulator is mergeable, so profiles built over separate chunks or
+    partitions can be combined with merge(). The results mirror the shapes of
+    get_data_info(), NumericProfile.descriptive_stats() and get_categorical_stats().
+    """
+
+    def __init__(self, quantile_k: int = 200, hll_precision: int = 12,
+                 top_k_capacity: int = 100, max_row_hashes: int = 10_000_000):
+        """
+        Args:
+            quantile_k: Compactor size of the quantile sketches (larger is more accurate)
+            hll_precision: HyperLogLog precision for distinct counts (2**p registers)
+            top_k_capacity: Number of values tracked per column for top values
+            max_row_hashes: Row fingerprints kept for exact duplicate counting;
+                duplicate_rows is reported as None once this is exceeded
+        """
+        self.quantile_k = quantile_k
+        self.hll_precision = hll_precision
+        self.top_k_capacity = top_k_capacity
+        self.max_row_hashes = max_row_hashes
+
+        self.rows = 0
+        self.memory_usage = 0
+        self.columns: List[str] = []
+        self.column_stats: Dict[str, ColumnAccumulator] = {}
+        self.numeric_stats: Dict[str, NumericAccumulator] = {}
+        self.head: Optional[pd.DataFrame] = None
+        self.tail: Optional[pd.DataFrame] = None
+        self._row_hashes: Optional[np.ndarray] = np.empty(0, dtype='uint64')
+        self._duplicate_rows = 0
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Add one chunk of rows"""
+        if self.head is None:
+            self.head = chunk.head(10)
+        self.tail = pd.concat([self.tail, chunk]).tail(10) if self.tail is not None else chunk.tail(10)
+
+        for col in chunk.columns:
+            if col not in self.column_stats:
+                self.columns.append(col)
+                self.column_stats[col] = ColumnAccumulator(self.hll_precision, self.top_k_capacity)
+
+        self.rows += len(chunk)
+        self.memory_usage += int(chunk.memory_usage(deep=True).sum())
+        self._update_row_hashes(chunk)
+
+        numeric_cols = []
+        for col in chunk.columns:
+            acc = self.column_stats[col]
+            series = chunk[col]
+            null_mask = series.isna()
+            non_null = len(series) - int(null_mask.sum())
+            acc.nulls += len(series) - non_null
+
+            if acc.kind is None and non_null > 0:
+                if pd.api.types.is_bool_dtype(series):
+                    acc.kind = 'bool'
+                elif pd.api.types.is_datetime64_any_dtype(series):
+                    acc.kind = 'datetime'
+                elif pd.api.types.is_numeric_dtype(series):
+                    acc.kind = 'numeric'
+                    self.numeric_stats[col] = NumericAccumulator(self.quantile_k, _sketch_seed(col))
+                else:
+                    acc.kind = 'object'
+
+            if acc.kind == 'numeric':
+                acc.dtypes.add(str(series.dtype))
+                numeric_cols.append(col)
+            elif acc.kind == 'datetime':
+                self._update_datetime(acc, series)
+            elif acc.kind is not None:
+                acc.dtypes.add(str(series.dtype))
+                acc.count += non_null
+                acc.distinct.update(series)
+                acc.top_values.update(series)
+                self._collect_unique(acc, series)
+
+        if numeric_cols:
+            self._update_numeric(chunk[numeric_cols])
+
+    def merge(self, other: 'StreamingProfiler') -> 'StreamingProfiler':
+        """Fold a profile of another partition into this one (rows are appended after ours)"""
+        self.rows += other.rows
+        self.memory_usage += other.memory_usage
+        if self.head is None:
+            self.head = other.head
+        if other.tail is not None:
+            self.tail = pd.concat([self.tail, other.tail]).tail(10)
+
+        for col in other.columns:
+            if col not in self.column_stats:
+                self.columns.append(col)
+                self.column_stats[col] = ColumnAccumulator(self.hll_precision, self.top_k_capacity)
+            self.column_stats[col].merge(other.column_stats[col])
+            if col in other.numeric_stats:
+                self.numeric_stats.setdefault(
+                    col, NumericAccumulator(self.quantile_k, _sketch_seed(col))).merge(other.numeric_stats[col])
+
+        if self._row_hashes is None or other._row_hashes is None:
+            self._row_hashes = None
+        else:
+            self._row_hashes, known = _merge_fingerprints(self._row_hashes, other._row_hashes)
+            self._duplicate_rows += other._duplicate_rows + known
+        return self
+
+    def data_info(self) -> Dict[str, Any]:
+        """Profile equivalent of get_data_info()"""
+        dtypes = {col: self._dtype(col) for col in self.columns}
+        null_counts = {col: self.column_stats[col].nulls for col in self.columns}
+        return {
+            'shape': [self.rows, len(self.columns)],
+            'columns': list(self.columns),
+            'dtypes': dtypes,
+            'memory_usage': self.memory_usage,
+            'null_counts': null_counts,
+            'null_percentages': {col: (count / self.rows * 100) if self.rows else 0
+                                 for col, count in null_counts.items()},
+            'duplicate_rows': self._duplicate_rows if self._row_hashes is not None else None,
+            'numerical_columns': [col for col in self.columns if dtypes[col] in ('int64', 'float64')],
+            'categorical_columns': [col for col in self.columns if dtypes[col] == 'object'],
+            'datetime_columns': [col for col in self.columns if dtypes[col].startswith('datetime64')]
+        }
+
+    def datetime_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Count, missing values and date range of the datetime columns (ISO timestamps)"""
+        return {
+            col: {
+                'count': acc.count,
+                'missing_count': acc.nulls,
+                'missing_percentage': round(acc.nulls / self.rows * 100, 2) if self.rows else 0,
+                'min': acc.min.isoformat() if acc.min is not None else None,
+                'max': acc.max.isoformat() if acc.max is not None else None,
+                'invalid_count': acc.invalid
+            }
+            for col, acc in self.column_stats.items() if acc.kind == 'datetime'
+        }
+
+    def descriptive_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Profile equivalent of NumericProfile.descriptive_stats() (percentiles are sketch estimates)"""
+        stats = {}
+        for col in self.columns:
+            if self._dtype(col) not in ('int64', 'float64'):
+                continue
+            acc = self.numeric_stats.get(col)
+            if acc is None or acc.n == 0:
+                stats[col] = {'count': 0, **{metric: 'N/A' for metric in
+                                            ['mean', 'std', 'min', '25%', '50%', '75%', 'max']}}
+                continue
+
+            q1, median, q3 = acc.sketch.quantiles([0.25, 0.5, 0.75])
+            std = acc.std()
+            stats[col] = {
+                'count': acc.n,
+                'mean': acc.mean,
+                'std': std if std is not None else 'N/A',
+                'min': acc.sketch.min,
+                '25%': q1,
+                '50%': median,
+                '75%': q3,
+                'max': acc.sketch.max
+            }
+        return stats
+
+    def outlier_bounds(self) -> Dict[str, Dict[str, Any]]:
+        """
+        IQR outlier bounds from the quartile sketches
+
+        Counting values outside the bounds would need a second pass over the
+        file, so only the bounds are reported, with the sketch's rank error.
+        """
+        bounds = {}
+        for col, acc in self.numeric_stats.items():
+            if acc.n < 4:
+                continue
+            q1, q3 = acc.sketch.quantiles([0.25, 0.75])
+            iqr = q3 - q1
+            bounds[col] = {
+                'method': 'IQR',
+                'q1': round(q1, 3),
+                'q3': round(q3, 3),
+                'iqr': round(iqr, 3),
+                'lower_bound': round(q1 - 1.5 * iqr, 3),
+                'upper_bound': round(q3 + 1.5 * iqr, 3),
+                'quantile_rank_error': acc.sketch.rank_error()
+            }
+        return bounds
+
+    def numerical_analysis(self) -> Dict[str, Dict[str, Any]]:
+        """Skewness, kurtosis and invalid-value counts for numeric columns"""
+        return {
+            col: {
+                'skewness': acc.skew() if acc.skew() is not None else 'N/A',
+                'kurtosis': acc.kurtosis() if acc.kurtosis() is not None else 'N/A',
+                'invalid_count': self.column_stats[col].invalid
+            }
+            for col, acc in self.numeric_stats.items()
+        }
+
+    def categorical_stats(self, top_k: int = 10) -> Dict[str, Dict[str, Any]]:
+        """Profile equivalent of get_categorical_stats() (unique_count is a HyperLogLog estimate)"""
+        stats = {}
+        for col in self.columns:
+            acc = self.column_stats[col]
+            if self._dtype(col) != 'object':
+                continue
+            stats[col] = {
+                'count': acc.count,
+                'unique_count': min(acc.distinct.estimate(), acc.count),
+                'missing_count': acc.nulls,
+                'missing_percentage': round(acc.nulls / self.rows * 100, 2) if self.rows else 0,
+                'unique_values': list(acc.first_unique),
+                'top_values': acc.top_values.top(top_k)
+            }
+        return stats
+
+    def _dtype(self, col: str) -> str:
+        acc = self.column_stats[col]
+        if acc.kind == 'numeric':
+            # A column that was int64 in every chunk stays int64 when loaded in full
+            return 'int64' if acc.dtypes == {'int64'} and acc.invalid == 0 else 'float64'
+        if acc.kind == 'bool':
+            return 'bool' if acc.dtypes == {'bool'} else 'object'
+        if acc.kind == 'datetime':
+            # Values that did not parse in later chunks are counted as invalid, as for numeric columns
+            return min(acc.dtypes)
+        if acc.kind is None:
+            return 'float64'  # pandas reads an all-empty column as float64
+        return 'object'
+
+    def _update_numeric(self, block: pd.DataFrame) -> None:
+        """Coerce the chunk's numeric columns into one float block and update their accumulators"""
+        values = np.empty(block.shape, dtype='float64')
+        for i, col in enumerate(block.columns):
+            series = block[col]
+            if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+                coerced = pd.to_numeric(series, errors='coerce')
+                # Values that stopped parsing as numbers after the first chunk
+                self.column_stats[col].invalid += int(series.notna().sum() - coerced.notna().sum())
+                series = coerced
+            values[:, i] = series.to_numpy(dtype='float64', na_value=np.nan)
+
+        for i, col in enumerate(block.columns):
+            self.numeric_stats[col].update(values[:, i])
+
+    def _update_datetime(self, acc: ColumnAccumulator, series: pd.Series) -> None:
+        """Count a chunk of a datetime column and widen its date range"""
+        if not pd.api.types.is_datetime64_any_dtype(series):
+            # A chunk where the column did not parse as dates (e.g. one malformed value)
+            coerced = pd.to_datetime(series, errors='coerce')
+            acc.invalid += int(series.notna().sum() - coerced.notna().sum())
+            series = coerced
+        else:
+            acc.dtypes.add(str(series.dtype))
+        acc.count += int(series.notna().sum())
+        acc.update_range(series.min(), series.max())
+
+    def _update_row_hashes(self, chunk: pd.DataFrame) -> None:
+        if self._row_hashes is None:
+            return
+
+        hashes = pd.util.hash_pandas_object(_normalize_for_hashing(chunk), index=False).to_numpy()
+        # Only the chunk is sorted; the fingerprints seen so far stay sorted and are merged into
+        new = np.unique(hashes)
+        self._row_hashes, known = _merge_fingerprints(self._row_hashes, new)
+        self._duplicate_rows += len(hashes) - len(new) + known
+
+        if len(self._row_hashes) > self.max_row_hashes:
+            logger.info("Row fingerprint limit reached - duplicate count disabled for this profile")
+            self._row_hashes = None
+
+    def _collect_unique(self, acc: ColumnAccumulator, series: pd.Series) -> None:
+        if len(acc.first_unique) >= acc.sample_size:
+            return
+        for value in series.dropna().unique():
+            if value not in acc.first_unique:
+                acc.first_unique.append(value.item() if isinstance(value, np.generic) else value)
+                if len(acc.first_unique) >= acc.sample_size:
+                    break
+
+def _sketch_seed(col: Any) -> int:
+    # Seeded per column name, so profiling the same file twice gives the same quartiles
+    return zlib.crc32(str(col).encode('utf-8'))
+
+def _merge_fingerprints(known: np.ndarray, new: np.ndarray) -> Tuple[np.ndarray, int]:
+    """
+    Merge sorted unique fingerprints into the sorted unique ones seen so far
+
+    Each new fingerprint is looked up with a binary search and the unseen
+    ones are inserted in one linear pass, so the fingerprints of earlier
+    chunks are never sorted again.
+
+    Returns:
+        The merged sorted fingerprints and how many of the new ones were already known
+    """
+    positions = np.searchsorted(known, new)
+    seen = np.zeros(len(new), dtype=bool)
+    inside = positions < len(known)
+    seen[inside] = known[positions[inside]] == new[inside]
+    return np.insert(known, positions[~seen], new[~seen]), int(seen.sum())
+
+def _normalize_for_hashing(chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    Give each column the same dtype whatever a single chunk inferred
+
+    Chunks are parsed independently, so the same column can come back as
+    int64 in one chunk and float64 (or all-NaN float64 vs object) in another;
+    identical rows must still hash identically.
+    """
+    normalized = {}
+    for col in chunk.columns:
+        series = chunk[col]
+        if series.isna().all():
+            normalized[col] = pd.Series(np.nan, index=series.index, dtype='object')
+        elif pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            normalized[col] = series.astype('float64')
+        elif isinstance(series.dtype, pd.CategoricalDtype):
+            normalized[col] = series.astype('object')
+        else:
+            normalized[col] = series
+    return pd.DataFrame(normalized, index=chunk.index)
+
+def profile_chunks(chunks: Iterable[pd.DataFrame], **profiler_kwargs) -> StreamingProfiler:
+    """Build a profile from an iterable of DataFrame chunks"""
+    profiler = StreamingProfiler(**profiler_kwargs)
+    for chunk in chunks:
+        profiler.update(chunk)
+    logger.info(f"Profiled {profiler.rows} rows x {len(profiler.columns)} columns in streaming mode")
+    return profiler
+
+def profile_csv(file_path_or_buffer: Any, chunksize: int = 100_000, read_options: Optional[Dict[str, Any]] = None,
+                **profiler_kwargs) -> StreamingProfiler:
+    """Profile a CSV file (path or open binary stream) chunk by chunk without loading the whole table"""
+    with pd.read_csv(file_path_or_buffer, chunksize=chunksize, **(read_options or {})) as reader:
+        return profile_chunks(reader, **profiler_kwargs)
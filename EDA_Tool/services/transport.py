@@ -0,0 +1,151 @@
+import json
+import base64
+import logging
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Wire formats a client can ask for, via the 'format' request field or the Accept header
+FORMAT_JSON = 'json'
+FORMAT_BDATA = 'bdata'
+FORMAT_ARROW = 'arrow'
+ARROW_MIME_TYPE = 'application/vnd.apache.arrow.stream'
+
+# numpy dtype -> plotly typed-array dtype code (https://plotly.com/javascript/reference/ typed arrays)
+_BDATA_DTYPES = {
+    'int8': 'i1', 'uint8': 'u1', 'int16': 'i2', 'uint16': 'u2',
+    'int32': 'i4', 'uint32': 'u4', 'float32': 'f4', 'float64': 'f8'
+}
+
+# Trace attributes that hold one value per data point
+_DATA_ATTRIBUTES = ('x', 'y', 'z')
+
+def negotiate_format(requested: Optional[str], accept: Optional[str], allowed: tuple) -> str:
+    """
+    Pick the response format for a request
+
+    Args:
+        requested: Explicit 'format' field from the request, if any
+        accept: The request's Accept header
+        allowed: Formats the endpoint can produce
+
+    Returns:
+        One of the allowed formats, FORMAT_JSON by default
+    """
+    if requested:
+        requested = requested.lower()
+        if requested not in allowed:
+            raise ValueError(f"Unsupported format: {requested} (use one of {', '.join(allowed)})")
+    elif accept and ARROW_MIME_TYPE in accept and FORMAT_ARROW in allowed:
+        requested = FORMAT_ARROW
+    else:
+        requested = FORMAT_JSON
+
+    if requested == FORMAT_ARROW and not ARROW_AVAILABLE:
+        raise ValueError("Arrow responses require the pyarrow package")
+    return requested
+
+def frame_to_arrow_ipc(df: pd.DataFrame, metadata: Optional[Dict[str, Any]] = None) -> bytes:
+    """
+    Encode a DataFrame as an Arrow IPC stream
+
+    Numeric columns are copied as raw buffers, without converting each value to
+    a Python object. Extra JSON-serializable metadata (e.g. paging information)
+    is stored in the schema under the 'eda' key.
+    """
+    table = pa.Table.from_pandas(_arrow_safe(df), preserve_index=False)
+    if metadata is not None:
+        schema_metadata = dict(table.schema.metadata or {})
+        schema_metadata[b'eda'] = json.dumps(metadata, default=str).encode('utf-8')
+        table = table.replace_schema_metadata(schema_metadata)
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+def typed_array(values: np.ndarray) -> Optional[Dict[str, str]]:
+    """
+    Encode a numeric array in plotly's typed-array form {'dtype', 'bdata', 'shape'}
+
+    Returns None for arrays that have no typed-array equivalent (text, dates,
+    objects); 64-bit integers become float64 since JavaScript has no int64 array
+    that plotly accepts.
+    """
+    if values.dtype.kind not in 'iuf':
+        return None
+    if values.dtype.name not in _BDATA_DTYPES:
+        values = values.astype(np.float64)
+
+    # Typed arrays are little-endian; tobytes() copies in row-major order
+    little_endian = values.astype(values.dtype.newbyteorder('<'), copy=False)
+    encoded = {
+        'dtype': _BDATA_DTYPES[values.dtype.name],
+        'bdata': base64.b64encode(little_endian.tobytes()).decode('ascii')
+    }
+    if values.ndim > 1:
+        encoded['shape'] = ', '.join(str(size) for size in values.shape)
+    return encoded
+
+def encode_figure(figure: Dict[str, Any], data_format: str = FORMAT_JSON) -> Dict[str, Any]:
+    """
+    Finalize a plotly figure whose traces hold Series or arrays for x/y/z
+
+    With FORMAT_BDATA numeric arrays are sent as base64 typed arrays; anything
+    else (and every array with FORMAT_JSON) becomes a list with NaN as None.
+    """
+    traces = []
+    for trace in figure.get('data', []):
+        trace = dict(trace)
+        for attribute in _DATA_ATTRIBUTES:
+            if attribute in trace:
+                trace[attribute] = _encode_values(trace[attribute], data_format)
+        traces.append(trace)
+    return {**figure, 'data': traces}
+
+def _encode_values(values: Any, data_format: str) -> Any:
+    if isinstance(values, pd.Series):
+        if values.dtype.kind in 'iuf' and not isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.to_numpy()
+        elif pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            # Nullable integer/float columns: missing values become NaN
+            values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            return values.astype(object).where(values.notna(), None).tolist()
+
+    if not isinstance(values, np.ndarray):
+        return values
+    if data_format == FORMAT_BDATA:
+        encoded = typed_array(values)
+        if encoded is not None:
+            return encoded
+    if values.dtype.kind == 'f':
+        return np.where(np.isnan(values), None, values.astype(object)).tolist()
+    return values.tolist()
+
+def _arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """String column names, and text for object columns that mix Python types"""
+    if not all(isinstance(col, str) for col in df.columns):
+        df = df.rename(columns=str)
+    mixed_cols = []
+    for col in df.select_dtypes(include=['object']).columns:
+        try:
+            pa.array(df[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            mixed_cols.append(col)
+    if mixed_cols:
+        df = df.copy()
+        for col in mixed_cols:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
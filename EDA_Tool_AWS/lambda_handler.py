@@ -7,15 +7,15 @@ import plotly.graph_objects as go
 import plotly.express as px
 import plotly.utils
 from plotly.subplots import make_subplots
-from flask import Flask, render_template, request, jsonify, session, send_file
+from flask import Flask, render_template, request, jsonify, session, send_file, Response
 from werkzeug.utils import secure_filename
-from scipy import stats
 from sklearn.preprocessing import StandardScaler
 import io
 import base64
 from datetime import datetime
 import warnings
 import sys
+import uuid
 import boto3
 from botocore.exceptions import ClientError
 
@@ -33,11 +33,57 @@ app.config['MAX_CONTENT_LENGTH'] = 100 * 1024 * 1024  # 100MB limit
 # For Lambda, we'll use /tmp for uploads
 app.config['UPLOAD_FOLDER'] = '/tmp'
 
+# Rows per chunk for streaming profiles
+app.config['STREAMING_CHUNK_ROWS'] = int(os.environ.get('STREAMING_CHUNK_ROWS', 100_000))
+
+# Resumable chunked uploads - API Gateway caps a request at 6MB, so chunks must stay below that.
+# Chunks are kept in this instance's /tmp, so all requests of one upload must reach the same warm instance.
+# The session cookie cannot hold a dataset of that size and there is no server-side dataset store here,
+# so chunked uploads are finalized as streaming profiles (CSV only).
+app.config['CHUNKED_UPLOAD_FOLDER'] = '/tmp/chunked_uploads'
+app.config['CHUNKED_UPLOAD_MAX_BYTES'] = int(os.environ.get('CHUNKED_UPLOAD_MAX_MB', 500)) * 1024 * 1024
+app.config['CHUNK_SIZE_BYTES'] = 4 * 1024 * 1024
+
+# gzip/brotli for analysis responses (smaller bodies are sent uncompressed)
+app.config['COMPRESSION_MIN_BYTES'] = int(os.environ.get('COMPRESSION_MIN_BYTES', 1024))
+
+# Percentiles: 'exact' (full sort), 'approx' (mergeable quantile sketches) or 'auto'
+# (sketches from APPROX_QUANTILE_MIN_ROWS rows up); sketch rank error is at most about 3.5 / K
+app.config['QUANTILE_MODE'] = os.environ.get('QUANTILE_MODE', 'auto').lower()
+app.config['APPROX_QUANTILE_MIN_ROWS'] = int(os.environ.get('APPROX_QUANTILE_MIN_ROWS', 1_000_000))
+app.config['QUANTILE_SKETCH_K'] = int(os.environ.get('QUANTILE_SKETCH_K', 200))
+
+# Distinct counts: 'exact' (nunique), 'approx' (HyperLogLog) or 'auto' (HyperLogLog from
+# APPROX_DISTINCT_MIN_ROWS rows up); the HLL standard error is 1.04 / sqrt(2 ** HLL_PRECISION)
+app.config['CARDINALITY_MODE'] = os.environ.get('CARDINALITY_MODE', 'auto').lower()
+app.config['APPROX_DISTINCT_MIN_ROWS'] = int(os.environ.get('APPROX_DISTINCT_MIN_ROWS', 1_000_000))
+app.config['HLL_PRECISION'] = int(os.environ.get('HLL_PRECISION', 14))
+
+# Most frequent values of categorical columns: TOP_VALUES_CAPACITY values are tracked per
+# column (exact counts below that many distinct values), TOP_VALUES_K are listed in the
+# analysis and BAR_CHART_TOP_K get their own bar, the rest are drawn as one 'Other' bar
+app.config['TOP_VALUES_CAPACITY'] = int(os.environ.get('TOP_VALUES_CAPACITY', 1000))
+app.config['TOP_VALUES_K'] = int(os.environ.get('TOP_VALUES_K', 10))
+app.config['BAR_CHART_TOP_K'] = int(os.environ.get('BAR_CHART_TOP_K', 20))
+
+# Normality tests: Shapiro-Wilk up to 5000 values, D'Agostino K² above; larger columns are
+# sampled (reproducibly, with NORMALITY_SEED) to NORMALITY_SAMPLE_SIZE values for the sample tests
+app.config['NORMALITY_SAMPLE_SIZE'] = int(os.environ.get('NORMALITY_SAMPLE_SIZE', 5000))
+app.config['NORMALITY_SEED'] = int(os.environ.get('NORMALITY_SEED', 0))
+
+# Per-column analysis of wide datasets: columns are split into batches of COLUMN_BATCH_SIZE
+# run on COLUMN_WORKERS threads (0 = one per CPU) once a dataset has PARALLEL_MIN_COLUMNS columns
+app.config['COLUMN_WORKERS'] = int(os.environ.get('COLUMN_WORKERS', 0))
+app.config['COLUMN_BATCH_SIZE'] = int(os.environ.get('COLUMN_BATCH_SIZE', 32))
+app.config['PARALLEL_MIN_COLUMNS'] = int(os.environ.get('PARALLEL_MIN_COLUMNS', 64))
+
 # Supported file extensions
 ALLOWED_EXTENSIONS = {'csv', 'xlsx', 'xls'}
 
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    # Data files may also be compressed (sales.csv.gz) or zipped (export.zip)
+    extension, compression = split_extension(filename)
+    return extension in ALLOWED_EXTENSIONS or compression == 'zip'
 
 def get_gemini_api_key():
     """Get Gemini API key from AWS Secrets Manager"""
@@ -78,50 +124,132 @@ except Exception as e:
 # Ensure upload directory exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
-def convert_numpy_types(obj):
-    """Convert numpy types to native Python types for JSON serialization"""
-    if isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, pd.Series):
-        return obj.tolist()
-    elif isinstance(obj, pd.DataFrame):
-        return obj.to_dict()
-    elif isinstance(obj, np.bool_):
-        return bool(obj)
-    elif isinstance(obj, bool):
-        return bool(obj)
-    elif isinstance(obj, dict):
-        return {key: convert_numpy_types(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_numpy_types(item) for item in obj]
-    else:
-        return obj
+from services.streaming_profiler import profile_csv
+from services.csv_sniffer import sniff_csv
+from services.cardinality import CARDINALITY_APPROX, CARDINALITY_EXACT, distinct_values
+from services.column_executor import ColumnExecutor, track_batches
+from services.top_values import bar_chart_counts, column_heavy_hitters, profile_top_values, top_values_summary
+from services.numeric_profile import QUANTILE_APPROX, QUANTILE_EXACT, profile_numeric
+from services.normality import normality_tests
+from services.chunked_upload import ChunkedUploadStore
+from services.compression import data_extension, decompressed_copy, open_data_stream, split_extension
+from services.serialization import FastJSONProvider, to_builtin
+from services.http_cache import compress_response, etag_matches, make_etag, not_modified, with_etag
+from services.row_query import DEFAULT_PAGE_SIZE, page_positions, query_rows, sort_order
+from services.transport import (ARROW_MIME_TYPE, FORMAT_ARROW, FORMAT_BDATA, FORMAT_JSON,
+                                encode_figure, frame_to_arrow_ipc, negotiate_format)
+
+# Every jsonify() response and the session go through one numpy/pandas-aware encoder
+app.json = FastJSONProvider(app)
+
+# Per-column analysis of wide datasets runs in batches on a thread pool; the data lives
+# in the session rather than in a file worker processes could read, so no processes here
+column_executor = ColumnExecutor(
+    app.config['COLUMN_WORKERS'],
+    batch_size=app.config['COLUMN_BATCH_SIZE'],
+    min_parallel_columns=app.config['PARALLEL_MIN_COLUMNS']
+)
 
-def load_data(file_path, file_extension):
+chunked_uploads = ChunkedUploadStore(
+    app.config['CHUNKED_UPLOAD_FOLDER'],
+    max_upload_bytes=app.config['CHUNKED_UPLOAD_MAX_BYTES'],
+    max_chunk_bytes=app.config['CHUNK_SIZE_BYTES'],
+    max_age_seconds=60 * 60
+)
+
+# Responses of these endpoints are gzip/brotli compressed for clients that accept it
+COMPRESSED_ENDPOINTS = {'analyze_data', 'visualize_data'}
+
+@app.after_request
+def compress_analysis_response(response):
+    if request.endpoint in COMPRESSED_ENDPOINTS:
+        compress_response(response, request.accept_encodings, min_size=app.config['COMPRESSION_MIN_BYTES'])
+    return response
+
+def numeric_profile(df):
+    """Numeric profile with exact or sketch-based percentiles, per QUANTILE_MODE"""
+    mode = app.config['QUANTILE_MODE']
+    if mode == 'auto':
+        mode = QUANTILE_APPROX if len(df) >= app.config['APPROX_QUANTILE_MIN_ROWS'] else QUANTILE_EXACT
+    return profile_numeric(df, mode, app.config['QUANTILE_SKETCH_K'], column_executor)
+
+def cardinality_mode(rows, requested=None):
+    """Exact or HyperLogLog distinct counts: the requested mode, else per CARDINALITY_MODE"""
+    if requested is not None:
+        if requested not in (CARDINALITY_EXACT, CARDINALITY_APPROX):
+            raise ValueError(f"Unknown cardinality mode: {requested} (use exact or approx)")
+        return requested
+    mode = app.config['CARDINALITY_MODE']
+    if mode == 'auto':
+        return CARDINALITY_APPROX if rows >= app.config['APPROX_DISTINCT_MIN_ROWS'] else CARDINALITY_EXACT
+    return mode
+
+def load_data(file_path, file_extension, usecols=None):
     """Load data from file based on extension"""
     try:
         if file_extension == 'csv':
-            # Try different encodings
-            encodings = ['utf-8', 'latin-1', 'cp1252']
-            for encoding in encodings:
-                try:
-                    df = pd.read_csv(file_path, encoding=encoding)
-                    break
-                except UnicodeDecodeError:
-                    continue
-            else:
-                df = pd.read_csv(file_path, encoding='utf-8', errors='ignore')
+            # Detect encoding, dialect and column types from one sample, then parse once
+            read_options = sniff_csv(file_path)
+            if usecols is not None:
+                read_options['usecols'] = usecols
+            try:
+                # Compressed files are decompressed as the parser reads them
+                with open_data_stream(file_path) as stream:
+                    df = pd.read_csv(stream, low_memory=False, **read_options)
+            except (UnicodeDecodeError, ValueError) as e:
+                # The sample did not represent the whole file - fall back to untyped parsing
+                print(f"Typed CSV read failed ({str(e)}), retrying without dtype hints")
+                encodings = [read_options['encoding'], 'cp1252', 'latin-1']
+                for encoding in encodings:
+                    try:
+                        with open_data_stream(file_path) as stream:
+                            df = pd.read_csv(stream, encoding=encoding, sep=read_options['sep'],
+                                             usecols=usecols, low_memory=False)
+                        break
+                    except UnicodeDecodeError:
+                        continue
         else:
-            df = pd.read_excel(file_path, engine='openpyxl' if file_extension == 'xlsx' else 'xlrd')
+            with decompressed_copy(file_path, file_extension) as excel_path:
+                df = pd.read_excel(excel_path, engine='openpyxl' if file_extension == 'xlsx' else 'xlrd')
         
         return df
     except Exception as e:
         raise Exception(f"Error loading file: {str(e)}")
 
+def profile_data(file_path, file_extension, chunksize=100_000):
+    """Profile a CSV file in chunks without loading the whole table into memory"""
+    if file_extension != 'csv':
+        raise Exception("Streaming profiling is only supported for CSV files")
+    
+    try:
+        read_options = sniff_csv(file_path)
+        try:
+            with open_data_stream(file_path) as stream:
+                return profile_csv(stream, chunksize=chunksize, read_options=read_options)
+        except ValueError as e:
+            # A later chunk did not match the sampled dtypes - profile with inferred types
+            print(f"Typed CSV profile failed ({str(e)}), retrying without dtype hints")
+            with open_data_stream(file_path) as stream:
+                return profile_csv(stream, chunksize=chunksize,
+                                   read_options={'encoding': read_options['encoding'], 'sep': read_options['sep']})
+    except Exception as e:
+        raise Exception(f"Error profiling file: {str(e)}")
+
+def json_safe_frame(df):
+    """Render datetime columns as ISO strings (NaT as None) so rows can be serialized"""
+    datetime_cols = df.select_dtypes(include=['datetime', 'datetimetz']).columns
+    if len(datetime_cols) == 0:
+        return df
+    
+    df = df.copy()
+    for col in datetime_cols:
+        df[col] = df[col].dt.strftime('%Y-%m-%dT%H:%M:%S').astype(object).where(df[col].notna(), None)
+    return df
+
+def format_preview(df):
+    """Convert preview rows to the {column: {row_number: value}} layout used by the frontend"""
+    return json_safe_frame(df).reset_index(drop=True).to_dict()
+
 def get_data_info(df):
     """Get comprehensive data information"""
     info = {
@@ -136,48 +264,33 @@ def get_data_info(df):
         'categorical_columns': list(df.select_dtypes(include=['object', 'category']).columns),
         'datetime_columns': list(df.select_dtypes(include=['datetime64']).columns)
     }
-    return convert_numpy_types(info)
+    return info
 
-def get_descriptive_stats(df):
-    """Get descriptive statistics for numerical columns"""
+def get_categorical_stats(df, cardinality=CARDINALITY_EXACT, hll_precision=14, top_values=None, top_k=10,
+                          executor=None):
+    """Get statistics for categorical columns (distinct counts exact or HyperLogLog estimates)"""
     try:
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        if len(numeric_cols) == 0:
-            return {}
-        
-        stats = df[numeric_cols].describe()
-        
-        # Convert to dictionary and handle NaN values
-        stats_dict = {}
-        for col in numeric_cols:
-            col_stats = {}
-            for metric in ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']:
-                value = stats.loc[metric, col]
-                if pd.isna(value):
-                    col_stats[metric] = 0 if metric == 'count' else 'N/A'
-                else:
-                    if metric == 'count':
-                        col_stats[metric] = int(value)
-                    else:
-                        col_stats[metric] = float(value)
-            stats_dict[col] = col_stats
-        
-        return stats_dict
-    except Exception as e:
-        print(f"Error in get_descriptive_stats: {e}")
-        return {}
-
-def get_categorical_stats(df):
-    """Get statistics for categorical columns"""
-    try:
-        categorical_cols = df.select_dtypes(include=['object', 'string']).columns
+        categorical_cols = df.select_dtypes(include=['object', 'string', 'category']).columns
+        # Most frequent values come from bounded heavy-hitter counters
+        top_values = top_values if top_values is not None else profile_top_values(df)
+        # Distinct values hash every value; wide tables run them in batches
+        if executor is not None:
+            distinct_stats = executor.map('categorical_stats', distinct_values, df, categorical_cols,
+                                          cardinality, hll_precision)
+        else:
+            distinct_stats = distinct_values(df, categorical_cols, cardinality, hll_precision)
+        counts = df[categorical_cols].count()
         stats = {}
         
         for col in categorical_cols:
             col_stats = {}
-            col_stats['count'] = int(df[col].count())
-            col_stats['unique_count'] = int(df[col].nunique())
-            col_stats['missing_count'] = int(df[col].isnull().sum())
+            col_stats['count'] = int(counts[col])
+            distinct = distinct_stats[col]['distinct']
+            col_stats['unique_count'] = distinct['count']
+            if distinct['approximate']:
+                col_stats['unique_count_approximate'] = True
+                col_stats['unique_count_error'] = distinct['relative_error']
+            col_stats['missing_count'] = len(df) - col_stats['count']
             
             # Calculate missing percentage safely
             total_count = len(df)
@@ -187,9 +300,13 @@ def get_categorical_stats(df):
             else:
                 col_stats['missing_percentage'] = 0
             
-            # Get unique values (limit to first 20)
-            unique_vals = df[col].dropna().unique()
-            col_stats['unique_values'] = unique_vals[:20].tolist()
+            # Get unique values (limit to first 20, without hashing the whole column)
+            col_stats['unique_values'] = distinct_stats[col]['unique_values']
+            
+            # Most frequent values, the rest rolled into other_count
+            col_stats['top_values'] = top_values_summary(top_values[col], top_k)
+            top = col_stats['top_values']['values']
+            col_stats['most_common'] = top[0]['value'] if top else None
             
             stats[col] = col_stats
         
@@ -198,122 +315,11 @@ def get_categorical_stats(df):
         print(f"Error in get_categorical_stats: {e}")
         return {}
 
-def detect_outliers(df):
-    """Detect outliers using IQR method"""
+def run_normality_tests(df, profile=None, sample_size=5000, seed=0, executor=None):
+    """Run normality tests on numerical columns (test chosen by column size, large columns sampled)"""
     try:
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        outliers_data = {}
-        
-        for col in numeric_cols:
-            try:
-                # Remove NaN values for calculation
-                clean_data = df[col].dropna()
-                if len(clean_data) < 4:  # Need at least 4 values for quartiles
-                    outliers_data[col] = {
-                        'count': 0,
-                        'method': 'IQR',
-                        'q1': 'N/A',
-                        'q3': 'N/A',
-                        'iqr': 'N/A',
-                        'lower_bound': 'N/A',
-                        'upper_bound': 'N/A',
-                        'outlier_percentage': 0
-                    }
-                    continue
-                
-                Q1 = float(clean_data.quantile(0.25))
-                Q3 = float(clean_data.quantile(0.75))
-                IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                
-                # Count outliers
-                outlier_mask = (df[col] < lower_bound) | (df[col] > upper_bound)
-                outlier_count = int(outlier_mask.sum())
-                
-                # Calculate percentage safely
-                total_count = len(df[col])
-                if total_count > 0:
-                    outlier_percentage = (outlier_count / total_count) * 100
-                else:
-                    outlier_percentage = 0
-                
-                outliers_data[col] = {
-                    'count': outlier_count,
-                    'method': 'IQR',
-                    'q1': round(Q1, 3),
-                    'q3': round(Q3, 3),
-                    'iqr': round(IQR, 3),
-                    'lower_bound': round(lower_bound, 3),
-                    'upper_bound': round(upper_bound, 3),
-                    'outlier_percentage': round(outlier_percentage, 2)
-                }
-                
-            except Exception as e:
-                print(f"Error processing outliers for {col}: {e}")
-                outliers_data[col] = {
-                    'count': 0,
-                    'method': 'IQR',
-                    'error': str(e)
-                }
-        
-        return outliers_data
-    except Exception as e:
-        print(f"Error in detect_outliers: {e}")
-        return {}
-
-def run_normality_tests(df):
-    """Run normality tests on numerical columns"""
-    try:
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        normality_data = {}
-        
-        for col in numeric_cols:
-            try:
-                # Remove NaN values for normality test
-                clean_data = df[col].dropna()
-                if len(clean_data) < 3:
-                    normality_data[col] = {
-                        'skewness': 'N/A',
-                        'kurtosis': 'N/A',
-                        'shapiro_wilk_p': 'N/A',
-                        'assessment': 'Insufficient data'
-                    }
-                    continue
-                
-                # Calculate skewness and kurtosis
-                skewness = float(clean_data.skew())
-                kurtosis = float(clean_data.kurtosis())
-                
-                # Shapiro-Wilk test
-                try:
-                    shapiro_stat, shapiro_p = stats.shapiro(clean_data)
-                    shapiro_p = float(shapiro_p)
-                except:
-                    shapiro_p = 'N/A'
-                
-                # Normality assessment
-                if shapiro_p != 'N/A' and shapiro_p > 0.05:
-                    assessment = 'Normal'
-                elif abs(skewness) > 1 or abs(kurtosis) > 2:
-                    assessment = 'Non-Normal'
-                elif abs(skewness) > 0.5 or abs(kurtosis) > 1:
-                    assessment = 'Moderately Skewed'
-                else:
-                    assessment = 'Approximately Normal'
-                
-                normality_data[col] = {
-                    'skewness': round(skewness, 3),
-                    'kurtosis': round(kurtosis, 3),
-                    'shapiro_wilk_p': shapiro_p if shapiro_p == 'N/A' else round(shapiro_p, 6),
-                    'assessment': assessment
-                }
-                
-            except Exception as e:
-                print(f"Error processing normality test for {col}: {e}")
-                normality_data[col] = {'error': str(e)}
-        
-        return normality_data
+        # Skewness, kurtosis and the moment-based tests come from the shared numeric profile
+        return normality_tests(df, profile, sample_size, seed, executor)
     except Exception as e:
         print(f"Error in run_normality_tests: {e}")
         return {}
@@ -327,18 +333,8 @@ def get_correlations(df):
         
         corr_matrix = df[numeric_cols].corr()
         
-        # Convert to dictionary and handle NaN values
-        correlations = {}
-        for col1 in numeric_cols:
-            correlations[col1] = {}
-            for col2 in numeric_cols:
-                value = corr_matrix.loc[col1, col2]
-                if pd.isna(value):
-                    correlations[col1][col2] = 0.0
-                else:
-                    correlations[col1][col2] = round(float(value), 3)
-        
-        return correlations
+        # Undefined correlations (e.g. constant columns) are reported as 0
+        return corr_matrix.fillna(0.0).round(3).to_dict()
     except Exception as e:
         print(f"Error in get_correlations: {e}")
         return {}
@@ -390,12 +386,13 @@ def create_correlation_heatmap(df):
     )
     return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
 
-def create_bar_chart(df, column):
-    """Create bar chart for categorical column"""
-    value_counts = df[column].value_counts().head(20)  # Limit to top 20
+def create_bar_chart(df, column, hitters=None):
+    """Create bar chart for categorical column (top 20 values plus an 'Other' bar)"""
+    hitters = hitters if hitters is not None else column_heavy_hitters(df[column])
+    labels, counts = bar_chart_counts(hitters, 20)
     fig = px.bar(
-        x=value_counts.index,
-        y=value_counts.values,
+        x=[str(label) for label in labels],
+        y=counts,
         title=f'Value Counts for {column}'
     )
     fig.update_layout(
@@ -409,6 +406,41 @@ def create_bar_chart(df, column):
 def index():
     return render_template('index.html')
 
+def store_uploaded_file(file_path, file_extension):
+    """Load an uploaded file into the session"""
+    df = load_data(file_path, file_extension)
+    
+    # Store the full DataFrame in session
+    session['data'] = json_safe_frame(df).to_dict('records')
+    # Identifies this upload in ETags; analysis responses only change when the data does
+    session['data_version'] = uuid.uuid4().hex
+    
+    # Rows are paged through /rows, so the response size does not grow with the dataset
+    return {
+        'success': True,
+        'message': 'File uploaded successfully',
+        'data_info': get_data_info(df),
+        'preview_head': format_preview(df.head(10)),
+        'preview_tail': format_preview(df.tail(10)),
+        'rows_url': '/rows'
+    }
+
+def build_profile_response(profile):
+    """Response body for a streaming profile"""
+    return {
+        'success': True,
+        'mode': 'streaming',
+        'message': f'Profiled {profile.rows} rows in streaming mode',
+        'data_info': profile.data_info(),
+        'descriptive_stats': profile.descriptive_stats(),
+        'numerical_analysis': profile.numerical_analysis(),
+        'outlier_bounds': profile.outlier_bounds(),
+        'categorical_stats': profile.categorical_stats(),
+        'datetime_stats': profile.datetime_stats(),
+        'preview_head': format_preview(profile.head) if profile.head is not None else {},
+        'preview_tail': format_preview(profile.tail) if profile.tail is not None else {}
+    }
+
 @app.route('/upload', methods=['POST'])
 def upload_file():
     try:
@@ -420,47 +452,13 @@ def upload_file():
             return jsonify({'error': 'No file selected'}), 400
         
         if file and allowed_file(file.filename):
-            # Read the file
-            if file.filename.endswith('.csv'):
-                df = pd.read_csv(file)
-            elif file.filename.endswith(('.xlsx', '.xls')):
-                df = pd.read_excel(file)
-            else:
-                return jsonify({'error': 'Unsupported file format'}), 400
-            
-            # Store the full DataFrame in session
-            session['data'] = df.to_dict('records')
-            session['full_data'] = df.to_dict('records')
-            
-            # Generate data info
-            data_info = get_data_info(df)
-            
-            # Generate preview data (head and tail) for display
-            preview_head = df.head(10).to_dict('records')
-            preview_tail = df.tail(10).to_dict('records')
-            
-            # Convert preview data to the expected format
-            preview_head_formatted = {}
-            preview_tail_formatted = {}
-            
-            for col in df.columns:
-                preview_head_formatted[col] = {}
-                preview_tail_formatted[col] = {}
-                
-                for i, row in enumerate(preview_head):
-                    preview_head_formatted[col][i] = row[col]
-                
-                for i, row in enumerate(preview_tail):
-                    preview_tail_formatted[col][i] = row[col]
-            
-            response_data = {
-                'success': True,
-                'message': 'File uploaded successfully',
-                'data_info': data_info,
-                'preview_head': preview_head_formatted,
-                'preview_tail': preview_tail_formatted,
-                'full_data': df.to_dict('records')
-            }
+            # Spool the upload to /tmp (still compressed) and read it with the typed loader
+            file_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{uuid.uuid4().hex}_{secure_filename(file.filename)}")
+            file.save(file_path)
+            try:
+                response_data = store_uploaded_file(file_path, data_extension(file_path))
+            finally:
+                os.remove(file_path)
             
             return jsonify(response_data)
         else:
@@ -470,65 +468,251 @@ def upload_file():
         print(f"Upload error: {str(e)}")
         return jsonify({'error': f'Upload failed: {str(e)}'}), 500
 
+@app.route('/upload/init', methods=['POST'])
+def chunked_upload_init():
+    """Start a resumable chunked upload"""
+    try:
+        data = request.get_json() or {}
+        filename = data.get('filename', '')
+        if not allowed_file(filename):
+            return jsonify({'error': 'File type not allowed'}), 400
+        # Chunked uploads end in a streaming profile, which reads CSV (zip archives are checked at finalize)
+        extension, compression = split_extension(filename)
+        if extension != 'csv' and compression != 'zip':
+            return jsonify({'error': 'Files over the upload limit must be CSV (they are profiled in streaming mode)'}), 400
+        
+        status = chunked_uploads.init(
+            filename,
+            total_size=int(data.get('total_size', 0)),
+            chunk_size=int(data.get('chunk_size', app.config['CHUNK_SIZE_BYTES'])),
+            incremental_profile=bool(data.get('incremental_profile', True))
+        )
+        return jsonify({'success': True, **status})
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        print(f"Chunked upload init error: {str(e)}")
+        return jsonify({'error': f'Upload failed: {str(e)}'}), 500
+
+@app.route('/upload/<upload_id>', methods=['GET'])
+def chunked_upload_status(upload_id):
+    """Report received and missing chunks so the client can resume"""
+    try:
+        return jsonify({'success': True, **chunked_uploads.status(upload_id)})
+    except (KeyError, ValueError):
+        return jsonify({'error': 'Upload not found'}), 404
+
+@app.route('/upload/<upload_id>/chunk/<int:index>', methods=['PUT'])
+def chunked_upload_chunk(upload_id, index):
+    """Receive one chunk as the raw request body, with its SHA-256 in X-Chunk-SHA256"""
+    try:
+        status = chunked_uploads.write_chunk(
+            upload_id, index, request.get_data(cache=False),
+            checksum=request.headers.get('X-Chunk-SHA256')
+        )
+        return jsonify({'success': True, **status})
+    
+    except KeyError:
+        return jsonify({'error': 'Upload not found'}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        print(f"Chunk upload error: {str(e)}")
+        return jsonify({'error': f'Chunk upload failed: {str(e)}'}), 500
+
+@app.route('/upload/<upload_id>/finalize', methods=['POST'])
+def chunked_upload_finalize(upload_id):
+    """
+    Assemble a chunked upload and return its streaming profile
+
+    For CSV files the profile was built while the chunks arrived. Only mode
+    'profile' is offered on Lambda: a file that needed chunking cannot be
+    loaded into the session cookie, and there is no server-side dataset store.
+    """
+    try:
+        data = request.get_json() or {}
+        mode = data.get('mode', 'profile')
+        if mode != 'profile':
+            return jsonify({'error': 'Chunked uploads can only be profiled on Lambda (mode "profile")'}), 400
+        status = chunked_uploads.status(upload_id)
+        
+        file_path, profile = chunked_uploads.finalize(upload_id, checksum=data.get('sha256'))
+        try:
+            # The readers pick the format and compression from the name, so give the file its original one
+            named_path = f"{file_path}_{secure_filename(status['filename'])}"
+            os.replace(file_path, named_path)
+            file_extension = data_extension(named_path)
+            
+            if file_extension != 'csv':
+                return jsonify({'error': 'Streaming profile supports CSV files only'}), 400
+            if profile is None:
+                profile = profile_data(named_path, file_extension, chunksize=app.config['STREAMING_CHUNK_ROWS'])
+            response_data = build_profile_response(profile)
+        finally:
+            chunked_uploads.discard(upload_id)
+        
+        return jsonify(response_data)
+    
+    except KeyError:
+        return jsonify({'error': 'Upload not found'}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        print(f"Chunked upload finalize error: {str(e)}")
+        return jsonify({'error': f'Upload failed: {str(e)}'}), 500
+
+@app.route('/rows', methods=['POST'])
+def get_rows():
+    """One page of the session data, optionally filtered and sorted on the server"""
+    try:
+        if 'data' not in session:
+            return jsonify({'error': 'No data uploaded'}), 400
+        
+        df = pd.DataFrame(session['data'])
+        data = request.get_json() or {}
+        sort_by = data.get('sort_by')
+        descending = bool(data.get('descending', False))
+        
+        options = {
+            'offset': data.get('offset', 0),
+            'limit': data.get('limit', DEFAULT_PAGE_SIZE),
+            'filters': data.get('filters'),
+            'order': sort_order(df, sort_by, descending) if sort_by is not None else None,
+            'after': data.get('after')
+        }
+        
+        # Arrow clients get numeric columns as raw buffers, with the paging fields in the schema metadata
+        if negotiate_format(data.get('format'), request.headers.get('Accept'), (FORMAT_JSON, FORMAT_ARROW)) == FORMAT_ARROW:
+            positions, page_info = page_positions(df, **options)
+            metadata = {**page_info, 'sort_by': sort_by, 'descending': descending, 'row_numbers': positions.tolist()}
+            return Response(frame_to_arrow_ipc(df.iloc[positions], metadata), mimetype=ARROW_MIME_TYPE)
+        
+        page = query_rows(df, **options)
+        return jsonify({'success': True, 'sort_by': sort_by, 'descending': descending, **page})
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        print(f"Rows error: {str(e)}")
+        return jsonify({'error': f'Failed to load rows: {str(e)}'}), 500
+
+@app.route('/profile', methods=['POST'])
+def profile_file():
+    """Profile a large CSV chunk by chunk without loading it into memory"""
+    try:
+        if 'file' not in request.files:
+            return jsonify({'error': 'No file uploaded'}), 400
+        
+        file = request.files['file']
+        if file.filename == '':
+            return jsonify({'error': 'No file selected'}), 400
+        
+        if not allowed_file(file.filename):
+            return jsonify({'error': 'File type not allowed'}), 400
+        
+        # Spool the upload to disk so it can be read in chunks
+        file_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{uuid.uuid4().hex}_{secure_filename(file.filename)}")
+        file.save(file_path)
+        
+        try:
+            file_extension = data_extension(file_path)
+            if file_extension != 'csv':
+                return jsonify({'error': 'Streaming profile supports CSV files only'}), 400
+            profile = profile_data(file_path, file_extension, chunksize=app.config['STREAMING_CHUNK_ROWS'])
+        finally:
+            os.remove(file_path)
+        
+        return jsonify(build_profile_response(profile))
+        
+    except Exception as e:
+        print(f"Profile error: {str(e)}")
+        return jsonify({'error': f'Profile failed: {str(e)}'}), 500
+
 @app.route('/analyze', methods=['POST'])
 def analyze_data():
     try:
         if 'data' not in session:
             return jsonify({'error': 'No data available for analysis'}), 400
         
+        # 'cardinality': 'exact' or 'approx' overrides CARDINALITY_MODE for the distinct counts
+        requested_cardinality = (request.get_json(silent=True) or {}).get('cardinality')
+        etag = make_etag('analyze', session.get('data_version'), app.config['QUANTILE_MODE'], app.config['QUANTILE_SKETCH_K'],
+                         app.config['CARDINALITY_MODE'], app.config['HLL_PRECISION'],
+                         app.config['TOP_VALUES_CAPACITY'], app.config['TOP_VALUES_K'],
+                         app.config['NORMALITY_SAMPLE_SIZE'], app.config['NORMALITY_SEED'], requested_cardinality)
+        if etag_matches(request.if_none_match, etag) and session.get('analysis_etag') == etag:
+            return not_modified(etag)
+        
         data = session['data']
         df = pd.DataFrame(data)
         
+        try:
+            cardinality = cardinality_mode(len(df), requested_cardinality)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         # Convert boolean columns to string to avoid JSON serialization issues
         for col in df.columns:
             if df[col].dtype == 'bool':
                 df[col] = df[col].astype(str)
         
-        # Get all the analysis results
-        analysis_results = {}
-        
-        # Basic statistics
-        analysis_results['basic_stats'] = get_descriptive_stats(df)
-        
-        # Data types
-        analysis_results['dtypes'] = {col: str(dtype) for col, dtype in df.dtypes.items()}
-        
-        # Missing values
-        analysis_results['missing_values'] = df.isnull().sum().to_dict()
-        
-        # Numerical analysis
-        numerical_cols = df.select_dtypes(include=[np.number]).columns
-        analysis_results['numerical_analysis'] = {}
-        for col in numerical_cols:
-            analysis_results['numerical_analysis'][col] = {
-                'skewness': float(df[col].skew()) if len(df[col].dropna()) > 0 else 0,
-                'kurtosis': float(df[col].kurtosis()) if len(df[col].dropna()) > 0 else 0
+        # Batch timings of the per-column work are reported with the results
+        with track_batches() as batch_timings:
+            # Get all the analysis results
+            analysis_results = {}
+            
+            # One pass over the numeric columns feeds the statistics, skew/kurtosis,
+            # outlier and normality sections
+            profile = numeric_profile(df)
+            
+            # Basic statistics
+            analysis_results['basic_stats'] = profile.descriptive_stats()
+            
+            # Data types
+            analysis_results['dtypes'] = {col: str(dtype) for col, dtype in df.dtypes.items()}
+            
+            # Missing values
+            analysis_results['missing_values'] = df.isnull().sum().to_dict()
+            
+            # Numerical analysis
+            analysis_results['numerical_analysis'] = profile.numerical_analysis()
+            
+            # Outliers
+            analysis_results['outliers'] = profile.outliers()
+            
+            # Normality tests
+            analysis_results['normality_tests'] = run_normality_tests(df, profile, app.config['NORMALITY_SAMPLE_SIZE'],
+                                                                      app.config['NORMALITY_SEED'], column_executor)
+            
+            # Correlations
+            analysis_results['correlation'] = get_correlations(df)
+            
+            # Unique values
+            categorical_cols = df.select_dtypes(include=['object', 'string', 'category']).columns
+            distinct_stats = column_executor.map('unique_values', distinct_values, df, categorical_cols,
+                                                 cardinality, app.config['HLL_PRECISION'])
+            analysis_results['unique_values'] = {col: distinct_stats[col]['unique_values'] for col in categorical_cols}
+            analysis_results['unique_counts'] = {col: distinct_stats[col]['distinct'] for col in categorical_cols}
+            
+            # Most frequent values per categorical column (also the LLM prompt's categorical summary)
+            analysis_results['top_values'] = {
+                col: top_values_summary(column_heavy_hitters(df[col], app.config['TOP_VALUES_CAPACITY']),
+                                        app.config['TOP_VALUES_K'])
+                for col in analysis_results['unique_values']
             }
         
-        # Outliers
-        analysis_results['outliers'] = detect_outliers(df)
-        
-        # Normality tests
-        analysis_results['normality_tests'] = run_normality_tests(df)
-        
-        # Correlations
-        analysis_results['correlation'] = get_correlations(df)
-        
-        # Unique values
-        analysis_results['unique_values'] = {}
-        for col in df.columns:
-            if df[col].dtype == 'object' or df[col].dtype == 'string':
-                unique_vals = df[col].dropna().unique()
-                analysis_results['unique_values'][col] = unique_vals[:20].tolist()
-        
         # Preview data
-        analysis_results['preview_head'] = df.head(10).to_dict('records')
-        analysis_results['preview_tail'] = df.tail(10).to_dict('records')
+        analysis_results['preview_head'] = json_safe_frame(df.head(10)).to_dict('records')
+        analysis_results['preview_tail'] = json_safe_frame(df.tail(10)).to_dict('records')
         
         # Store the complete analysis results in session
         session['analysis_results'] = analysis_results
+        session['analysis_etag'] = etag
         
-        return jsonify(analysis_results)
+        # Worker count and batch timings describe this run only, so they stay out of the session
+        execution = {**column_executor.info(), 'batches': batch_timings}
+        return with_etag(jsonify({**analysis_results, 'execution': execution}), etag)
         
     except Exception as e:
         print(f"Error in analyze_data: {e}")
@@ -542,23 +726,31 @@ def visualize_data():
         if 'data' not in session:
             return jsonify({'error': 'No data available for visualization'}), 400
         
-        data = session['data']
-        df = pd.DataFrame(data)
-        
         request_data = request.get_json()
         chart_type = request_data.get('chart_type')
         columns = request_data.get('columns', [])
         
         print(f'Visualization request: {chart_type} with columns {columns}')
-        print(f'DataFrame shape: {df.shape}')
         
         if not chart_type:
             return jsonify({'error': 'Chart type not specified'}), 400
         
+        # 'bdata' sends numeric trace data as base64 typed arrays instead of JSON number lists
+        data_format = negotiate_format(request_data.get('format'), None, (FORMAT_JSON, FORMAT_BDATA))
+        
+        etag = make_etag('visualize', session.get('data_version'), app.config['QUANTILE_MODE'],
+                         app.config['QUANTILE_SKETCH_K'], app.config['TOP_VALUES_CAPACITY'],
+                         app.config['BAR_CHART_TOP_K'], chart_type, columns, data_format)
+        if etag_matches(request.if_none_match, etag) and session.get('data_version'):
+            return not_modified(etag)
+        
+        df = pd.DataFrame(session['data'])
+        print(f'DataFrame shape: {df.shape}')
+        
         # Create chart data based on type using FULL dataset
         if chart_type == 'histogram':
             plot_data = {
-                'x': df[columns[0]].tolist(),
+                'x': df[columns[0]],
                 'type': 'histogram',
                 'name': columns[0],
                 'marker': {'color': '#f59e0b'},
@@ -571,22 +763,44 @@ def visualize_data():
             }
             
         elif chart_type == 'boxplot':
-            plot_data = {
-                'y': df[columns[0]].tolist(),
-                'type': 'box',
-                'name': columns[0],
-                'marker': {'color': '#f59e0b'},
-                'boxpoints': 'outliers'
-            }
-            layout = {
-                'title': f'Box Plot: {columns[0]} ({len(df)} data points)',
-                'yaxis': {'title': columns[0]}
-            }
+            profile = numeric_profile(df)
+            if profile.quantile_mode == QUANTILE_APPROX and columns[0] in profile.sketches:
+                # Quartiles from the column's quantile sketch and Tukey whiskers, instead of
+                # sending every value for the browser to sort
+                box = profile.box_stats(columns[0], df[columns[0]])
+                plot_data = {
+                    'x': [columns[0]],
+                    'q1': [box['q1']],
+                    'median': [box['median']],
+                    'q3': [box['q3']],
+                    'lowerfence': [box['lowerfence']],
+                    'upperfence': [box['upperfence']],
+                    'mean': [box['mean']],
+                    'type': 'box',
+                    'name': columns[0],
+                    'marker': {'color': '#f59e0b'}
+                }
+                layout = {
+                    'title': f"Box Plot: {columns[0]} ({len(df)} data points, {box['outliers']} outliers, approximate quartiles)",
+                    'yaxis': {'title': columns[0]}
+                }
+            else:
+                plot_data = {
+                    'y': df[columns[0]],
+                    'type': 'box',
+                    'name': columns[0],
+                    'marker': {'color': '#f59e0b'},
+                    'boxpoints': 'outliers'
+                }
+                layout = {
+                    'title': f'Box Plot: {columns[0]} ({len(df)} data points)',
+                    'yaxis': {'title': columns[0]}
+                }
             
         elif chart_type == 'scatter':
             plot_data = {
-                'x': df[columns[0]].tolist(),
-                'y': df[columns[1]].tolist(),
+                'x': df[columns[0]],
+                'y': df[columns[1]],
                 'type': 'scatter',
                 'mode': 'markers',
                 'name': f'{columns[0]} vs {columns[1]}',
@@ -607,7 +821,7 @@ def visualize_data():
             corr_matrix = df[df.select_dtypes(include=[np.number]).columns].corr()
             x_labels = corr_matrix.columns.tolist()
             y_labels = corr_matrix.columns.tolist()
-            z_values = corr_matrix.values.tolist()
+            z_values = corr_matrix.to_numpy()
             
             plot_data = {
                 'z': z_values,
@@ -622,17 +836,20 @@ def visualize_data():
             }
             
         elif chart_type == 'bar':
-            # Count occurrences for categorical data
-            value_counts = df[columns[0]].value_counts().to_dict()
+            # The most frequent values and one 'Other' bar, from a bounded heavy-hitter
+            # counter, instead of a bar for every distinct value
+            hitters = column_heavy_hitters(df[columns[0]], app.config['TOP_VALUES_CAPACITY'])
+            labels, counts = bar_chart_counts(hitters, app.config['BAR_CHART_TOP_K'])
             plot_data = {
-                'x': list(value_counts.keys()),
-                'y': list(value_counts.values()),
+                'x': labels,
+                'y': np.array(counts),
                 'type': 'bar',
                 'marker': {'color': '#f59e0b'}
             }
+            approximate = ' - approximate counts' if hitters.floor else ''
             layout = {
-                'title': f'Bar Chart: {columns[0]} ({len(df)} data points)',
-                'xaxis': {'title': columns[0]},
+                'title': f'Bar Chart: {columns[0]} ({len(df)} data points{approximate})',
+                'xaxis': {'title': columns[0], 'type': 'category'},
                 'yaxis': {'title': 'Count'}
             }
         
@@ -651,13 +868,11 @@ def visualize_data():
         if 'yaxis' in layout:
             layout['yaxis'].update({'gridcolor': '#334155', 'color': '#cbd5e1'})
         
-        return jsonify({
+        return with_etag(jsonify({
             'success': True,
-            'chart_data': {
-                'data': [plot_data],
-                'layout': layout
-            }
-        })
+            'format': data_format,
+            'chart_data': encode_figure({'data': [plot_data], 'layout': layout}, data_format)
+        }), etag)
         
     except Exception as e:
         print(f"Visualization error: {str(e)}")
@@ -696,10 +911,8 @@ def get_cleaning_recommendations():
         analysis_results = session['analysis_results']
         print(f"Analysis results keys: {list(analysis_results.keys())}")
         
-        # Convert the analysis results to JSON-serializable format
-        print("Converting analysis results to JSON-serializable format...")
-        serializable_results = convert_numpy_types(analysis_results)
-        print("✓ Conversion completed")
+        # Convert the analysis results to plain Python types for the prompt builder
+        serializable_results = to_builtin(analysis_results)
         
         # Call Gemini service with existing results
         try:
@@ -0,0 +1,321 @@
+import io
+import os
+import json
+import time
+import uuid
+import shutil
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from services.csv_sniffer import DEFAULT_SAMPLE_BYTES, sniff_csv_sample
+from services.streaming_profiler import StreamingProfiler
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class ChunkedUploadStore:
+    """
+    Resumable chunked uploads: init, upload chunk N (in any order, retries allowed), finalize
+
+    Each upload lives in its own directory holding the manifest written at
+    init, the data file that chunks are written into at their offsets, and
+    one receipt file per verified chunk (its SHA-256). The receipts make the
+    upload resumable - a client asks for the status and re-sends only the
+    missing chunks - and let concurrent chunk requests proceed without
+    rewriting a shared manifest.
+
+    CSV uploads are also profiled incrementally: whenever the chunks received
+    so far form a longer contiguous prefix of the file, the newly completed
+    rows are fed to a StreamingProfiler, so profiling is nearly done when the
+    last chunk lands. This state is kept in process memory; if it is missing
+    at finalize (another worker, a restart) the caller profiles the file instead.
+    """
+
+    def __init__(self, upload_dir: str, max_upload_bytes: int, max_chunk_bytes: int,
+                 max_age_seconds: Optional[int] = None):
+        """
+        Initialize the upload store
+
+        Args:
+            upload_dir: Directory where in-progress uploads are kept
+            max_upload_bytes: Largest total file size accepted at init
+            max_chunk_bytes: Largest chunk size accepted at init
+            max_age_seconds: Unfinished uploads not touched for this long are removed
+        """
+        self.upload_dir = upload_dir
+        self.max_upload_bytes = max_upload_bytes
+        self.max_chunk_bytes = max_chunk_bytes
+        self.max_age_seconds = max_age_seconds
+        os.makedirs(self.upload_dir, exist_ok=True)
+
+        # upload_id -> _IncrementalCsvProfile for uploads handled by this process
+        self._profiles: Dict[str, _IncrementalCsvProfile] = {}
+        self._lock = threading.Lock()
+
+    def init(self, filename: str, total_size: int, chunk_size: int,
+             incremental_profile: bool = True) -> Dict[str, Any]:
+        """
+        Start a new upload
+
+        Args:
+            filename: Original file name (used for the extension only)
+            total_size: Size of the complete file in bytes
+            chunk_size: Size of every chunk except possibly the last
+            incremental_profile: Profile CSV rows as chunks arrive
+
+        Returns:
+            Upload status (see status())
+        """
+        if total_size <= 0 or total_size > self.max_upload_bytes:
+            raise ValueError(f"File size must be between 1 byte and {self.max_upload_bytes} bytes")
+        if chunk_size <= 0 or chunk_size > self.max_chunk_bytes:
+            raise ValueError(f"Chunk size must be between 1 byte and {self.max_chunk_bytes} bytes")
+
+        self.purge_expired()
+        upload_id = uuid.uuid4().hex
+        upload_path = self._path(upload_id)
+        os.makedirs(os.path.join(upload_path, 'received'))
+
+        manifest = {
+            'upload_id': upload_id,
+            'filename': filename,
+            'total_size': total_size,
+            'chunk_size': chunk_size,
+            'total_chunks': -(-total_size // chunk_size),
+            'created_at': time.time()
+        }
+        with open(os.path.join(upload_path, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f)
+        # Create the data file up front so chunks can be written at their offsets
+        open(os.path.join(upload_path, 'data.part'), 'wb').close()
+
+        if incremental_profile and filename.lower().endswith('.csv'):
+            with self._lock:
+                self._profiles[upload_id] = _IncrementalCsvProfile()
+
+        logger.info(f"Started chunked upload {upload_id} ({total_size} bytes in {manifest['total_chunks']} chunks)")
+        return self.status(upload_id)
+
+    def write_chunk(self, upload_id: str, index: int, data: bytes,
+                    checksum: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Write one chunk at its offset, verifying its size and SHA-256
+
+        Args:
+            upload_id: ID returned by init()
+            index: Zero-based chunk number
+            data: Chunk bytes
+            checksum: Hex SHA-256 of the chunk as computed by the client
+
+        Returns:
+            Upload status (see status())
+        """
+        manifest = self._manifest(upload_id)
+        if not 0 <= index < manifest['total_chunks']:
+            raise ValueError(f"Chunk index must be between 0 and {manifest['total_chunks'] - 1}")
+
+        offset = index * manifest['chunk_size']
+        expected_size = min(manifest['chunk_size'], manifest['total_size'] - offset)
+        if len(data) != expected_size:
+            raise ValueError(f"Chunk {index} must be {expected_size} bytes, got {len(data)}")
+
+        digest = hashlib.sha256(data).hexdigest()
+        if checksum and checksum.lower() != digest:
+            raise ValueError(f"Checksum mismatch for chunk {index}")
+
+        upload_path = self._path(upload_id)
+        with open(os.path.join(upload_path, 'data.part'), 'r+b') as f:
+            f.seek(offset)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # The receipt is written last, so a chunk only counts once its bytes are on disk
+        receipt = os.path.join(upload_path, 'received', str(index))
+        with open(f"{receipt}.tmp", 'w') as f:
+            f.write(digest)
+        os.replace(f"{receipt}.tmp", receipt)
+
+        self._profile_prefix(upload_id, manifest)
+        return self.status(upload_id)
+
+    def status(self, upload_id: str) -> Dict[str, Any]:
+        """
+        Report which chunks have been received so a client can resume
+
+        Returns:
+            Dictionary with the manifest fields, received and missing chunk
+            indexes, the length of the contiguous received prefix, and how
+            many bytes have been profiled so far
+        """
+        manifest = self._manifest(upload_id)
+        received = self._received(upload_id)
+        received_set = set(received)
+
+        contiguous_chunks = 0
+        while contiguous_chunks in received_set:
+            contiguous_chunks += 1
+
+        with self._lock:
+            profile = self._profiles.get(upload_id)
+        return {
+            **manifest,
+            'received_chunks': received,
+            'missing_chunks': [i for i in range(manifest['total_chunks']) if i not in received_set],
+            'contiguous_bytes': min(contiguous_chunks * manifest['chunk_size'], manifest['total_size']),
+            'profiled_bytes': profile.parsed_offset if profile and not profile.failed else 0
+        }
+
+    def finalize(self, upload_id: str, checksum: Optional[str] = None) -> Tuple[str, Optional[StreamingProfiler]]:
+        """
+        Check that every chunk arrived and hand over the assembled file
+
+        Args:
+            upload_id: ID returned by init()
+            checksum: Optional hex SHA-256 of the whole file
+
+        Returns:
+            Tuple of (path of the assembled file, incremental profile or None
+            if it is unavailable). The caller owns the file and should call
+            discard() when done with it.
+        """
+        status = self.status(upload_id)
+        if status['missing_chunks']:
+            missing = status['missing_chunks']
+            raise ValueError(f"Upload incomplete, {len(missing)} chunks missing (first: {missing[0]})")
+
+        file_path = os.path.join(self._path(upload_id), 'data.part')
+        if checksum:
+            digest = hashlib.sha256()
+            with open(file_path, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(block)
+            if checksum.lower() != digest.hexdigest():
+                raise ValueError("Checksum mismatch for the assembled file")
+
+        with self._lock:
+            profile = self._profiles.pop(upload_id, None)
+        profiler = None
+        if profile is not None and not profile.failed and profile.parsed_offset == status['total_size']:
+            profiler = profile.profiler
+        return file_path, profiler
+
+    def discard(self, upload_id: str) -> None:
+        """Remove an upload and its data"""
+        with self._lock:
+            self._profiles.pop(upload_id, None)
+        shutil.rmtree(self._path(upload_id), ignore_errors=True)
+
+    def purge_expired(self) -> int:
+        """Remove uploads that have not received a chunk within max_age_seconds"""
+        if not self.max_age_seconds:
+            return 0
+
+        cutoff = time.time() - self.max_age_seconds
+        removed = 0
+        for name in os.listdir(self.upload_dir):
+            path = os.path.join(self.upload_dir, name)
+            try:
+                if os.path.getmtime(os.path.join(path, 'received')) < cutoff:
+                    self.discard(name)
+                    removed += 1
+            except (OSError, ValueError):
+                continue
+
+        if removed:
+            logger.info(f"Purged {removed} expired chunked uploads")
+        return removed
+
+    def _path(self, upload_id: str) -> str:
+        """Get the directory for an upload ID"""
+        # Upload IDs are generated by the store; reject anything that could escape the directory
+        if not upload_id or not upload_id.isalnum():
+            raise ValueError(f"Invalid upload ID: {upload_id!r}")
+        return os.path.join(self.upload_dir, upload_id)
+
+    def _manifest(self, upload_id: str) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(self._path(upload_id), 'manifest.json')) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise KeyError(f"Upload {upload_id} not found")
+
+    def _received(self, upload_id: str) -> List[int]:
+        names = os.listdir(os.path.join(self._path(upload_id), 'received'))
+        return sorted(int(name) for name in names if name.isdigit())
+
+    def _profile_prefix(self, upload_id: str, manifest: Dict[str, Any]) -> None:
+        """Feed newly completed rows of the contiguous prefix to the incremental profile"""
+        with self._lock:
+            profile = self._profiles.get(upload_id)
+        if profile is None:
+            return
+        contiguous_bytes = self.status(upload_id)['contiguous_bytes']
+
+        # One chunk request at a time may advance a given profile
+        with profile.lock:
+            if profile.failed or contiguous_bytes <= profile.parsed_offset:
+                return
+            file_path = os.path.join(self._path(upload_id), 'data.part')
+            try:
+                profile.advance(file_path, contiguous_bytes, contiguous_bytes == manifest['total_size'])
+            except Exception as e:
+                # Rows are profiled from the assembled file at finalize instead
+                logger.warning(f"Incremental profiling stopped for upload {upload_id}: {str(e)}")
+                profile.failed = True
+
+class _IncrementalCsvProfile:
+    """Streaming profile of the rows in a growing contiguous prefix of a CSV file"""
+
+    def __init__(self):
+        self.profiler = StreamingProfiler()
+        self.parsed_offset = 0
+        self.read_options: Optional[Dict[str, Any]] = None
+        self.columns: Optional[List[Any]] = None
+        self.failed = False
+        self.lock = threading.Lock()
+
+    def advance(self, file_path: str, end: int, final: bool) -> None:
+        """Profile complete rows between parsed_offset and end"""
+        with open(file_path, 'rb') as f:
+            if self.read_options is None:
+                # Wait for a full sample (or the whole file) before sniffing the dialect
+                if end < DEFAULT_SAMPLE_BYTES and not final:
+                    return
+                options = sniff_csv_sample(f.read(min(end, DEFAULT_SAMPLE_BYTES)), truncated=not final)
+                if options['encoding'].startswith('utf-16'):
+                    raise ValueError("UTF-16 files cannot be split on newline bytes")
+                # Sampled dtypes keep every block parsed the same way (row hashes depend on them)
+                self.read_options = options
+
+            f.seek(self.parsed_offset)
+            block = f.read(end - self.parsed_offset)
+
+        cut = len(block) if final else block.rfind(b'\n') + 1
+        quote = self.read_options['quotechar'].encode(self._encoding())
+        # An odd number of quotes means the last newline sits inside a quoted field - wait for more data
+        while cut > 0 and block[:cut].count(quote) % 2 == 1:
+            cut = block.rfind(b'\n', 0, cut - 1) + 1
+        if cut == 0:
+            return
+
+        if self.columns is None:
+            chunk = pd.read_csv(io.BytesIO(block[:cut]), low_memory=False, **self.read_options)
+            self.columns = list(pd.read_csv(io.BytesIO(block[:cut]), nrows=0, encoding=self.read_options['encoding'],
+                                            sep=self.read_options['sep'], quotechar=self.read_options['quotechar'],
+                                            header=self.read_options['header']).columns)
+        else:
+            options = {**self.read_options, 'encoding': self._encoding(), 'header': None, 'names': self.columns}
+            chunk = pd.read_csv(io.BytesIO(block[:cut]), low_memory=False, **options)
+
+        self.profiler.update(chunk)
+        self.parsed_offset += cut
+
+    def _encoding(self) -> str:
+        # The byte order mark only precedes the first block
+        return 'utf-8' if self.read_options['encoding'] == 'utf-8-sig' else self.read_options['encoding']
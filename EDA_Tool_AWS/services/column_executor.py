@@ -0,0 +1,171 @@
+import os
+import time
+import logging
+import threading
+import contextvars
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Columns handled by one task; small enough to spread wide tables over every worker
+DEFAULT_BATCH_SIZE = 32
+
+# Below this many columns the work runs inline: pool overhead would outweigh the gain
+DEFAULT_MIN_PARALLEL_COLUMNS = 64
+
+# Where a batch ran
+WORKER_INLINE = 'inline'
+WORKER_THREAD = 'thread'
+WORKER_PROCESS = 'process'
+
+# Batch timings of the current request, see track_batches()
+_batch_timings = contextvars.ContextVar('batch_timings', default=None)
+
+@contextmanager
+def track_batches() -> Iterator[List[Dict[str, Any]]]:
+    """Collect the timings of every batch run (on any executor) inside the block"""
+    timings = []
+    token = _batch_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _batch_timings.reset(token)
+
+def column_batches(columns: Sequence[Any], batch_size: int) -> List[List[Any]]:
+    """Split columns into consecutive batches of at most batch_size"""
+    columns = list(columns)
+    return [columns[start:start + batch_size] for start in range(0, len(columns), batch_size)]
+
+class ColumnExecutor:
+    """
+    Runs per-column analysis functions over batches of columns in parallel
+
+    A batch function takes (df, columns, *args) and returns a dictionary keyed
+    by column; map() merges the batches back in column order. Batches run on
+    a thread pool by default, which suits NumPy/SciPy work that releases the
+    GIL. Work that holds the GIL (hashing and counting Python objects) runs on
+    a process pool when the data is stored as a Parquet file: each worker
+    reads just its batch of columns from that file, served from the shared OS
+    page cache, instead of having the frame pickled to it.
+
+    Batch functions must be defined at module level so worker processes can
+    import them. Hosts that cannot start processes (e.g. AWS Lambda) fall back
+    to threads.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                 min_parallel_columns: int = DEFAULT_MIN_PARALLEL_COLUMNS):
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.batch_size = max(1, batch_size)
+        self.min_parallel_columns = min_parallel_columns
+        self._threads = None
+        self._processes = None
+        self._processes_broken = False
+        self._lock = threading.Lock()
+
+    def map(self, name: str, func: Callable[..., Dict[Any, Any]], df: pd.DataFrame,
+            columns: Sequence[Any], *args: Any, source: Optional[str] = None) -> Dict[Any, Any]:
+        """
+        Run func over batches of columns and merge the results
+
+        Args:
+            name: Task name reported with the batch timings
+            func: Batch function called as func(df, batch_columns, *args)
+            df: DataFrame holding the columns
+            columns: Columns to process
+            *args: Extra arguments for func (pickled for worker processes)
+            source: Parquet file with the same data as df; enables worker processes
+
+        Returns:
+            Dictionary merging the results of every batch, in column order
+        """
+        columns = list(columns)
+        if not columns:
+            return {}
+        if self.max_workers == 1 or len(columns) < self.min_parallel_columns:
+            return self._collect(name, [_timed(func, df, columns, args, WORKER_INLINE)])
+
+        batches = column_batches(columns, self.batch_size)
+        if source is not None and all(isinstance(col, str) for col in columns):
+            pool = self._process_pool()
+            if pool is not None:
+                try:
+                    futures = [pool.submit(_timed_from_parquet, func, source, batch, args) for batch in batches]
+                    return self._collect(name, [future.result() for future in futures])
+                except (BrokenProcessPool, OSError) as e:
+                    logger.warning(f"Worker processes unavailable, using threads: {str(e)}")
+                    self._processes_broken = True
+                    self._processes = None
+
+        pool = self._thread_pool()
+        futures = [pool.submit(_timed, func, df, batch, args, WORKER_THREAD) for batch in batches]
+        return self._collect(name, [future.result() for future in futures])
+
+    def info(self) -> Dict[str, Any]:
+        """Worker count and batching settings, as reported alongside batch timings"""
+        return {
+            'workers': self.max_workers,
+            'batch_size': self.batch_size,
+            'min_parallel_columns': self.min_parallel_columns,
+            'processes': not self._processes_broken
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            for pool in (self._threads, self._processes):
+                if pool is not None:
+                    pool.shutdown(wait=False, cancel_futures=True)
+            self._threads = self._processes = None
+
+    def _collect(self, name: str, outcomes: List[tuple]) -> Dict[Any, Any]:
+        timings = _batch_timings.get()
+        merged = {}
+        for i, (result, seconds, worker, columns) in enumerate(outcomes):
+            merged.update(result)
+            if timings is not None:
+                timings.append({
+                    'task': name,
+                    'batch': i,
+                    'columns': columns,
+                    'seconds': round(seconds, 4),
+                    'worker': worker
+                })
+        return merged
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='columns')
+            return self._threads
+
+    def _process_pool(self) -> Optional[ProcessPoolExecutor]:
+        with self._lock:
+            if self._processes_broken:
+                return None
+            if self._processes is None:
+                try:
+                    self._processes = ProcessPoolExecutor(max_workers=self.max_workers)
+                except (OSError, NotImplementedError) as e:
+                    logger.warning(f"Worker processes unavailable, using threads: {str(e)}")
+                    self._processes_broken = True
+                    return None
+            return self._processes
+
+def _timed(func: Callable, df: pd.DataFrame, columns: List[Any], args: tuple, worker: str) -> tuple:
+    start = time.perf_counter()
+    result = func(df, columns, *args)
+    return result, time.perf_counter() - start, worker, len(columns)
+
+def _timed_from_parquet(func: Callable, source: str, columns: List[str], args: tuple) -> tuple:
+    # Runs in a worker process: read only this batch's columns
+    start = time.perf_counter()
+    df = pd.read_parquet(source, engine='pyarrow', columns=columns)
+    result = func(df, columns, *args)
+    return result, time.perf_counter() - start, WORKER_PROCESS, len(columns)
@@ -0,0 +1,157 @@
+import os
+import bz2
+import gzip
+import shutil
+import zipfile
+import logging
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# File suffix -> compression format
+COMPRESSION_SUFFIXES = {
+    'gz': 'gzip',
+    'gzip': 'gzip',
+    'bz2': 'bz2',
+    'zip': 'zip',
+    'zst': 'zstd',
+    'zstd': 'zstd'
+}
+
+# Formats that can be read from inside a compressed file
+DATA_EXTENSIONS = {'csv', 'xlsx', 'xls'}
+
+def split_extension(filename: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Split a file name into its data format and compression
+
+    'sales.csv.gz' -> ('csv', 'gzip'), 'sales.csv' -> ('csv', None),
+    'export.zip' -> (None, 'zip') when the inner format is only known from the archive
+
+    Returns:
+        Tuple of (data extension or None, compression format or None)
+    """
+    parts = filename.lower().rsplit('.', 2)[1:]
+    if not parts:
+        return None, None
+
+    compression = COMPRESSION_SUFFIXES.get(parts[-1])
+    if compression is None:
+        return (parts[-1] if parts[-1] in DATA_EXTENSIONS else None), None
+
+    inner = parts[-2] if len(parts) == 2 and parts[-2] in DATA_EXTENSIONS else None
+    if inner is None and compression != 'zip':
+        # A bare .gz/.bz2/.zst holds a single stream - treat it as CSV
+        inner = 'csv'
+    return inner, compression
+
+def is_supported_file(filename: str) -> bool:
+    """Check whether a file name is a data file, optionally compressed"""
+    extension, compression = split_extension(filename)
+    return extension is not None or compression == 'zip'
+
+def data_extension(file_path: str) -> str:
+    """Get the data format of a file, looking inside zip archives when needed"""
+    extension, compression = split_extension(file_path)
+    if extension is None and compression == 'zip':
+        with zipfile.ZipFile(file_path) as archive:
+            extension = os.path.splitext(_zip_member(archive))[1].lstrip('.').lower()
+    if extension not in DATA_EXTENSIONS:
+        raise ValueError(f"Unsupported file format: {os.path.basename(file_path)}")
+    return extension
+
+@contextmanager
+def open_data_stream(file_path: str) -> Iterator[BinaryIO]:
+    """
+    Open a data file for reading, decompressing on the fly
+
+    Nothing is written to disk: the returned binary stream decompresses as it
+    is read, so it can be passed straight to pd.read_csv.
+    """
+    _, compression = split_extension(file_path)
+
+    if compression is None:
+        stream = open(file_path, 'rb')
+    elif compression == 'gzip':
+        stream = gzip.open(file_path, 'rb')
+    elif compression == 'bz2':
+        stream = bz2.open(file_path, 'rb')
+    elif compression == 'zstd':
+        if not ZSTD_AVAILABLE:
+            raise ValueError("Reading .zst files requires the zstandard package")
+        stream = zstandard.ZstdDecompressor().stream_reader(open(file_path, 'rb'), closefd=True)
+    else:
+        archive = zipfile.ZipFile(file_path)
+        try:
+            stream = archive.open(_zip_member(archive))
+        except Exception:
+            archive.close()
+            raise
+        # The archive is closed together with the member stream below
+        stream = _ClosingStream(stream, archive)
+
+    try:
+        yield stream
+    finally:
+        stream.close()
+
+@contextmanager
+def decompressed_copy(file_path: str, extension: str) -> Iterator[str]:
+    """
+    Yield a path to an uncompressed copy of the file (the file itself if it is not compressed)
+
+    Excel readers need random access, so compressed workbooks are written out
+    first; the copy is removed afterwards.
+    """
+    _, compression = split_extension(file_path)
+    if compression is None:
+        yield file_path
+        return
+
+    target_path = f"{file_path}.decompressed.{extension}"
+    with open_data_stream(file_path) as stream, open(target_path, 'wb') as target:
+        shutil.copyfileobj(stream, target, length=1024 * 1024)
+    try:
+        yield target_path
+    finally:
+        os.remove(target_path)
+
+def _zip_member(archive: zipfile.ZipFile) -> str:
+    """Pick the data file inside a zip archive (the largest one if there are several)"""
+    members = [
+        info for info in archive.infolist()
+        if not info.is_dir()
+        and not info.filename.startswith('__MACOSX/')
+        and os.path.splitext(info.filename)[1].lstrip('.').lower() in DATA_EXTENSIONS
+    ]
+    if not members:
+        raise ValueError("Zip archive does not contain a CSV or Excel file")
+    if len(members) > 1:
+        logger.info(f"Zip archive has {len(members)} data files, reading the largest")
+    return max(members, key=lambda info: info.file_size).filename
+
+class _ClosingStream:
+    """Wrap a zip member stream so closing it also closes the archive"""
+
+    def __init__(self, stream: BinaryIO, archive: zipfile.ZipFile):
+        self._stream = stream
+        self._archive = archive
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+    def __iter__(self):
+        return iter(self._stream)
+
+    def close(self) -> None:
+        self._stream.close()
+        self._archive.close()
@@ -0,0 +1,174 @@
+import csv
+import io
+import logging
+from typing import Any, Dict, Optional
+
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+from services.compression import open_data_stream
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bytes read from the start of the file for detection
+DEFAULT_SAMPLE_BYTES = 4 * 1024 * 1024
+
+# Object columns at or below this distinct/non-null ratio are read as category
+CATEGORY_RATIO = 0.5
+CATEGORY_MAX_UNIQUE = 1000
+
+def sniff_csv(file_path: str, sample_bytes: int = DEFAULT_SAMPLE_BYTES) -> Dict[str, Any]:
+    """
+    Detect how to read a CSV file from a single sample of its first bytes
+
+    Args:
+        file_path: Path to the CSV file (gzip/bz2/zip/zstd files are sampled after decompression)
+        sample_bytes: Number of bytes to sample
+
+    Returns:
+        Dictionary of pd.read_csv keyword arguments (encoding, sep, quotechar,
+        header, dtype, parse_dates, date_format, usecols)
+    """
+    with open_data_stream(file_path) as f:
+        raw = f.read(sample_bytes)
+        truncated = bool(f.read(1))
+
+    return sniff_csv_sample(raw, truncated)
+
+def sniff_csv_sample(raw: bytes, truncated: bool = True) -> Dict[str, Any]:
+    """
+    Detect read_csv keyword arguments from raw bytes taken from the start of a CSV file
+
+    Args:
+        raw: First bytes of the file
+        truncated: Whether the file continues past the sample
+
+    Returns:
+        Dictionary of pd.read_csv keyword arguments (see sniff_csv)
+    """
+    if truncated:
+        # Only keep complete lines so the sample never ends mid-record or mid-character
+        last_newline = raw.rfind(b'\n')
+        if last_newline > 0:
+            raw = raw[:last_newline + 1]
+
+    encoding = detect_encoding(raw)
+    text = raw.decode(encoding)
+    if text.startswith('\ufeff'):
+        text = text[1:]
+
+    options = {'encoding': encoding}
+    options.update(_detect_dialect(text))
+
+    try:
+        sample = pd.read_csv(io.StringIO(text), sep=options['sep'], quotechar=options['quotechar'],
+                             header=options['header'], low_memory=False)
+    except Exception as e:
+        logger.warning(f"Could not parse CSV sample, using default dtypes: {str(e)}")
+        return options
+
+    options.update(_infer_columns(sample))
+    return options
+
+def detect_encoding(raw: bytes) -> str:
+    """Pick the first encoding that decodes the sample without errors"""
+    if raw.startswith(b'\xef\xbb\xbf'):
+        return 'utf-8-sig'
+    if raw.startswith((b'\xff\xfe', b'\xfe\xff')):
+        return 'utf-16'
+
+    # cp1252 is tried before latin-1 because latin-1 accepts any byte sequence
+    for encoding in ('utf-8', 'cp1252'):
+        try:
+            raw.decode(encoding)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return 'latin-1'
+
+def _detect_dialect(text: str) -> Dict[str, Any]:
+    """Detect delimiter, quote character and header presence"""
+    snippet = '\n'.join(text.splitlines()[:50])
+    sniffer = csv.Sniffer()
+
+    try:
+        dialect = sniffer.sniff(snippet, delimiters=',;\t|')
+        sep, quotechar = dialect.delimiter, dialect.quotechar or '"'
+    except csv.Error:
+        sep, quotechar = ',', '"'
+
+    # Only drop the header when the first row is clearly data (every field numeric)
+    header = 0
+    first_row = next(csv.reader(io.StringIO(snippet), delimiter=sep, quotechar=quotechar), [])
+    if first_row and all(_is_number(field) for field in first_row):
+        try:
+            if not sniffer.has_header(snippet):
+                header = None
+        except csv.Error:
+            pass
+
+    return {'sep': sep, 'quotechar': quotechar, 'header': header}
+
+def _infer_columns(sample: pd.DataFrame) -> Dict[str, Any]:
+    """Infer explicit dtypes, date columns and usable columns from the parsed sample"""
+    dtype = {}
+    parse_dates = []
+    date_format = {}
+    usecols = []
+
+    for col in sample.columns:
+        series = sample[col]
+        non_null = series.dropna()
+
+        # Trailing delimiters in Excel exports produce empty "Unnamed: N" columns
+        if non_null.empty and str(col).startswith('Unnamed:'):
+            continue
+        usecols.append(col)
+
+        if non_null.empty:
+            # No evidence in the sample; let pandas decide from the full column
+            continue
+        if pd.api.types.is_float_dtype(series):
+            dtype[col] = 'float64'
+        elif pd.api.types.is_object_dtype(series):
+            fmt = _detect_date_format(non_null)
+            if fmt:
+                parse_dates.append(col)
+                date_format[col] = fmt
+            elif (non_null.nunique() <= CATEGORY_MAX_UNIQUE
+                  and non_null.nunique() / len(non_null) <= CATEGORY_RATIO):
+                dtype[col] = 'category'
+            else:
+                dtype[col] = 'object'
+        # Integer and boolean columns are left to pandas: a missing value later in
+        # the file would not fit an explicit int64/bool dtype
+
+    options = {'dtype': dtype}
+    if parse_dates:
+        options['parse_dates'] = parse_dates
+        options['date_format'] = date_format
+    if len(usecols) < len(sample.columns):
+        options['usecols'] = usecols
+    return options
+
+def _detect_date_format(values: pd.Series) -> Optional[str]:
+    """Return the strftime format if every sampled value parses as a date with it"""
+    first = str(values.iloc[0])
+    if _is_number(first) or not any(sep in first for sep in '-/: '):
+        return None
+
+    fmt = guess_datetime_format(first)
+    if not fmt:
+        return None
+
+    parsed = pd.to_datetime(values.astype(str), format=fmt, errors='coerce')
+    return fmt if parsed.notna().all() else None
+
+def _is_number(value: str) -> bool:
+    try:
+        float(value)
+        return True
+    except (TypeError, ValueError):
+        return False
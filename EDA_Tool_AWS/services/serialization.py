@@ -0,0 +1,116 @@
+import json
+import math
+import datetime
+import decimal
+import logging
+import uuid
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+if ORJSON_AVAILABLE:
+    # numpy arrays and scalars are encoded natively; NaN/Infinity become null
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+def _default(obj: Any) -> Any:
+    """
+    Encode what the encoder does not handle itself
+
+    Called only for values outside the encoder's native types, so plain
+    dicts/lists/numbers never reach Python code.
+    """
+    if isinstance(obj, pd.DataFrame):
+        return obj.to_dict()
+    if isinstance(obj, (pd.Series, pd.Index)):
+        values = obj.to_numpy()
+        return values if values.dtype.kind in 'biuf' else values.tolist()
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    if isinstance(obj, np.ndarray):
+        # Only object, datetime and other non-native arrays get here
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, (decimal.Decimal, uuid.UUID)):
+        return str(obj)
+    if isinstance(obj, pd.Interval):
+        return str(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Encode a value as UTF-8 JSON, handling numpy/pandas values and NaN (as null)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(_to_builtin_slow(obj), allow_nan=False, separators=(',', ':')).encode('utf-8')
+
+def to_builtin(obj: Any) -> Any:
+    """
+    Convert nested results holding numpy/pandas values into plain Python types
+
+    Used where another library (e.g. the LLM prompt builder) serializes the
+    data itself. With orjson this is one encode/decode round trip in C.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(dumps_bytes(obj))
+    return _to_builtin_slow(obj)
+
+def _to_builtin_slow(obj: Any) -> Any:
+    """Recursive fallback used when orjson is not installed"""
+    if isinstance(obj, dict):
+        return {_key(key): _to_builtin_slow(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_to_builtin_slow(item) for item in obj]
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if obj is None or isinstance(obj, (str, int, bool)):
+        return obj
+    if isinstance(obj, np.ndarray) and obj.dtype.kind in 'biuf':
+        return _to_builtin_slow(obj.tolist())
+    return _to_builtin_slow(_default(obj))
+
+def _key(key: Any) -> Any:
+    if isinstance(key, np.generic):
+        key = key.item()
+    return key if isinstance(key, (str, int, float, bool)) or key is None else str(key)
+
+class FastJSONProvider(JSONProvider):
+    """
+    Flask JSON provider backed by orjson
+
+    Every jsonify() response and the session cookie go through it, so routes can
+    return numpy scalars/arrays, Series and DataFrames, NaN/NaT and numpy bools
+    without converting them first.
+    """
+
+    mimetype = 'application/json'
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        # Formatting options (indent, separators, sort_keys) are not needed by any caller
+        return dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        if ORJSON_AVAILABLE:
+            return orjson.loads(s)
+        return json.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj), mimetype=self.mimetype)
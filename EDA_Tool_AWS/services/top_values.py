@@ -0,0 +1,79 @@
+import logging
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+
+from services.sketches import HeavyHitters
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Columns profiled for their most frequent values
+CATEGORICAL_DTYPES = ['object', 'string', 'category']
+
+# Rows counted at a time; each chunk's counts are folded into the bounded counter
+TOP_VALUES_CHUNK_ROWS = 200_000
+
+# Bar that rolls up every value outside the top k
+OTHER_LABEL = 'Other'
+
+def column_heavy_hitters(series: pd.Series, capacity: int = 1000,
+                         chunk_rows: int = TOP_VALUES_CHUNK_ROWS) -> HeavyHitters:
+    """
+    Space-Saving counter of a column's most frequent values
+
+    The column is counted chunk by chunk, so at most `capacity` values plus
+    one chunk's distinct values are held at a time. Columns with no more than
+    `capacity` distinct values are counted exactly.
+    """
+    hitters = HeavyHitters(capacity)
+    for start in range(0, len(series), chunk_rows):
+        hitters.update(series.iloc[start:start + chunk_rows])
+    return hitters
+
+def columns_heavy_hitters(df: pd.DataFrame, columns: List[Any], capacity: int = 1000,
+                          chunk_rows: int = TOP_VALUES_CHUNK_ROWS) -> Dict[Any, HeavyHitters]:
+    """Heavy-hitter counters of a batch of columns (batch function for ColumnExecutor)"""
+    return {col: column_heavy_hitters(df[col], capacity, chunk_rows) for col in columns}
+
+def profile_top_values(df: pd.DataFrame, capacity: int = 1000,
+                       chunk_rows: int = TOP_VALUES_CHUNK_ROWS) -> Dict[str, HeavyHitters]:
+    """Heavy-hitter counters for every categorical (object, string, category) column"""
+    return columns_heavy_hitters(df, df.select_dtypes(include=CATEGORICAL_DTYPES).columns, capacity, chunk_rows)
+
+def top_values_summary(hitters: HeavyHitters, k: int = 10) -> Dict[str, Any]:
+    """
+    The k most frequent values of a column, with the rest rolled into one count
+
+    Args:
+        hitters: Counter of the column
+        k: Number of values to list
+
+    Returns:
+        Dictionary with 'values' (value, count and error of each), 'other_count'
+        (non-null values outside the top k), 'total' and 'exact' (False once
+        the counter had to drop values: counts are then lower bounds, at most
+        'error' below the true count)
+    """
+    top = hitters.top(k)
+    return {
+        'values': top,
+        'other_count': hitters.total - sum(item['count'] for item in top),
+        'total': hitters.total,
+        'exact': hitters.floor == 0
+    }
+
+def bar_chart_counts(hitters: HeavyHitters, k: int = 20,
+                     other_label: str = OTHER_LABEL) -> Tuple[List[Any], List[int]]:
+    """Bar labels and heights: the k most frequent values, then one bar for all the others"""
+    summary = top_values_summary(hitters, k)
+    labels = [item['value'] for item in summary['values']]
+    counts = [item['count'] for item in summary['values']]
+    if summary['other_count'] > 0:
+        # Keep the bucket distinct from a real value with the same name
+        while other_label in labels:
+            other_label = f"({other_label})"
+        labels.append(other_label)
+        counts.append(summary['other_count'])
+    return labels, counts
@@ -4,6 +4,10 @@ let currentData = null;
 let currentColumns = [];
 let currentDataView = 'head'; // Track current data view
 let addedCharts = []; // Store charts added to report
+let lastChartData = null; // Figure returned by /visualize for the chart on screen
+
+// Paging state for the ALL ROWS view - rows are fetched page by page from /rows
+let rowsView = { offset: 0, limit: 50, sortBy: null, descending: false, filterColumn: '', filterText: '', page: null };
 
 // Global variables for cleaning recommendations
 let cleaningRecommendations = null;
@@ -54,6 +58,12 @@ function handleFileUpload(event) {
 
     debugLog('File selected', file);
 
+    // Large files go through the resumable chunked protocol
+    if (file.size > CHUNKED_UPLOAD_THRESHOLD) {
+        uploadFileInChunks(file);
+        return;
+    }
+
     const formData = new FormData();
     formData.append('file', file);
 
@@ -85,6 +95,103 @@ function handleFileUpload(event) {
     });
 }
 
+// Files above this size are uploaded in chunks that can be retried and resumed
+// (API Gateway rejects request bodies over 6MB). They are too large for the session,
+// so the server returns a streaming profile of them instead of loading a dataset
+const CHUNKED_UPLOAD_THRESHOLD = 5 * 1024 * 1024;
+const UPLOAD_CHUNK_SIZE = 4 * 1024 * 1024;
+const UPLOAD_CHUNK_RETRIES = 3;
+
+async function sha256Hex(buffer) {
+    const digest = await crypto.subtle.digest('SHA-256', buffer);
+    return Array.from(new Uint8Array(digest)).map(b => b.toString(16).padStart(2, '0')).join('');
+}
+
+// Upload a large file as init -> chunk N -> finalize, resuming an interrupted upload of the same file
+async function uploadFileInChunks(file) {
+    const resumeKey = `chunkedUpload:${file.name}:${file.size}:${file.lastModified}`;
+    const showProgress = (done, total) => {
+        document.getElementById('uploadStatus').innerHTML =
+            `<div class="alert alert-info">Uploading file... ${Math.round(done / total * 100)}%</div>`;
+    };
+
+    try {
+        // Resume a previous upload of the same file if the server still has it
+        let status = null;
+        const previousId = localStorage.getItem(resumeKey);
+        if (previousId) {
+            const response = await fetch(`/upload/${previousId}`);
+            if (response.ok) status = await response.json();
+        }
+        if (!status) {
+            const response = await fetch('/upload/init', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ filename: file.name, total_size: file.size, chunk_size: UPLOAD_CHUNK_SIZE })
+            });
+            status = await response.json();
+            if (!response.ok) throw new Error(status.error);
+            localStorage.setItem(resumeKey, status.upload_id);
+        }
+        debugLog('Chunked upload status', status);
+
+        const uploadId = status.upload_id;
+        const chunkSize = status.chunk_size;
+        let done = status.total_chunks - status.missing_chunks.length;
+        showProgress(done, status.total_chunks);
+
+        for (const index of status.missing_chunks) {
+            const buffer = await file.slice(index * chunkSize, (index + 1) * chunkSize).arrayBuffer();
+            const checksum = await sha256Hex(buffer);
+
+            for (let attempt = 1; ; attempt++) {
+                try {
+                    const response = await fetch(`/upload/${uploadId}/chunk/${index}`, {
+                        method: 'PUT',
+                        headers: { 'Content-Type': 'application/octet-stream', 'X-Chunk-SHA256': checksum },
+                        body: buffer
+                    });
+                    if (response.ok) break;
+                    if (attempt >= UPLOAD_CHUNK_RETRIES) throw new Error((await response.json()).error);
+                } catch (error) {
+                    if (attempt >= UPLOAD_CHUNK_RETRIES) throw error;
+                }
+                await new Promise(resolve => setTimeout(resolve, 1000 * attempt));
+            }
+            showProgress(++done, status.total_chunks);
+        }
+
+        document.getElementById('uploadStatus').innerHTML = '<div class="alert alert-info">Processing file...</div>';
+        const response = await fetch(`/upload/${uploadId}/finalize`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ mode: 'profile' })
+        });
+        const data = await response.json();
+        localStorage.removeItem(resumeKey);
+
+        if (data.success) {
+            handleProfileSuccess(data);
+        } else {
+            document.getElementById('uploadStatus').innerHTML =
+                `<div class="alert alert-error">${data.error}</div>`;
+        }
+    } catch (error) {
+        debugLog('Chunked upload error', error);
+        document.getElementById('uploadStatus').innerHTML =
+            `<div class="alert alert-error">Upload failed: ${error.message}. Select the same file again to resume.</div>`;
+    }
+}
+
+// Show the streaming profile of a chunked upload; the file is not kept, so analysis tabs stay disabled
+function handleProfileSuccess(data) {
+    debugLog('Streaming profile received', data);
+    displayDataPreview(data);
+    document.getElementById('uploadStatus').innerHTML =
+        `<div class="alert alert-info">${data.message}. Files over 5 MB are profiled only; ` +
+        `upload a smaller file (or a sample) for the full analysis.</div>`;
+}
+
 // Update upload status
 function updateUploadStatus(message, type) {
     const uploadStatus = document.getElementById('uploadStatus');
@@ -326,6 +433,9 @@ function displayDataPreview(data) {
     debugLog('HTML content length:', htmlContent.length);
     debugLog('First stat card content:', infoDiv.querySelector('.stat-card .stat-content')?.innerHTML);
 
+    // A new dataset starts the ALL ROWS view unsorted and unfiltered
+    rowsView = { ...rowsView, offset: 0, sortBy: null, descending: false, filterColumn: '', filterText: '', page: null };
+    
     // Show initial data table (HEAD by default)
     showDataView('head');
 
@@ -341,20 +451,15 @@ function showDataView(view) {
     
     // Update button states - Fix: Don't rely on event.target
     document.querySelectorAll('.data-view-toggle .btn').forEach(btn => {
-        btn.classList.remove('active');
+        btn.classList.toggle('active', btn.dataset.view === view);
     });
     
-    // Find and activate the correct button based on view
-    if (view === 'head') {
-        document.querySelector('.data-view-toggle .btn:first-child').classList.add('active');
-    } else {
-        document.querySelector('.data-view-toggle .btn:last-child').classList.add('active');
-    }
-    
     // Display appropriate data
     const tableContainer = document.getElementById('dataTableContainer');
     
-    if (view === 'head') {
+    if (view === 'rows') {
+        loadRowsPage(0);
+    } else if (view === 'head') {
         debugLog('Displaying HEAD data:', currentData.preview_head);
         tableContainer.innerHTML = `
             <h4>First 10 rows:</h4>
@@ -369,6 +474,109 @@ function showDataView(view) {
     }
 }
 
+// Escape text before inserting it into table HTML
+function escapeHtml(value) {
+    return String(value)
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;');
+}
+
+// Fetch one page of rows from the server (filtering and sorting happen there)
+function loadRowsPage(offset) {
+    const tableContainer = document.getElementById('dataTableContainer');
+    rowsView.offset = Math.max(0, offset);
+    
+    const filters = [];
+    if (rowsView.filterColumn && rowsView.filterText) {
+        filters.push({ column: rowsView.filterColumn, op: 'contains', value: rowsView.filterText });
+    }
+    
+    fetch('/rows', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+            offset: rowsView.offset,
+            limit: rowsView.limit,
+            sort_by: rowsView.sortBy,
+            descending: rowsView.descending,
+            filters: filters
+        })
+    })
+    .then(response => response.json())
+    .then(page => {
+        debugLog('Rows page', page);
+        if (!page.success) {
+            tableContainer.innerHTML = `<div class="alert alert-error">${page.error}</div>`;
+            return;
+        }
+        rowsView.page = page;
+        if (currentDataView === 'rows') {
+            tableContainer.innerHTML = createRowsTable(page);
+        }
+    })
+    .catch(error => {
+        debugLog('Rows error', error);
+        tableContainer.innerHTML = `<div class="alert alert-error">Failed to load rows: ${error.message}</div>`;
+    });
+}
+
+// Table for one page of rows with sortable headers, a filter and paging buttons
+function createRowsTable(page) {
+    const first = page.total_rows === 0 ? 0 : page.offset + 1;
+    const last = page.offset + page.rows.length;
+    
+    let html = '<div class="rows-toolbar">';
+    html += '<select id="rowsFilterColumn" onchange="rowsView.filterColumn = this.value">';
+    html += '<option value="">Filter column...</option>';
+    page.columns.forEach(col => {
+        const selected = col === rowsView.filterColumn ? ' selected' : '';
+        html += `<option value="${escapeHtml(col)}"${selected}>${escapeHtml(col)}</option>`;
+    });
+    html += '</select>';
+    html += `<input type="text" id="rowsFilterText" placeholder="contains..." value="${escapeHtml(rowsView.filterText)}" onchange="rowsView.filterText = this.value">`;
+    html += '<button class="btn" onclick="loadRowsPage(0)"><i class="fas fa-filter"></i> Apply</button>';
+    html += `<span>Rows ${first}-${last} of ${page.total_rows}</span>`;
+    html += `<button class="btn" onclick="loadRowsPage(${page.offset - page.limit})"${page.offset === 0 ? ' disabled' : ''}><i class="fas fa-chevron-left"></i></button>`;
+    html += `<button class="btn" onclick="loadRowsPage(${page.next_offset})"${page.next_offset === null ? ' disabled' : ''}><i class="fas fa-chevron-right"></i></button>`;
+    html += '</div>';
+    
+    html += '<table class="data-table"><thead><tr><th>Row #</th>';
+    page.columns.forEach((col, i) => {
+        const arrow = col === rowsView.sortBy ? (rowsView.descending ? ' &#9660;' : ' &#9650;') : '';
+        html += `<th class="sortable" onclick="sortRowsBy(${i})">${escapeHtml(col)}${arrow}</th>`;
+    });
+    html += '</tr></thead><tbody>';
+    
+    page.rows.forEach((row, i) => {
+        html += `<tr><td><strong>${page.row_numbers[i] + 1}</strong></td>`;
+        page.columns.forEach(col => {
+            const value = row[col];
+            let displayValue;
+            if (value === null || value === undefined) {
+                displayValue = '<em>null</em>';
+            } else if (typeof value === 'number') {
+                displayValue = Number.isInteger(value) ? value : value.toFixed(4);
+            } else {
+                displayValue = escapeHtml(value);
+            }
+            html += `<td>${displayValue}</td>`;
+        });
+        html += '</tr>';
+    });
+    html += '</tbody></table>';
+    return html;
+}
+
+// Sort the ALL ROWS view by a column; clicking the same column again reverses the order
+function sortRowsBy(columnIndex) {
+    const column = rowsView.page.columns[columnIndex];
+    rowsView.descending = rowsView.sortBy === column ? !rowsView.descending : false;
+    rowsView.sortBy = column;
+    loadRowsPage(0);
+}
+
 // Create data table HTML - UNPIVOTED VERSION with better debugging
 function createDataTable(data, type) {
     debugLog(`Creating ${type} data table`, data);
@@ -559,6 +767,37 @@ function updateColumnSelection() {
     debugLog('Column selection class applied:', columnClass);
 }
 
+// Responses of /analyze and /visualize kept per request, revalidated with If-None-Match
+const responseCache = new Map();
+const RESPONSE_CACHE_LIMIT = 20;
+
+// fetch() that sends the ETag of the last response for the same request and
+// turns a 304 Not Modified back into that response, so unchanged data is not re-sent
+async function cachedFetch(url, options = {}) {
+    const key = `${url} ${options.body || ''}`;
+    const cached = responseCache.get(key);
+    const headers = { ...(options.headers || {}) };
+    if (cached) {
+        headers['If-None-Match'] = cached.etag;
+    }
+
+    const response = await fetch(url, { ...options, headers });
+    if (response.status === 304 && cached) {
+        return new Response(cached.body, { status: 200, headers: { 'Content-Type': cached.contentType } });
+    }
+
+    const etag = response.headers.get('ETag');
+    if (response.ok && etag) {
+        responseCache.delete(key);
+        responseCache.set(key, { etag, body: await response.clone().text(), contentType: response.headers.get('Content-Type') });
+        if (responseCache.size > RESPONSE_CACHE_LIMIT) {
+            // Maps iterate in insertion order, so the first key is the least recently stored
+            responseCache.delete(responseCache.keys().next().value);
+        }
+    }
+    return response;
+}
+
 // Analyze data
 function analyzeData() {
     if (!currentData) {
@@ -571,7 +810,7 @@ function analyzeData() {
     document.getElementById('analysisLoading').style.display = 'block';
     document.getElementById('analysisResults').innerHTML = '';
 
-    fetch('/analyze', {
+    cachedFetch('/analyze', {
         method: 'POST'
     })
     .then(response => response.json())
@@ -608,7 +847,7 @@ async function startAnalysis() {
             </div>
         `;
         
-        const response = await fetch('/analyze', {
+        const response = await cachedFetch('/analyze', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -851,7 +1090,7 @@ function displayAnalysisResults(data) {
                                 <th>Column</th>
                                 <th>Skewness</th>
                                 <th>Kurtosis</th>
-                                <th>Shapiro-Wilk p-value</th>
+                                <th>p-value (Test)</th>
                                 <th>Assessment</th>
                             </tr>
                         </thead>
@@ -862,7 +1101,9 @@ function displayAnalysisResults(data) {
                                 
                                 const skewness = testData.skewness;
                                 const kurtosis = testData.kurtosis;
-                                const shapiroP = testData.shapiro_wilk_p;
+                                // p-value of the test chosen for the column size; older results only have Shapiro-Wilk
+                                const pValue = testData.p_value ?? testData.shapiro_wilk_p;
+                                const testName = testData.test || 'Shapiro-Wilk';
                                 const assessment = testData.assessment || 'N/A';
                                 
                                 // Determine assessment class for styling - FIXED VERSION
@@ -886,7 +1127,7 @@ function displayAnalysisResults(data) {
                                         <td><strong>${column}</strong></td>
                                         <td>${skewness !== 'N/A' ? skewness : 'N/A'}</td>
                                         <td>${kurtosis !== 'N/A' ? kurtosis : 'N/A'}</td>
-                                        <td>${shapiroP !== 'N/A' ? shapiroP : 'N/A'}</td>
+                                        <td>${pValue !== undefined && pValue !== 'N/A' ? `${pValue} (${testName})` : 'N/A'}</td>
                                         <td><span class="assessment-badge ${assessmentClass}">${assessment}</span></td>
                                     </tr>
                                 `;
@@ -921,7 +1162,10 @@ function displayAnalysisResults(data) {
                     ${Object.keys(data.unique_values).map(column => {
                         const uniqueVals = data.unique_values[column];
                         const totalCount = data.basic_stats?.[column]?.count || 0;
-                        const uniqueCount = uniqueVals.length;
+                        // Distinct count of the whole column (a HyperLogLog estimate for large data)
+                        const distinct = data.unique_counts?.[column];
+                        const uniqueCount = distinct ? distinct.count : uniqueVals.length;
+                        const uniqueLabel = distinct?.approximate ? `~${uniqueCount}` : uniqueCount;
                         const cardinality = totalCount > 0 ? (uniqueCount / totalCount * 100).toFixed(2) : 0;
                         
                         return `
@@ -929,7 +1173,7 @@ function displayAnalysisResults(data) {
                                 <h4>${column}</h4>
                                 <div class="unique-stats">
                                     <span class="stat-item">Total: ${totalCount}</span>
-                                    <span class="stat-item">Unique: ${uniqueCount}</span>
+                                    <span class="stat-item">Unique: ${uniqueLabel}</span>
                                     <span class="stat-item">Cardinality: ${cardinality}%</span>
                                 </div>
                                 <div class="unique-values-list">
@@ -1002,14 +1246,16 @@ function createVisualization() {
     chartContainer.innerHTML = '<div class="loading">Generating chart...</div>';
 
     // Use backend for full dataset visualization
-    fetch('/visualize', {
+    cachedFetch('/visualize', {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json'
         },
         body: JSON.stringify({
             chart_type: chartType,
-            columns: columns
+            columns: columns,
+            // Numeric trace data comes back as base64 typed arrays (see decodeTypedArrays)
+            format: 'bdata'
         })
     })
     .then(response => response.json())
@@ -1030,12 +1276,51 @@ function createVisualization() {
     });
 }
 
+// Typed-array constructors for plotly's {dtype, bdata, shape} encoding
+const TYPED_ARRAYS = {
+    i1: Int8Array, u1: Uint8Array, i2: Int16Array, u2: Uint16Array,
+    i4: Int32Array, u4: Uint32Array, f4: Float32Array, f8: Float64Array
+};
+
+// Decode one {dtype, bdata, shape} value; 2-D values (heatmap z) become an array of rows
+function decodeTypedArray(value) {
+    const binary = atob(value.bdata);
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) {
+        bytes[i] = binary.charCodeAt(i);
+    }
+    const array = new TYPED_ARRAYS[value.dtype](bytes.buffer);
+    if (!value.shape) return array;
+    
+    const [rows, cols] = String(value.shape).split(',').map(Number);
+    const matrix = [];
+    for (let r = 0; r < rows; r++) {
+        matrix.push(Array.from(array.subarray(r * cols, (r + 1) * cols)));
+    }
+    return matrix;
+}
+
+// Replace base64 trace data with typed arrays, which plotly plots without per-value parsing
+function decodeTypedArrays(chartData) {
+    (chartData.data || []).forEach(trace => {
+        ['x', 'y', 'z'].forEach(key => {
+            const value = trace[key];
+            if (value && typeof value === 'object' && value.bdata !== undefined) {
+                trace[key] = decodeTypedArray(value);
+            }
+        });
+    });
+    return chartData;
+}
+
 // Display chart - Updated for backend data
 function displayChart(chartData) {
     debugLog('Displaying chart from backend', chartData);
     
     const container = document.getElementById('chartContainer');
     container.style.display = 'block';
+    chartData = decodeTypedArrays(chartData);
+    lastChartData = chartData;
     
     try {
         // chartData is already in the correct format from backend
@@ -1251,7 +1536,8 @@ function addChartToReport() {
         type: document.getElementById('chartType').value,
         columns: getSelectedColumns(),
         chartHTML: chartContainer.innerHTML,
-        // Store the original data that was used to create the chart
+        // Keep the figure computed by the server - the browser no longer holds every row
+        figure: lastChartData,
         originalData: currentData,
         timestamp: new Date().toLocaleString(),
         selected: true
@@ -1586,16 +1872,9 @@ function renderChartsInReport() {
     });
 }
 
-// Convert data structure to DataFrame format - Enhanced to use full data
+// Convert preview data to DataFrame format (fallback when a chart has no stored figure)
 function convertDataToDataFrame(data) {
     try {
-        // First try to use full data if available
-        if (data.full_data && data.full_data.length > 0) {
-            debugLog(`Using full data with ${data.full_data.length} rows`);
-            return data.full_data;
-        }
-        
-        // Fallback to preview data if full data not available
         if (!data.preview_head) return [];
         
         const columns = data.data_info?.columns || [];
@@ -1652,7 +1931,15 @@ function convertDataToDataFrame(data) {
 // Recreate chart data from stored information - Fixed correlation handling
 function recreateChartData(chart) {
     try {
-        // Use the original data to recreate the chart
+        // Reuse the figure the server computed from the full dataset
+        if (chart.figure) {
+            return {
+                data: chart.figure.data,
+                layout: { ...chart.figure.layout, title: chart.title }
+            };
+        }
+        
+        // Otherwise rebuild it from the preview rows
         const data = chart.originalData;
         const chartType = chart.type;
         const columns = chart.columns;
@@ -2234,7 +2521,7 @@ async function startAnalysis() {
             </div>
         `;
         
-        const response = await fetch('/analyze', {
+        const response = await cachedFetch('/analyze', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -2477,7 +2764,7 @@ function displayAnalysisResults(data) {
                                 <th>Column</th>
                                 <th>Skewness</th>
                                 <th>Kurtosis</th>
-                                <th>Shapiro-Wilk p-value</th>
+                                <th>p-value (Test)</th>
                                 <th>Assessment</th>
                             </tr>
                         </thead>
@@ -2488,7 +2775,9 @@ function displayAnalysisResults(data) {
                                 
                                 const skewness = testData.skewness;
                                 const kurtosis = testData.kurtosis;
-                                const shapiroP = testData.shapiro_wilk_p;
+                                // p-value of the test chosen for the column size; older results only have Shapiro-Wilk
+                                const pValue = testData.p_value ?? testData.shapiro_wilk_p;
+                                const testName = testData.test || 'Shapiro-Wilk';
                                 const assessment = testData.assessment || 'N/A';
                                 
                                 // Determine assessment class for styling - FIXED VERSION
@@ -2512,7 +2801,7 @@ function displayAnalysisResults(data) {
                                         <td><strong>${column}</strong></td>
                                         <td>${skewness !== 'N/A' ? skewness : 'N/A'}</td>
                                         <td>${kurtosis !== 'N/A' ? kurtosis : 'N/A'}</td>
-                                        <td>${shapiroP !== 'N/A' ? shapiroP : 'N/A'}</td>
+                                        <td>${pValue !== undefined && pValue !== 'N/A' ? `${pValue} (${testName})` : 'N/A'}</td>
                                         <td><span class="assessment-badge ${assessmentClass}">${assessment}</span></td>
                                     </tr>
                                 `;
@@ -2547,7 +2836,10 @@ function displayAnalysisResults(data) {
                     ${Object.keys(data.unique_values).map(column => {
                         const uniqueVals = data.unique_values[column];
                         const totalCount = data.basic_stats?.[column]?.count || 0;
-                        const uniqueCount = uniqueVals.length;
+                        // Distinct count of the whole column (a HyperLogLog estimate for large data)
+                        const distinct = data.unique_counts?.[column];
+                        const uniqueCount = distinct ? distinct.count : uniqueVals.length;
+                        const uniqueLabel = distinct?.approximate ? `~${uniqueCount}` : uniqueCount;
                         const cardinality = totalCount > 0 ? (uniqueCount / totalCount * 100).toFixed(2) : 0;
                         
                         return `
@@ -2555,7 +2847,7 @@ function displayAnalysisResults(data) {
                                 <h4>${column}</h4>
                                 <div class="unique-stats">
                                     <span class="stat-item">Total: ${totalCount}</span>
-                                    <span class="stat-item">Unique: ${uniqueCount}</span>
+                                    <span class="stat-item">Unique: ${uniqueLabel}</span>
                                     <span class="stat-item">Cardinality: ${cardinality}%</span>
                                 </div>
                                 <div class="unique-values-list">
@@ -10,8 +10,11 @@ import plotly.utils
 from scipy import stats
 from sklearn.preprocessing import StandardScaler
 import io
+import zlib
 import base64
 from datetime import datetime
+from cardinality import CARDINALITY_APPROX, CARDINALITY_EXACT, count_distinct
+from top_values import top_values
 
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-here'  # Change in production
@@ -21,13 +24,36 @@ UPLOAD_FOLDER = 'temp_uploads'
 MAX_FILE_SIZE = 100 * 1024 * 1024  # 100MB
 ALLOWED_EXTENSIONS = {'csv', 'xlsx', 'xls'}
 
+# Distinct counts: 'exact' (nunique), 'approx' (HyperLogLog) or 'auto' (HyperLogLog from
+# APPROX_DISTINCT_MIN_ROWS rows up); the HLL standard error is 1.04 / sqrt(2 ** HLL_PRECISION)
+CARDINALITY_MODE = os.environ.get('CARDINALITY_MODE', 'auto').lower()
+APPROX_DISTINCT_MIN_ROWS = int(os.environ.get('APPROX_DISTINCT_MIN_ROWS', 1_000_000))
+HLL_PRECISION = int(os.environ.get('HLL_PRECISION', 14))
+
+# Values tracked per categorical column for top values (counts are exact below this many distinct values)
+TOP_VALUES_CAPACITY = int(os.environ.get('TOP_VALUES_CAPACITY', 1000))
+
+# Shapiro-Wilk runs on at most this many values (drawn with NORMALITY_SEED from larger columns)
+SHAPIRO_MAX_N = 5000
+NORMALITY_SEED = int(os.environ.get('NORMALITY_SEED', 0))
+
 # Ensure upload folder exists
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def get_dataframe_info(df):
+def cardinality_mode(rows, requested=None):
+    """Exact or HyperLogLog distinct counts: the requested mode, else per CARDINALITY_MODE"""
+    if requested:
+        if requested not in (CARDINALITY_EXACT, CARDINALITY_APPROX):
+            raise ValueError(f'Unknown cardinality mode: {requested} (use exact or approx)')
+        return requested
+    if CARDINALITY_MODE == 'auto':
+        return CARDINALITY_APPROX if rows >= APPROX_DISTINCT_MIN_ROWS else CARDINALITY_EXACT
+    return CARDINALITY_MODE
+
+def get_dataframe_info(df, cardinality=CARDINALITY_EXACT):
     """Get comprehensive DataFrame information"""
     info = {
         'shape': df.shape,
@@ -35,13 +61,14 @@ def get_dataframe_info(df):
         'memory_usage': df.memory_usage(deep=True).sum(),
         'null_counts': df.isnull().sum().to_dict(),
         'null_percentages': (df.isnull().sum() / len(df) * 100).to_dict(),
-        'unique_counts': df.nunique().to_dict(),
+        'unique_counts': {col: count_distinct(df[col], cardinality, HLL_PRECISION) for col in df.columns},
+        'unique_counts_approximate': cardinality == CARDINALITY_APPROX,
         'duplicate_rows': df.duplicated().sum(),
         'columns': list(df.columns)
     }
     return info
 
-def get_summary_statistics(df):
+def get_summary_statistics(df, cardinality=CARDINALITY_EXACT):
     """Get comprehensive summary statistics"""
     numeric_cols = df.select_dtypes(include=[np.number]).columns
     categorical_cols = df.select_dtypes(include=['object', 'category']).columns
@@ -62,11 +89,14 @@ def get_summary_statistics(df):
     if len(categorical_cols) > 0:
         categorical_stats = {}
         for col in categorical_cols:
-            value_counts = df[col].value_counts()
+            # Top 10 and most common value from one bounded pass; the rest is other_count
+            value_counts, other_count, exact = top_values(df[col], 10, TOP_VALUES_CAPACITY)
             categorical_stats[col] = {
-                'value_counts': value_counts.head(10).to_dict(),
-                'unique_count': df[col].nunique(),
-                'most_common': df[col].mode().iloc[0] if not df[col].mode().empty else None
+                'value_counts': value_counts.to_dict(),
+                'value_counts_exact': exact,
+                'other_count': other_count,
+                'unique_count': count_distinct(df[col], cardinality, HLL_PRECISION),
+                'most_common': value_counts.index[0] if not value_counts.empty else None
             }
         stats_data['categorical'] = categorical_stats
     
@@ -100,27 +130,41 @@ def detect_outliers(df, method='iqr'):
     return outliers_data
 
 def run_normality_tests(df):
-    """Run normality tests on numerical columns"""
+    """
+    Run normality tests on numerical columns
+
+    Shapiro-Wilk p-values are only accurate up to SHAPIRO_MAX_N values, so larger
+    columns are judged by D'Agostino K² and Jarque-Bera on all values, and
+    Shapiro-Wilk runs on a seeded random sample (the same one every time).
+    """
     numeric_cols = df.select_dtypes(include=[np.number]).columns
     normality_results = {}
     
     for col in numeric_cols:
-        data = df[col].dropna()
+        data = df[col].dropna().to_numpy(dtype=float)
         if len(data) < 3:
             continue
-            
-        # Shapiro-Wilk test
+        
+        results = {'test': 'shapiro_wilk', 'sample_size': min(len(data), SHAPIRO_MAX_N)}
         try:
+            if len(data) > SHAPIRO_MAX_N:
+                k2_stat, k2_p = stats.normaltest(data)
+                jb_stat, jb_p = stats.jarque_bera(data)
+                results['test'] = 'dagostino_k2'
+                results['dagostino_k2'] = {'statistic': float(k2_stat), 'p_value': float(k2_p), 'is_normal': bool(k2_p > 0.05)}
+                results['jarque_bera'] = {'statistic': float(jb_stat), 'p_value': float(jb_p), 'is_normal': bool(jb_p > 0.05)}
+                rng = np.random.default_rng([NORMALITY_SEED, zlib.crc32(str(col).encode('utf-8'))])
+                data = rng.choice(data, SHAPIRO_MAX_N, replace=False)
+            
             shapiro_stat, shapiro_p = stats.shapiro(data)
-            normality_results[col] = {
-                'shapiro_wilk': {
-                    'statistic': float(shapiro_stat),
-                    'p_value': float(shapiro_p),
-                    'is_normal': shapiro_p > 0.05
-                }
+            results['shapiro_wilk'] = {
+                'statistic': float(shapiro_stat),
+                'p_value': float(shapiro_p),
+                'is_normal': bool(shapiro_p > 0.05)
             }
-        except:
-            normality_results[col] = {'shapiro_wilk': {'error': 'Test failed'}}
+        except ValueError as e:
+            results['shapiro_wilk'] = {'error': f'Test failed: {e}'}
+        normality_results[col] = results
     
     return normality_results
 
@@ -167,8 +211,12 @@ def upload_file():
             df.to_pickle(temp_file.name)
             session['temp_file'] = temp_file.name
         
-        # Get basic info
-        info = get_dataframe_info(df)
+        # Get basic info ('cardinality': 'exact' or 'approx' overrides CARDINALITY_MODE)
+        try:
+            cardinality = cardinality_mode(len(df), request.form.get('cardinality'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        info = get_dataframe_info(df, cardinality)
         
         # Get preview data
         preview = {
@@ -197,8 +245,12 @@ def analyze_data():
         else:
             return jsonify({'error': 'No data available for analysis'}), 400
         
-        # Get summary statistics
-        summary_stats = get_summary_statistics(df)
+        # Get summary statistics ('cardinality': 'exact' or 'approx' overrides CARDINALITY_MODE)
+        try:
+            cardinality = cardinality_mode(len(df), (request.get_json(silent=True) or {}).get('cardinality'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        summary_stats = get_summary_statistics(df, cardinality)
         
         # Detect outliers
         outliers = detect_outliers(df)
@@ -327,8 +379,9 @@ def generate_report():
             return jsonify({'error': 'No data available for report generation'}), 400
         
         # Generate comprehensive report
-        info = get_dataframe_info(df)
-        summary_stats = get_summary_statistics(df)
+        cardinality = cardinality_mode(len(df))
+        info = get_dataframe_info(df, cardinality)
+        summary_stats = get_summary_statistics(df, cardinality)
         outliers = detect_outliers(df)
         normality_tests = run_normality_tests(df)
         correlations = get_correlations(df)
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+# Rows counted at a time, so memory stays bounded on long columns
+CHUNK_ROWS = 200_000
+
+class HeavyHitters:
+    """
+    Bounded-memory top-k value counter (batched Space-Saving)
+
+    At most `capacity` values are tracked. Every reported count is a lower
+    bound with count <= true count <= count + error, and any value that is
+    not tracked occurs at most `floor` times. Columns with no more than
+    `capacity` distinct values are counted exactly.
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.total = 0
+        self.floor = 0
+        self.counts = pd.Series(dtype='int64')
+        self.errors = pd.Series(dtype='int64')
+
+    def update(self, series):
+        """Add the non-null values of a Series"""
+        counts = series.value_counts(dropna=True, sort=False)
+        counts = counts[counts > 0]  # categorical columns also report unused categories
+        self.total += int(counts.sum())
+        floor = 0
+        if len(counts) > self.capacity:
+            # Values outside the batch's top `capacity` occur at most `floor` times in it
+            counts = counts.nlargest(self.capacity + 1)
+            floor = int(counts.iloc[-1])
+            counts = counts.iloc[:-1]
+
+        # A value missing from one side may still have occurred up to that side's floor
+        mine = self.errors + np.where(self.counts.index.isin(counts.index), 0, floor)
+        theirs = pd.Series(np.where(counts.index.isin(self.counts.index), 0, self.floor), index=counts.index)
+        self.floor += floor
+        self.counts = pd.concat([self.counts, counts]).groupby(level=0, sort=False).sum()
+        self.errors = pd.concat([mine, theirs]).groupby(level=0, sort=False).sum()
+
+        if len(self.counts) > self.capacity:
+            ordered = self.counts.sort_values(ascending=False, kind='stable')
+            keep, dropped = ordered.index[:self.capacity], ordered.index[self.capacity:]
+            self.floor = max(self.floor, int((self.counts.loc[dropped] + self.errors.loc[dropped]).max()))
+            self.counts = self.counts.loc[keep]
+            self.errors = self.errors.loc[keep]
+
+    def top(self, k):
+        """The k most frequent values and their (lower bound) counts, most frequent first"""
+        return self.counts.sort_values(ascending=False, kind='stable').head(k)
+
+def top_values(series, k=10, capacity=1000):
+    """
+    The k most frequent values of a column, the number of other non-null values
+    and whether the counts are exact
+
+    One chunked pass with a Space-Saving counter instead of a full value_counts();
+    the first value is also the column's most common value. Counts are exact
+    unless the column has more than `capacity` distinct values, and lower
+    bounds otherwise.
+    """
+    hitters = HeavyHitters(capacity)
+    for start in range(0, len(series), CHUNK_ROWS):
+        hitters.update(series.iloc[start:start + CHUNK_ROWS])
+    top = hitters.top(k)
+    return top, hitters.total - int(top.sum()), hitters.floor == 0
@@ -0,0 +1,142 @@
+import os
+import json
+import time
+import uuid
+import shutil
+import hashlib
+from typing import Optional
+
+
+class ChunkedUploadStore:
+    """Disk-backed resumable uploads: init, upload chunk N, finalize.
+
+    Each upload gets a directory with the manifest written at init, a data
+    file that chunks are written into at their offsets, and one receipt file
+    per verified chunk holding its SHA-256. Chunks may arrive in any order
+    and be retried; a client that lost its connection asks for the status
+    and sends only the missing chunks.
+    """
+
+    def __init__(self, upload_dir: str, max_upload_bytes: int, max_chunk_bytes: int,
+                 max_age_seconds: int):
+        self.upload_dir = upload_dir
+        self.max_upload_bytes = max_upload_bytes
+        self.max_chunk_bytes = max_chunk_bytes
+        self.max_age_seconds = max_age_seconds
+        os.makedirs(self.upload_dir, exist_ok=True)
+
+    def init(self, filename: str, total_size: int, chunk_size: int) -> dict:
+        """Start an upload and return its status"""
+        if total_size <= 0 or total_size > self.max_upload_bytes:
+            raise ValueError(f"File size must be between 1 byte and {self.max_upload_bytes} bytes")
+        if chunk_size <= 0 or chunk_size > self.max_chunk_bytes:
+            raise ValueError(f"Chunk size must be between 1 byte and {self.max_chunk_bytes} bytes")
+
+        self.purge_expired()
+        upload_id = uuid.uuid4().hex
+        upload_path = self._path(upload_id)
+        os.makedirs(os.path.join(upload_path, "received"))
+
+        manifest = {
+            "upload_id": upload_id,
+            "filename": filename,
+            "total_size": total_size,
+            "chunk_size": chunk_size,
+            "total_chunks": -(-total_size // chunk_size),
+            "created_at": time.time(),
+        }
+        with open(os.path.join(upload_path, "manifest.json"), "w") as f:
+            json.dump(manifest, f)
+        open(os.path.join(upload_path, "data.part"), "wb").close()
+        return self.status(upload_id)
+
+    def write_chunk(self, upload_id: str, index: int, data: bytes, checksum: Optional[str] = None) -> dict:
+        """Verify a chunk's size and SHA-256, write it at its offset and return the status"""
+        manifest = self._manifest(upload_id)
+        if not 0 <= index < manifest["total_chunks"]:
+            raise ValueError(f"Chunk index must be between 0 and {manifest['total_chunks'] - 1}")
+
+        offset = index * manifest["chunk_size"]
+        expected_size = min(manifest["chunk_size"], manifest["total_size"] - offset)
+        if len(data) != expected_size:
+            raise ValueError(f"Chunk {index} must be {expected_size} bytes, got {len(data)}")
+
+        digest = hashlib.sha256(data).hexdigest()
+        if checksum and checksum.lower() != digest:
+            raise ValueError(f"Checksum mismatch for chunk {index}")
+
+        upload_path = self._path(upload_id)
+        with open(os.path.join(upload_path, "data.part"), "r+b") as f:
+            f.seek(offset)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # The receipt is written last, so a chunk only counts once its bytes are on disk
+        receipt = os.path.join(upload_path, "received", str(index))
+        with open(f"{receipt}.tmp", "w") as f:
+            f.write(digest)
+        os.replace(f"{receipt}.tmp", receipt)
+        return self.status(upload_id)
+
+    def status(self, upload_id: str) -> dict:
+        """Manifest fields plus the received and missing chunk indexes"""
+        manifest = self._manifest(upload_id)
+        names = os.listdir(os.path.join(self._path(upload_id), "received"))
+        received = sorted(int(name) for name in names if name.isdigit())
+        received_set = set(received)
+        return {
+            **manifest,
+            "received_chunks": received,
+            "missing_chunks": [i for i in range(manifest["total_chunks"]) if i not in received_set],
+        }
+
+    def finalize(self, upload_id: str, target_path: str, checksum: Optional[str] = None) -> str:
+        """Check that every chunk arrived, move the assembled file to target_path and drop the upload"""
+        status = self.status(upload_id)
+        if status["missing_chunks"]:
+            missing = status["missing_chunks"]
+            raise ValueError(f"Upload incomplete, {len(missing)} chunks missing (first: {missing[0]})")
+
+        file_path = os.path.join(self._path(upload_id), "data.part")
+        if checksum:
+            digest = hashlib.sha256()
+            with open(file_path, "rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(block)
+            if checksum.lower() != digest.hexdigest():
+                raise ValueError("Checksum mismatch for the assembled file")
+
+        shutil.move(file_path, target_path)
+        self.discard(upload_id)
+        return target_path
+
+    def discard(self, upload_id: str) -> None:
+        """Remove an upload and its data"""
+        shutil.rmtree(self._path(upload_id), ignore_errors=True)
+
+    def purge_expired(self) -> int:
+        """Remove uploads that have not received a chunk within the max age"""
+        cutoff = time.time() - self.max_age_seconds
+        removed = 0
+        for name in os.listdir(self.upload_dir):
+            try:
+                if os.path.getmtime(os.path.join(self.upload_dir, name, "received")) < cutoff:
+                    self.discard(name)
+                    removed += 1
+            except (OSError, ValueError):
+                continue
+        return removed
+
+    def _path(self, upload_id: str) -> str:
+        # Upload IDs are generated here; reject anything that could escape the directory
+        if not upload_id or not upload_id.isalnum():
+            raise ValueError(f"Invalid upload ID: {upload_id!r}")
+        return os.path.join(self.upload_dir, upload_id)
+
+    def _manifest(self, upload_id: str) -> dict:
+        try:
+            with open(os.path.join(self._path(upload_id), "manifest.json")) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise KeyError(f"Upload {upload_id} not found")
@@ -1,17 +1,24 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException, Request, Depends
+from fastapi import FastAPI, File, UploadFile, HTTPException, Request, Response, Depends
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse, JSONResponse, FileResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 import pandas as pd
 import io
 import json
 from typing import Optional
 import uvicorn
 from pathlib import Path
-import numpy as np
+import os
 import tempfile
 import uuid
+import shutil
+from session_cache import SessionDataManager
+from upload_jobs import UploadJobManager
+from row_query import DEFAULT_PAGE_SIZE, page_positions, query_rows, sort_order
+from transport import ARROW_MIME_TYPE, frame_to_arrow_ipc, wants_arrow
+from chunked_upload import ChunkedUploadStore
 
 app = FastAPI(
     title="EDA Explorer", 
@@ -34,27 +41,38 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 # Templates
 templates = Jinja2Templates(directory="templates")
 
-# In-memory session store (for demo; use Redis or DB for production)
-SESSION_DATA = {}
-
-def convert_numpy_types(obj):
-    """Convert numpy types to Python native types for JSON serialization"""
-    if isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, dict):
-        return {key: convert_numpy_types(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_numpy_types(item) for item in obj]
-    else:
-        return obj
+# Session DataFrame store with a global memory budget, per-session quota,
+# idle TTL and LRU spill to disk (sizes in MB, TTL in minutes)
+SESSION_DATA = SessionDataManager(
+    memory_budget_bytes=int(os.environ.get("SESSION_MEMORY_BUDGET_MB", 1024)) * 1024 * 1024,
+    session_quota_bytes=int(os.environ.get("SESSION_QUOTA_MB", 256)) * 1024 * 1024,
+    idle_ttl_seconds=int(os.environ.get("SESSION_IDLE_TTL_MINUTES", 60)) * 60,
+    spill_dir=os.environ.get("SESSION_SPILL_DIR", os.path.join(tempfile.gettempdir(), "eda_session_spill"))
+)
+
+# Uploads are spooled to disk and parsed off the event loop by a worker pool
+UPLOAD_SPOOL_DIR = os.environ.get("UPLOAD_SPOOL_DIR", os.path.join(tempfile.gettempdir(), "eda_upload_spool"))
+os.makedirs(UPLOAD_SPOOL_DIR, exist_ok=True)
+UPLOAD_JOBS = UploadJobManager(
+    store=SESSION_DATA,
+    max_workers=int(os.environ.get("UPLOAD_WORKERS", 2)),
+    job_ttl_seconds=int(os.environ.get("SESSION_IDLE_TTL_MINUTES", 60)) * 60
+)
+
+# Resumable chunked uploads for files above the single-request limit
+CHUNKED_UPLOADS = ChunkedUploadStore(
+    upload_dir=os.path.join(UPLOAD_SPOOL_DIR, "chunked"),
+    max_upload_bytes=int(os.environ.get("CHUNKED_UPLOAD_MAX_MB", 2048)) * 1024 * 1024,
+    max_chunk_bytes=int(os.environ.get("CHUNK_SIZE_MAX_MB", 16)) * 1024 * 1024,
+    max_age_seconds=int(os.environ.get("SESSION_IDLE_TTL_MINUTES", 60)) * 60
+)
 
 def get_session_id(request: Request):
     sid = request.cookies.get("session_id")
-    if not sid:
+    try:
+        # Only accept IDs we issued; the ID is also used to name spill files
+        sid = str(uuid.UUID(sid))
+    except (TypeError, ValueError):
         sid = str(uuid.uuid4())
     return sid
 
@@ -62,9 +80,9 @@ def get_session_id(request: Request):
 async def read_root(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
-@app.post("/upload")
-async def upload_file(file: UploadFile = File(...), request: Request = None):
-    """Upload and process CSV/Excel files"""
+@app.post("/upload", status_code=202)
+async def upload_file(response: Response, file: UploadFile = File(...), request: Request = None):
+    """Spool an uploaded CSV/Excel file and queue it for parsing"""
     try:
         # Validate file type
         allowed_extensions = {'.csv', '.xlsx', '.xls'}
@@ -77,41 +95,159 @@ async def upload_file(file: UploadFile = File(...), request: Request = None):
         if file.size > 100 * 1024 * 1024:
             raise HTTPException(status_code=400, detail="File too large (max 100MB)")
         
-        # Read file content
-        content = await file.read()
-        
-        # Parse file based on type
-        if file_extension == '.csv':
-            df = pd.read_csv(io.StringIO(content.decode('utf-8')))
-        else:  # Excel files
-            df = pd.read_excel(io.BytesIO(content))
+        # Copy the upload to the spool directory without blocking the event loop
+        file_path = os.path.join(UPLOAD_SPOOL_DIR, f"{uuid.uuid4().hex}{file_extension}")
+        def spool():
+            with open(file_path, "wb") as out:
+                shutil.copyfileobj(file.file, out, length=1024 * 1024)
+        await run_in_threadpool(spool)
         
-        # Clean the DataFrame - replace NaN values with None
-        df = df.replace({np.nan: None})
-        
-        # Convert DataFrame to list of dictionaries for JSON response
-        data = df.to_dict('records')
-        
-        # Convert numpy types to Python native types
-        data = convert_numpy_types(data)
-        
-        # Store DataFrame in session
         sid = get_session_id(request)
-        SESSION_DATA[sid] = df
+        job_id = UPLOAD_JOBS.submit(sid, file_path, file_extension, file.filename)
+        response.set_cookie("session_id", sid, httponly=True, samesite="lax")
         
-        # Return the data
+        # Return the dataset handle right away; parsing continues in the background
         return {
             "success": True,
-            "message": f"File {file.filename} uploaded successfully",
-            "data": data,
-            "rows": len(data),
-            "columns": len(data[0]) if data else 0
+            "message": f"File {file.filename} received, parsing started",
+            "job_id": job_id,
+            "status_url": f"/upload_status/{job_id}",
+            "data_url": f"/datasets/{job_id}",
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Upload error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
+@app.post("/upload/init")
+async def chunked_upload_init(request: Request):
+    """Start a resumable chunked upload"""
+    body = await request.json()
+    filename = body.get("filename", "")
+    if Path(filename).suffix.lower() not in {'.csv', '.xlsx', '.xls'}:
+        raise HTTPException(status_code=400, detail="Invalid file type")
+    try:
+        status = await run_in_threadpool(
+            CHUNKED_UPLOADS.init, filename, int(body.get("total_size", 0)), int(body.get("chunk_size", 8 * 1024 * 1024))
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"success": True, **status}
+
+@app.get("/upload/{upload_id}")
+async def chunked_upload_status(upload_id: str):
+    """Received and missing chunks, so an interrupted client can resume"""
+    try:
+        return {"success": True, **await run_in_threadpool(CHUNKED_UPLOADS.status, upload_id)}
+    except (KeyError, ValueError):
+        raise HTTPException(status_code=404, detail="Upload not found")
+
+@app.put("/upload/{upload_id}/chunk/{index}")
+async def chunked_upload_chunk(upload_id: str, index: int, request: Request):
+    """Receive one chunk as the raw request body, with its SHA-256 in X-Chunk-SHA256"""
+    data = await request.body()
+    try:
+        status = await run_in_threadpool(
+            CHUNKED_UPLOADS.write_chunk, upload_id, index, data, request.headers.get("X-Chunk-SHA256")
+        )
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"success": True, **status}
+
+@app.post("/upload/{upload_id}/finalize", status_code=202)
+async def chunked_upload_finalize(upload_id: str, request: Request, response: Response):
+    """Assemble a chunked upload and queue it for parsing like a regular upload"""
+    body = await request.json()
+    try:
+        status = await run_in_threadpool(CHUNKED_UPLOADS.status, upload_id)
+        file_extension = Path(status["filename"]).suffix.lower()
+        file_path = os.path.join(UPLOAD_SPOOL_DIR, f"{uuid.uuid4().hex}{file_extension}")
+        await run_in_threadpool(CHUNKED_UPLOADS.finalize, upload_id, file_path, body.get("sha256"))
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    sid = get_session_id(request)
+    job_id = UPLOAD_JOBS.submit(sid, file_path, file_extension, status["filename"])
+    response.set_cookie("session_id", sid, httponly=True, samesite="lax")
+    return {
+        "success": True,
+        "message": f"File {status['filename']} received, parsing started",
+        "job_id": job_id,
+        "status_url": f"/upload_status/{job_id}",
+        "data_url": f"/datasets/{job_id}",
+    }
+
+@app.get("/upload_status/{job_id}")
+async def upload_status(job_id: str, request: Request):
+    """Parsing status and progress (0-1) of an upload"""
+    job = UPLOAD_JOBS.status(job_id, get_session_id(request))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return job
+
+def rows_page(df: pd.DataFrame, body: dict, as_arrow: bool = False):
+    """Filter, sort and slice one page of rows as described by a /rows request body.
+
+    Returns a JSON-ready dict, or an Arrow IPC response whose schema metadata
+    carries the same paging fields.
+    """
+    sort_by = body.get("sort_by")
+    descending = bool(body.get("descending", False))
+    options = {
+        "offset": body.get("offset", 0),
+        "limit": body.get("limit", DEFAULT_PAGE_SIZE),
+        "filters": body.get("filters"),
+        "order": sort_order(df, sort_by, descending) if sort_by is not None else None,
+        "after": body.get("after"),
+    }
+    if as_arrow:
+        positions, page_info = page_positions(df, **options)
+        metadata = {**page_info, "sort_by": sort_by, "descending": descending, "row_numbers": positions.tolist()}
+        return Response(frame_to_arrow_ipc(df.iloc[positions], metadata), media_type=ARROW_MIME_TYPE)
+    return {"success": True, "sort_by": sort_by, "descending": descending, **query_rows(df, **options)}
+
+@app.get("/datasets/{job_id}")
+async def dataset_rows(job_id: str, request: Request, offset: int = 0, limit: int = DEFAULT_PAGE_SIZE):
+    """First page (or the requested offset/limit) of a parsed upload; use /rows to sort and filter"""
+    sid = get_session_id(request)
+    job = UPLOAD_JOBS.status(job_id, sid)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    if job["status"] != "ready":
+        raise HTTPException(status_code=409, detail=f"Upload is {job['status']}")
+    
+    df = SESSION_DATA.get(sid)
+    if df is None:
+        raise HTTPException(status_code=410, detail="Dataset has expired, please upload again")
+    
+    # Only one page is converted to Python objects, so the response does not grow with the dataset
+    page = await run_in_threadpool(rows_page, df, {"offset": offset, "limit": limit})
+    return {**page, "rows_url": "/rows", "columns_count": len(df.columns)}
+
+@app.post("/rows")
+async def get_rows(request: Request):
+    """One page of the session dataset with optional sort_by/descending, filters and offset or keyset cursor.
+
+    Send "format": "arrow" or Accept: application/vnd.apache.arrow.stream to get an Arrow IPC stream.
+    """
+    body = await request.json()
+    df = SESSION_DATA.get(get_session_id(request))
+    if df is None:
+        raise HTTPException(status_code=400, detail="No data uploaded")
+    try:
+        # Numeric columns go over the wire as raw buffers when the client accepts Arrow
+        as_arrow = wants_arrow(body.get("format"), request.headers.get("accept"))
+        # Sorting and filtering scan the whole frame - keep them off the event loop
+        return await run_in_threadpool(rows_page, df, body, as_arrow)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.post("/analyze")
 async def analyze_data(request: Request):
     """Run statistical analysis on uploaded data"""
@@ -219,5 +355,10 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "message": "EDA Explorer is running"}
 
+@app.get("/cache_stats")
+async def cache_stats():
+    """Session data cache counters and resident memory"""
+    return SESSION_DATA.stats()
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,137 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Rows per page unless the client asks for another size (capped at MAX_PAGE_SIZE)
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Filter operator -> function(column, value) returning a boolean mask
+FILTER_OPERATORS = {
+    "eq": lambda s, v: s == v,
+    "ne": lambda s, v: s != v,
+    "lt": lambda s, v: s < v,
+    "le": lambda s, v: s <= v,
+    "gt": lambda s, v: s > v,
+    "ge": lambda s, v: s >= v,
+    "in": lambda s, v: s.isin(v if isinstance(v, list) else [v]),
+    "contains": lambda s, v: s.astype(str).where(s.notna()).str.contains(str(v), case=False, regex=False),
+    "isnull": lambda s, v: s.isna(),
+    "notnull": lambda s, v: s.notna()
+}
+
+
+def filter_mask(df: pd.DataFrame, filters: Optional[List[Dict[str, Any]]]) -> Optional[np.ndarray]:
+    """AND together filters of the form {"column", "op", "value"}; None when there are none"""
+    if not filters:
+        return None
+
+    mask = np.ones(len(df), dtype=bool)
+    for predicate in filters:
+        column = predicate.get("column")
+        op = predicate.get("op", "eq")
+        if column not in df.columns:
+            raise ValueError(f"Unknown filter column: {column}")
+        if op not in FILTER_OPERATORS:
+            raise ValueError(f"Unknown filter operator: {op} (use one of {', '.join(FILTER_OPERATORS)})")
+
+        series = df[column]
+        value = predicate.get("value")
+        if op not in ("in", "contains", "isnull", "notnull"):
+            value = _coerce_value(series, value)
+        try:
+            matches = FILTER_OPERATORS[op](series, value)
+        except TypeError:
+            raise ValueError(f"Cannot compare column {column} with {value!r}")
+        # Comparisons with missing values count as no match
+        mask &= matches.to_numpy(dtype=bool, na_value=False)
+    return mask
+
+
+def sort_order(df: pd.DataFrame, column: str, descending: bool = False) -> np.ndarray:
+    """Row positions sorted by one column (stable, missing values last)"""
+    if column not in df.columns:
+        raise ValueError(f"Unknown sort column: {column}")
+    series = df[column].reset_index(drop=True)
+    try:
+        ordered = series.sort_values(ascending=not descending, kind="stable", na_position="last")
+    except TypeError:
+        # Mixed types (e.g. numbers and text in one Excel column) sort as text
+        ordered = series.astype(str).where(series.notna()).sort_values(
+            ascending=not descending, kind="stable", na_position="last"
+        )
+    return ordered.index.to_numpy(dtype=np.int64)
+
+
+def query_rows(df: pd.DataFrame, offset: int = 0, limit: int = DEFAULT_PAGE_SIZE,
+               filters: Optional[List[Dict[str, Any]]] = None, order: Optional[np.ndarray] = None,
+               after: Optional[int] = None) -> Dict[str, Any]:
+    """One page of rows after filtering and sorting.
+
+    Pages are addressed either by offset or by a keyset cursor: "after" is
+    the row position returned as next_cursor by the previous page, and the
+    page starts right after that row in the sort order.
+    """
+    positions, page_info = page_positions(df, offset, limit, filters, order, after)
+    return {
+        "rows": records_for_json(df.iloc[positions]),
+        "row_numbers": positions.tolist(),
+        **page_info,
+    }
+
+
+def page_positions(df: pd.DataFrame, offset: int = 0, limit: int = DEFAULT_PAGE_SIZE,
+                   filters: Optional[List[Dict[str, Any]]] = None, order: Optional[np.ndarray] = None,
+                   after: Optional[int] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """Row positions of one page plus the paging fields of query_rows()"""
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    offset = max(0, int(offset))
+
+    positions = order if order is not None else np.arange(len(df), dtype=np.int64)
+    mask = filter_mask(df, filters)
+    if mask is not None:
+        positions = positions[mask[positions]]
+    total = len(positions)
+
+    if after is not None:
+        # Continue right after the cursor row; an unknown cursor starts from the top
+        found = np.flatnonzero(positions == int(after))
+        offset = int(found[0]) + 1 if len(found) else 0
+
+    page = positions[offset:offset + limit]
+    next_offset = offset + len(page)
+    has_more = next_offset < total
+
+    return page, {
+        "columns": [str(col) for col in df.columns],
+        "total_rows": int(total),
+        "offset": offset,
+        "limit": limit,
+        "next_offset": next_offset if has_more else None,
+        "next_cursor": int(page[-1]) if has_more and len(page) else None,
+    }
+
+
+def records_for_json(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Rows as dictionaries with NaN/NaT replaced by None and timestamps as ISO strings"""
+    df = df.copy()
+    for col in df.select_dtypes(include=["datetime", "datetimetz"]).columns:
+        df[col] = df[col].dt.strftime("%Y-%m-%dT%H:%M:%S")
+    return df.astype(object).where(df.notna(), None).to_dict("records")
+
+
+def _coerce_value(series: pd.Series, value: Any) -> Any:
+    """Convert a JSON filter value to the column's type so comparisons work"""
+    if value is None:
+        return value
+    try:
+        if pd.api.types.is_bool_dtype(series):
+            return value if isinstance(value, bool) else str(value).lower() in ("true", "1", "yes")
+        if pd.api.types.is_numeric_dtype(series):
+            return float(value)
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return pd.Timestamp(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Filter value {value!r} does not match the type of column {series.name}")
+    return value
@@ -0,0 +1,213 @@
+import os
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import pandas as pd
+
+
+class SessionDataManager:
+    """Byte-budgeted in-memory store for per-session DataFrames.
+
+    Frames are kept resident in LRU order until the global memory budget is
+    exceeded, at which point the least recently used frames are spilled to
+    Parquet files and reloaded lazily on the next access. Sessions idle for
+    longer than the TTL are dropped entirely.
+
+    Spill files are written and read without holding the lock, so a large
+    spill does not stall other sessions: a frame being spilled stays readable
+    until its file is committed, and work on an entry that was replaced or
+    dropped in the meantime is discarded.
+    """
+
+    def __init__(self, memory_budget_bytes: int, session_quota_bytes: int,
+                 idle_ttl_seconds: int, spill_dir: str):
+        self.memory_budget_bytes = memory_budget_bytes
+        self.session_quota_bytes = session_quota_bytes
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.spill_dir = spill_dir
+        os.makedirs(self.spill_dir, exist_ok=True)
+
+        # session_id -> {"df", "nbytes", "last_access", "spill_path", "spilling"}, oldest first
+        self._entries = OrderedDict()
+        self._resident_bytes = 0
+        self._lock = threading.RLock()
+        self._stats = {"hits": 0, "misses": 0, "spill_loads": 0, "evictions": 0, "expirations": 0}
+
+    def put(self, session_id: str, df: pd.DataFrame) -> None:
+        """Store the DataFrame for a session, replacing any previous one"""
+        nbytes = int(df.memory_usage(deep=True).sum())
+        with self._lock:
+            self._expire_idle()
+            self._drop(session_id)
+            entry = {"df": df, "nbytes": nbytes, "last_access": time.time(), "spill_path": None,
+                     "spilling": False}
+            self._entries[session_id] = entry
+
+            if nbytes > self.session_quota_bytes:
+                # Larger than one session may hold in memory - keep it on disk only
+                entry["spilling"] = True
+                spills = [(session_id, entry)]
+                self._stats["evictions"] += 1
+            else:
+                self._resident_bytes += nbytes
+                spills = self._enforce_budget(keep=session_id)
+        self._write_spills(spills)
+
+    def get(self, session_id: str) -> Optional[pd.DataFrame]:
+        """Return the DataFrame for a session, reloading it from disk if it was spilled"""
+        with self._lock:
+            self._expire_idle()
+            entry = self._entries.get(session_id)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+
+            entry["last_access"] = time.time()
+            self._entries.move_to_end(session_id)
+
+            if entry["df"] is not None:
+                self._stats["hits"] += 1
+                return entry["df"]
+
+            self._stats["spill_loads"] += 1
+            spill_path = entry["spill_path"]
+
+        try:
+            df = _read_spill(spill_path)
+        except FileNotFoundError:
+            # The session was dropped or replaced while its file was read
+            return self.get(session_id)
+
+        spills = []
+        with self._lock:
+            # Keep the reloaded frame only if the entry is unchanged and no other reader kept one first
+            if (self._entries.get(session_id) is entry and entry["df"] is None
+                    and entry["nbytes"] <= self.session_quota_bytes):
+                entry["df"] = df
+                self._resident_bytes += entry["nbytes"]
+                spills = self._enforce_budget(keep=session_id)
+        self._write_spills(spills)
+        return df
+
+    def delete(self, session_id: str) -> None:
+        """Remove a session's data from memory and disk"""
+        with self._lock:
+            self._drop(session_id)
+
+    def stats(self) -> dict:
+        """Report cache counters and memory usage for instance sizing"""
+        with self._lock:
+            resident = sum(1 for e in self._entries.values() if e["df"] is not None and not e["spilling"])
+            return {
+                **self._stats,
+                "sessions": len(self._entries),
+                "resident_sessions": resident,
+                "spilled_sessions": len(self._entries) - resident,
+                "resident_bytes": self._resident_bytes,
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "session_quota_bytes": self.session_quota_bytes,
+            }
+
+    def _enforce_budget(self, keep: str) -> list:
+        """
+        Pick least recently used frames to spill until resident bytes fit the budget
+
+        Caller holds the lock and passes the result to _write_spills() after releasing it.
+        """
+        spills = []
+        for session_id in list(self._entries):
+            if self._resident_bytes <= self.memory_budget_bytes:
+                break
+            entry = self._entries[session_id]
+            if session_id == keep or entry["df"] is None or entry["spilling"]:
+                continue
+            entry["spilling"] = True
+            self._resident_bytes -= entry["nbytes"]
+            self._stats["evictions"] += 1
+            spills.append((session_id, entry))
+        return spills
+
+    def _write_spills(self, spills: list) -> None:
+        """Write frames picked by _enforce_budget()/put() to disk, then release them from memory"""
+        for session_id, entry in spills:
+            spill_path = entry["spill_path"]
+            if spill_path is None:
+                # A frame is never modified after put(), so a file written once stays valid
+                safe_id = "".join(ch for ch in session_id if ch.isalnum() or ch == "-")
+                base_path = os.path.join(self.spill_dir, f"{safe_id}-{uuid.uuid4().hex[:8]}")
+                spill_path = _write_spill(entry["df"], base_path)
+
+            with self._lock:
+                if self._entries.get(session_id) is entry and entry["spilling"]:
+                    entry["spill_path"] = spill_path
+                    entry["df"] = None
+                    entry["spilling"] = False
+                    continue
+            # Dropped or replaced while the file was written
+            _remove_file(spill_path)
+
+    def _expire_idle(self) -> None:
+        """Drop sessions that have been idle longer than the TTL"""
+        cutoff = time.time() - self.idle_ttl_seconds
+        for session_id in list(self._entries):
+            if self._entries[session_id]["last_access"] >= cutoff:
+                break  # entries are in access order, the rest are newer
+            self._drop(session_id)
+            self._stats["expirations"] += 1
+
+    def _drop(self, session_id: str) -> None:
+        entry = self._entries.pop(session_id, None)
+        if entry is None:
+            return
+        if entry["df"] is not None and not entry["spilling"]:
+            self._resident_bytes -= entry["nbytes"]
+        entry["spilling"] = False
+        if entry["spill_path"]:
+            _remove_file(entry["spill_path"])
+
+
+def _write_spill(df: pd.DataFrame, base_path: str) -> str:
+    """
+    Write a spilled frame as Parquet, falling back to pickle where Parquet would change it
+
+    Parquet keeps the frame as it was put() only with string column labels
+    and a default index; anything else (numeric or tuple labels, a custom
+    index) and mixed-type object columns are pickled.
+    """
+    if _parquet_round_trips(df):
+        path = f"{base_path}.parquet"
+        try:
+            df.to_parquet(path, index=False)
+            return path
+        except (ValueError, TypeError, ImportError):
+            # pyarrow raises ArrowInvalid/ArrowTypeError (ValueError/TypeError subclasses)
+            # for object columns holding several Python types
+            _remove_file(path)
+    path = f"{base_path}.pkl"
+    df.to_pickle(path)
+    return path
+
+
+def _parquet_round_trips(df: pd.DataFrame) -> bool:
+    return (not isinstance(df.columns, pd.MultiIndex)
+            and all(isinstance(col, str) for col in df.columns)
+            and df.columns.is_unique
+            and isinstance(df.index, pd.RangeIndex)
+            and df.index.equals(pd.RangeIndex(len(df)))
+            and df.index.name is None)
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _read_spill(path: str) -> pd.DataFrame:
+    if path.endswith(".pkl"):
+        return pd.read_pickle(path)
+    return pd.read_parquet(path)
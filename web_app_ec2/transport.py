@@ -0,0 +1,48 @@
+import json
+from typing import Any, Optional
+
+import pandas as pd
+import pyarrow as pa
+
+ARROW_MIME_TYPE = "application/vnd.apache.arrow.stream"
+
+
+def wants_arrow(requested: Optional[str], accept: Optional[str]) -> bool:
+    """True if the client asked for Arrow via the "format" field or the Accept header"""
+    if requested:
+        if requested.lower() not in ("json", "arrow"):
+            raise ValueError(f"Unsupported format: {requested} (use json or arrow)")
+        return requested.lower() == "arrow"
+    return bool(accept) and ARROW_MIME_TYPE in accept
+
+
+def frame_to_arrow_ipc(df: pd.DataFrame, metadata: Optional[Any] = None) -> bytes:
+    """Encode a DataFrame as an Arrow IPC stream, with optional JSON metadata under the "eda" schema key.
+
+    Numeric columns are copied as raw buffers instead of being converted to
+    Python objects one value at a time.
+    """
+    if not all(isinstance(col, str) for col in df.columns):
+        df = df.rename(columns=str)
+    # Columns that mix Python types (e.g. numbers and text) are sent as text
+    mixed = []
+    for col in df.select_dtypes(include=["object"]).columns:
+        try:
+            pa.array(df[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            mixed.append(col)
+    if mixed:
+        df = df.copy()
+        for col in mixed:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if metadata is not None:
+        schema_metadata = dict(table.schema.metadata or {})
+        schema_metadata[b"eda"] = json.dumps(metadata, default=str).encode("utf-8")
+        table = table.replace_schema_metadata(schema_metadata)
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
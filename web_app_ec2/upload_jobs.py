@@ -0,0 +1,126 @@
+import os
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import pandas as pd
+
+from session_cache import SessionDataManager
+
+# Rows parsed per step; progress is reported after each step
+CSV_CHUNK_ROWS = 50_000
+
+
+class UploadJobManager:
+    """Parses spooled uploads on a worker pool and tracks their progress.
+
+    The request handler only spools the upload to disk and submits a job;
+    parsing happens on a worker thread (pandas releases the GIL while
+    tokenizing), so the event loop stays free for other requests. Finished
+    frames are handed to the session store under the uploader's session ID.
+    """
+
+    def __init__(self, store: SessionDataManager, max_workers: int, job_ttl_seconds: int):
+        self.store = store
+        self.job_ttl_seconds = job_ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="upload")
+        # job_id -> status dict (see _new_job); session_id -> most recent job_id
+        self._jobs = {}
+        self._latest = {}
+        self._lock = threading.Lock()
+
+    def submit(self, session_id: str, file_path: str, file_extension: str, filename: str) -> str:
+        """Queue a spooled file for parsing and return the job ID"""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._expire_finished()
+            self._jobs[job_id] = _new_job(job_id, session_id, filename)
+            self._latest[session_id] = job_id
+        self._executor.submit(self._run, job_id, file_path, file_extension)
+        return job_id
+
+    def status(self, job_id: str, session_id: str) -> Optional[dict]:
+        """Return a copy of the job status, or None if unknown or owned by another session"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job["session_id"] != session_id:
+                return None
+            return {key: value for key, value in job.items() if key != "session_id"}
+
+    def _run(self, job_id: str, file_path: str, file_extension: str) -> None:
+        self._update(job_id, status="parsing", started_at=time.time())
+        try:
+            if file_extension == ".csv":
+                df = self._read_csv(job_id, file_path)
+            else:
+                df = pd.read_excel(file_path)
+
+            with self._lock:
+                session_id = self._jobs[job_id]["session_id"]
+                superseded = self._latest.get(session_id) != job_id
+            if superseded:
+                # A newer upload from the same session owns the session data now
+                self._update(job_id, status="superseded", finished_at=time.time())
+                return
+            self.store.put(session_id, df)
+            self._update(job_id, status="ready", progress=1.0, rows=len(df), columns=len(df.columns),
+                         column_names=[str(col) for col in df.columns], finished_at=time.time())
+        except Exception as e:
+            print(f"Upload job {job_id} failed: {str(e)}")
+            self._update(job_id, status="failed", error=str(e), finished_at=time.time())
+        finally:
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+
+    def _read_csv(self, job_id: str, file_path: str) -> pd.DataFrame:
+        """Parse a CSV in chunks, reporting the fraction of bytes consumed"""
+        total_bytes = os.path.getsize(file_path) or 1
+        chunks = []
+        rows = 0
+        with open(file_path, "rb") as fh:
+            with pd.read_csv(fh, encoding="utf-8", chunksize=CSV_CHUNK_ROWS) as reader:
+                for chunk in reader:
+                    chunks.append(chunk)
+                    rows += len(chunk)
+                    self._update(job_id, progress=round(min(fh.tell() / total_bytes, 0.99), 3), rows=rows)
+        if not chunks:
+            return pd.DataFrame()
+        # Chunks may infer different dtypes for the same column; concat reconciles them
+        return pd.concat(chunks, ignore_index=True)
+
+    def _update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def _expire_finished(self) -> None:
+        """Forget finished jobs older than the TTL"""
+        cutoff = time.time() - self.job_ttl_seconds
+        for job_id in list(self._jobs):
+            finished_at = self._jobs[job_id]["finished_at"]
+            if finished_at is not None and finished_at < cutoff:
+                session_id = self._jobs.pop(job_id)["session_id"]
+                if self._latest.get(session_id) == job_id:
+                    del self._latest[session_id]
+
+
+def _new_job(job_id: str, session_id: str, filename: str) -> dict:
+    return {
+        "job_id": job_id,
+        "session_id": session_id,
+        "filename": filename,
+        "status": "queued",
+        "progress": 0.0,
+        "rows": 0,
+        "columns": 0,
+        "column_names": [],
+        "error": None,
+        "created_at": time.time(),
+        "started_at": None,
+        "finished_at": None,
+    }
+